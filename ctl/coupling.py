@@ -5,16 +5,23 @@ This module now supports nonlinear disparity penalties, per-step coherence
 scores, and contextual thresholds driven by sliding windows. It provides:
 
 * Per-pair disparity evaluation (tone, hue, intensity, polarity).
+* An array-based CouplingKernel that evaluates whole sequences column-wise.
 * Full-sequence processing that returns per-step metrics and summary values.
+* A StreamingCoupler for live L/R streams with constant-time window updates.
 * Coupling application that blends cells while respecting agreement/coherence.
 * Logging helpers that normalize headers and append metrics into /logs/ CSVs.
 """
 from __future__ import annotations
 
 import csv
+import heapq
 import json
 import os
-from typing import Any, Dict, List
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from ctl.flag_track import FlagTrack
+from ctl.l_features import coupling_l_terms
 
 ChromaticCell = Dict[str, Any]
 Config = Dict[str, Any]
@@ -139,167 +146,541 @@ def _window_stats(values: List[float], window: int) -> List[float]:
     return rolling
 
 
-def compute_coupling_metrics(l_sequence: List[ChromaticCell], r_sequence: List[ChromaticCell], config: Config) -> Dict[str, float]:
-    """Compute aggregate disparity, coherence, and agreement metrics."""
-    pairs = list(zip(l_sequence, r_sequence))
-    if not pairs:
-        return {
-            "tone_disparity": 0.0,
-            "hue_disparity": 0.0,
-            "intensity_disparity": 0.0,
-            "polarity_disagreement_rate": 0.0,
-            "coherence_score": 1.0,
-            "agreement": 1.0,
-        }
-
-    per_step = [compute_pair_disparity(l, r, config) for l, r in pairs]
-    tone_avg = sum(p["tone_disparity"] for p in per_step) / len(per_step)
-    hue_avg = sum(p["hue_disparity"] for p in per_step) / len(per_step)
-    intensity_avg = sum(p["intensity_disparity"] for p in per_step) / len(per_step)
-    polarity_rate = sum(p["polarity_disagreement"] for p in per_step) / len(per_step)
-    coherence_score = sum(p["coherence"] for p in per_step) / len(per_step)
-    agreement = sum(p["agreement"] for p in per_step) / len(per_step)
-
-    return {
-        "tone_disparity": tone_avg,
-        "hue_disparity": hue_avg,
-        "intensity_disparity": intensity_avg,
-        "polarity_disagreement_rate": polarity_rate,
-        "coherence_score": coherence_score,
-        "agreement": agreement,
-    }
+_EMPTY_METRICS = {
+    "tone_disparity": 0.0,
+    "hue_disparity": 0.0,
+    "intensity_disparity": 0.0,
+    "polarity_disagreement_rate": 0.0,
+    "coherence_score": 1.0,
+    "agreement": 1.0,
+}
 
 
-def apply_coupling(l_sequence: List[ChromaticCell], r_sequence: List[ChromaticCell], config: Config) -> List[ChromaticCell]:
+class CouplingKernel:
     """
-    Bind Tensor L and Tensor R into coupled cells.
+    Array-based evaluation of the coupling laws over whole sequences.
 
-    Strategy:
-    - Blend tone/intensity values toward L using weights
-    - Keep hue from R but bias toward L based on hue alignment weight
-    - Update coherence based on per-cell agreement and config thresholds
-    - Enforce polarity consensus when conflicts arise
+    The config is resolved once at construction. disparities() evaluates the
+    per-pair terms of compute_pair_disparity as columns (one list per metric),
+    and coupled()/metrics() derive apply_coupling cells and
+    compute_coupling_metrics summaries from those columns. Every expression
+    mirrors the scalar code operation for operation, so results are identical.
     """
-    pairs = list(zip(l_sequence, r_sequence))
-    if not pairs:
-        return []
 
-    weights = config.get("weights", {})
-    tone_w = weights.get("tone_alignment", 0.55)
-    hue_w = weights.get("hue_alignment", 0.25)
-    intensity_w = weights.get("intensity_alignment", 0.2)
-
-    thresholds = config.get("thresholds", {})
-    tone_max = thresholds.get("tone_error_max", 4)
-    hue_max = thresholds.get("hue_error_max", 50)
-    intens_max = thresholds.get("intensity_gap_max", 1.5)
-    agreement_min = thresholds.get("agreement_min", 0.4)
-    window = thresholds.get("window", 4)
-
-    coherence_cfg = config.get("coherence", {})
-    min_coherence = coherence_cfg.get("min_coherence", 0.35)
-    boost_on_agree = coherence_cfg.get("boost_on_agreement", 0.08)
-    decay = coherence_cfg.get("decay", 0.05)
-    window_gain = coherence_cfg.get("window_gain", 0.05)
-
-    polarity_cfg = config.get("polarity", {})
-    prefer_consensus = polarity_cfg.get("prefer_consensus", True)
-    flip_if_conflict = polarity_cfg.get("flip_if_conflict", True)
-
-    nonlinear_cfg = config.get("nonlinear", {})
-    tone_exp = nonlinear_cfg.get("tone_exponent", 1.2)
-    hue_exp = nonlinear_cfg.get("hue_exponent", 1.1)
-    int_exp = nonlinear_cfg.get("intensity_exponent", 1.05)
+    def __init__(self, config: Config) -> None:
+        weights = config.get("weights", {})
+        nonlinear_cfg = config.get("nonlinear", {})
+        thresholds = config.get("thresholds", {})
+        coherence_cfg = config.get("coherence", {})
+        polarity_cfg = config.get("polarity", {})
+
+        # compute_pair_disparity terms (note its own weight defaults)
+        self.pair_tone_w = weights.get("tone_alignment", 0.5)
+        self.pair_hue_w = weights.get("hue_alignment", 0.3)
+        self.pair_int_w = weights.get("intensity_alignment", 0.2)
+        self.pair_denom = max(0.001, self.pair_tone_w + self.pair_hue_w + self.pair_int_w)
+        self.polarity_penalty = nonlinear_cfg.get("polarity_penalty", 0.15)
+        self.coherence_curve = max(1.0, nonlinear_cfg.get("coherence_curve", 1.0))
+
+        self.tone_exp = max(1.0, nonlinear_cfg.get("tone_exponent", 1.2))
+        self.hue_exp = max(1.0, nonlinear_cfg.get("hue_exponent", 1.1))
+        self.int_exp = max(1.0, nonlinear_cfg.get("intensity_exponent", 1.05))
+
+        # apply_coupling terms
+        self.tone_w = weights.get("tone_alignment", 0.55)
+        self.hue_w = weights.get("hue_alignment", 0.25)
+        self.intensity_w = weights.get("intensity_alignment", 0.2)
+
+        self.tone_max = thresholds.get("tone_error_max", 4)
+        self.hue_max = thresholds.get("hue_error_max", 50)
+        self.intens_max = thresholds.get("intensity_gap_max", 1.5)
+        self.agreement_min = thresholds.get("agreement_min", 0.4)
+        self.window = thresholds.get("window", 4)
+
+        self.min_coherence = coherence_cfg.get("min_coherence", 0.35)
+        self.boost_on_agree = coherence_cfg.get("boost_on_agreement", 0.08)
+        self.decay = coherence_cfg.get("decay", 0.05)
+        self.window_gain = coherence_cfg.get("window_gain", 0.05)
+
+        self.prefer_consensus = polarity_cfg.get("prefer_consensus", True)
+        self.flip_if_conflict = polarity_cfg.get("flip_if_conflict", True)
+
+        # Tone and hue gaps take few distinct values, so their weighted
+        # nonlinear terms are memoized per gap.
+        tw, hw, te, he = self.pair_tone_w, self.pair_hue_w, self.tone_exp, self.hue_exp
+        self._tone_terms = _Memo(lambda gap: tw * _pow_pos(gap / 6.0, te))
+        self._hue_terms = _Memo(lambda gap: hw * _pow_pos(gap / 150.0, he))
+
+    # --- per-pair disparity columns ---
+
+    def disparities(self, l_sequence: List[ChromaticCell], r_sequence: List[ChromaticCell]) -> Dict[str, List[float]]:
+        """Return compute_pair_disparity results for all pairs, as columns."""
+        return self._disparities(self.l_terms(l_sequence), r_sequence)
+
+    @staticmethod
+    def l_terms(l_sequence: List[ChromaticCell]) -> Tuple[List[Any], ...]:
+        """Per-cell L values used by every disparity evaluation against this L."""
+        return coupling_l_terms(l_sequence)
+
+    def _disparities(self, l_terms: Tuple[List[Any], ...], r_sequence: List[ChromaticCell]) -> Dict[str, List[float]]:
+        l_tones, l_hues, l_intensities, l_polarities = l_terms
+        tone_gap = [_tone_distance(lt, r["tone"]) for lt, r in zip(l_tones, r_sequence)]
+        hue_gap = [_hue_distance_ints(lh, r.get("hue")) for lh, r in zip(l_hues, r_sequence)]
+        intensity_gap = [abs(li - float(r["intensity"])) for li, r in zip(l_intensities, r_sequence)]
+        polarity = [1.0 if lp != r.get("polarity", 1) else 0.0 for lp, r in zip(l_polarities, r_sequence)]
+
+        tone_terms, hue_terms = self._tone_terms, self._hue_terms
+        iw, denom, ie = self.pair_int_w, self.pair_denom, self.int_exp
+        agreement = [
+            max(0.0, 1.0 - (tone_terms[t] + hue_terms[h] + iw * _pow_pos(i / 3.0, ie)) / denom)
+            for t, h, i in zip(tone_gap, hue_gap, intensity_gap)
+        ]
+        curve, penalty = self.coherence_curve, self.polarity_penalty
+        coherence = [max(0.0, max(0.0, a ** curve) - penalty * p) for a, p in zip(agreement, polarity)]
 
-    disparities: List[Dict[str, float]] = [compute_pair_disparity(l, r, config) for l, r in pairs]
-    tone_window = _window_stats([d["tone_disparity"] for d in disparities], window)
-    hue_window = _window_stats([d["hue_disparity"] for d in disparities], window)
-    intensity_window = _window_stats([d["intensity_disparity"] for d in disparities], window)
+        return {
+            "tone_disparity": tone_gap,
+            "hue_disparity": hue_gap,
+            "intensity_disparity": intensity_gap,
+            "polarity_disagreement": polarity,
+            "agreement": agreement,
+            "coherence": coherence,
+        }
 
-    coupled: List[ChromaticCell] = []
+    # --- scalar laws (for bounds and estimates) ---
 
-    for idx, (l_cell, r_cell) in enumerate(pairs):
-        disparity = disparities[idx]
-        tone_gap = disparity["tone_disparity"]
-        hue_gap = disparity["hue_disparity"]
-        intensity_gap = disparity["intensity_disparity"]
+    def pair_agreement(self, tone_gap: float, hue_gap: float, intensity_gap: float) -> float:
+        """compute_pair_disparity agreement for the given gaps."""
+        penalty = (
+            self.pair_tone_w * _pow_pos(tone_gap / 6.0, self.tone_exp)
+            + self.pair_hue_w * _pow_pos(hue_gap / 150.0, self.hue_exp)
+            + self.pair_int_w * _pow_pos(intensity_gap / 3.0, self.int_exp)
+        )
+        return max(0.0, 1.0 - penalty / self.pair_denom)
+
+    def pair_coherence(self, agreement: float, polarity_disagreement: float) -> float:
+        """compute_pair_disparity coherence for the given agreement."""
+        return max(0.0, max(0.0, agreement ** self.coherence_curve) - self.polarity_penalty * polarity_disagreement)
+
+    def coupled_agreement(self, tone_gap: float, hue_gap: float, intensity_gap: float) -> float:
+        """apply_coupling agreement score for the given gaps."""
+        penalty = (
+            _pow_pos(tone_gap / (self.tone_max + 1e-6), self.tone_exp)
+            + _pow_pos(hue_gap / (self.hue_max + 1e-6), self.hue_exp)
+            + _pow_pos(intensity_gap / (self.intens_max + 1e-6), self.int_exp)
+        ) / 3
+        return max(0.0, 1.0 - penalty)
+
+    @staticmethod
+    def per_step(columns: Dict[str, List[float]]) -> List[Dict[str, float]]:
+        """Turn disparity columns back into compute_pair_disparity dicts."""
+        keys = list(columns)
+        return [dict(zip(keys, row)) for row in zip(*(columns[k] for k in keys))]
+
+    # --- summaries ---
+
+    def metrics(
+        self,
+        l_sequence: List[ChromaticCell],
+        r_sequence: List[ChromaticCell],
+        columns: Dict[str, List[float]] | None = None,
+    ) -> Dict[str, float]:
+        """compute_coupling_metrics over whole sequences."""
+        cols = columns if columns is not None else self.disparities(l_sequence, r_sequence)
+        n = len(cols["agreement"])
+        if not n:
+            return dict(_EMPTY_METRICS)
+        return {
+            "tone_disparity": sum(cols["tone_disparity"]) / n,
+            "hue_disparity": sum(cols["hue_disparity"]) / n,
+            "intensity_disparity": sum(cols["intensity_disparity"]) / n,
+            "polarity_disagreement_rate": sum(cols["polarity_disagreement"]) / n,
+            "coherence_score": sum(cols["coherence"]) / n,
+            "agreement": sum(cols["agreement"]) / n,
+        }
 
-        tone_blend = int(round((1 - tone_w) * r_cell["tone"] + tone_w * l_cell["tone"])) % 12
+    def metrics_many(
+        self,
+        l_sequence: List[ChromaticCell],
+        r_candidates: Sequence[List[ChromaticCell]],
+        l_terms: Tuple[List[Any], ...] | None = None,
+    ) -> List[Dict[str, float]]:
+        """compute_coupling_metrics for one L against many R candidates."""
+        terms = l_terms if l_terms is not None else self.l_terms(l_sequence)
+        return [self.metrics(l_sequence, r_seq, self._disparities(terms, r_seq)) for r_seq in r_candidates]
+
+    # --- coupled stream ---
+
+    def coupled(
+        self,
+        l_sequence: List[ChromaticCell],
+        r_sequence: List[ChromaticCell],
+        columns: Dict[str, List[float]] | None = None,
+        flag_track: FlagTrack | None = None,
+        cell_flags: bool = True,
+    ) -> List[ChromaticCell]:
+        """
+        apply_coupling over whole sequences; flags are also appended to flag_track.
+
+        With cell_flags=False the cells leave out "constraint_flag" and the
+        flags live only in flag_track, which must then be given.
+        """
+        if not cell_flags and flag_track is None:
+            raise ValueError("Cell flags can only be left out when a flag_track records them")
+        pairs = list(zip(l_sequence, r_sequence))
+        if not pairs:
+            return []
+        cols = columns if columns is not None else self.disparities(l_sequence, r_sequence)
+        windows = (
+            _window_stats(cols["tone_disparity"], self.window),
+            _window_stats(cols["hue_disparity"], self.window),
+            _window_stats(cols["intensity_disparity"], self.window),
+        )
+        return self._couple(pairs, cols, windows, flag_track, cell_flags)
+
+    def _couple(
+        self,
+        pairs: List[Any],
+        cols: Dict[str, List[float]],
+        windows: Any,
+        flag_track: FlagTrack | None = None,
+        cell_flags: bool = True,
+    ) -> List[ChromaticCell]:
+        """Build coupled cells from disparity columns and rolling window means."""
+        tone_gap = cols["tone_disparity"]
+        hue_gap = cols["hue_disparity"]
+        intensity_gap = cols["intensity_disparity"]
+
+        tone_w, hue_w, intensity_w = self.tone_w, self.hue_w, self.intensity_w
+        tone_blend = [int(round((1 - tone_w) * r["tone"] + tone_w * l["tone"])) % 12 for l, r in pairs]
         hue_blend = [
-            int(round((1 - hue_w) * r + hue_w * l))
-            for r, l in zip(r_cell.get("hue", [0, 0, 0]), l_cell.get("hue", [0, 0, 0]))
+            [int(round((1 - hue_w) * rv + hue_w * lv)) for rv, lv in zip(r.get("hue", [0, 0, 0]), l.get("hue", [0, 0, 0]))]
+            for l, r in pairs
+        ]
+        intensity_blend = [
+            (1 - intensity_w) * float(r["intensity"]) + intensity_w * float(l["intensity"]) for l, r in pairs
         ]
-        intensity_blend = (1 - intensity_w) * float(r_cell["intensity"]) + intensity_w * float(l_cell["intensity"])
 
-        agreement_penalty = (
-            _nonlinear_scale(tone_gap / (tone_max + 1e-6), tone_exp)
-            + _nonlinear_scale(hue_gap / (hue_max + 1e-6), hue_exp)
-            + _nonlinear_scale(intensity_gap / (intens_max + 1e-6), int_exp)
-        ) / 3
-        agreement_score = max(0.0, 1.0 - agreement_penalty)
+        tone_den = self.tone_max + 1e-6
+        hue_den = self.hue_max + 1e-6
+        int_den = self.intens_max + 1e-6
+        te, he, ie = self.tone_exp, self.hue_exp, self.int_exp
 
-        window_penalty = (
-            _nonlinear_scale(tone_window[idx] / (tone_max + 1e-6), tone_exp)
-            + _nonlinear_scale(hue_window[idx] / (hue_max + 1e-6), hue_exp)
-            + _nonlinear_scale(intensity_window[idx] / (intens_max + 1e-6), int_exp)
-        ) / 3
+        agreement = [
+            max(0.0, 1.0 - (_pow_pos(t / tone_den, te) + _pow_pos(h / hue_den, he) + _pow_pos(i / int_den, ie)) / 3)
+            for t, h, i in zip(tone_gap, hue_gap, intensity_gap)
+        ]
+        window_penalty = [
+            (_pow_pos(t / tone_den, te) + _pow_pos(h / hue_den, he) + _pow_pos(i / int_den, ie)) / 3
+            for t, h, i in zip(*windows)
+        ]
+
+        decay, boost, gain, floor = self.decay, self.boost_on_agree, self.window_gain, self.min_coherence
+        coherence = [
+            max(floor, min(1.0, float(r.get("coherence", 1.0)) - decay + (boost * a) + gain * max(0.0, 1.0 - w)))
+            for (_, r), a, w in zip(pairs, agreement, window_penalty)
+        ]
+
+        polarity = [self._polarity(l, r, a) for (l, r), a in zip(pairs, agreement)]
+
+        tone_max, hue_max, intens_max, agreement_min = self.tone_max, self.hue_max, self.intens_max, self.agreement_min
+        breaches = [
+            (t > tone_max) + (h > hue_max) + (i > intens_max) + (a < agreement_min) + (w > 1.0)
+            for t, h, i, a, w in zip(tone_gap, hue_gap, intensity_gap, agreement, window_penalty)
+        ]
+        flags = ["OK" if b == 0 else "WARN" if b == 1 else "VIOLATION" for b in breaches]
+        timestamps = [l_cell.get("timestamp", r_cell.get("timestamp", 0.0)) for l_cell, r_cell in pairs]
+        if flag_track is not None:
+            flag_track.extend(flags, timestamps)
+
+        if not cell_flags:
+            return [
+                {
+                    "tone": tone_blend[idx],
+                    "hue": hue_blend[idx],
+                    "intensity": intensity_blend[idx],
+                    "polarity": polarity[idx],
+                    "timestamp": timestamps[idx],
+                    "agreement": agreement[idx],
+                    "coherence": coherence[idx],
+                    "tone_disparity": tone_gap[idx],
+                    "hue_disparity": hue_gap[idx],
+                    "intensity_disparity": intensity_gap[idx],
+                }
+                for idx in range(len(pairs))
+            ]
+        return [
+            {
+                "tone": tone_blend[idx],
+                "hue": hue_blend[idx],
+                "intensity": intensity_blend[idx],
+                "polarity": polarity[idx],
+                "timestamp": timestamps[idx],
+                "agreement": agreement[idx],
+                "coherence": coherence[idx],
+                "constraint_flag": flags[idx],
+                "tone_disparity": tone_gap[idx],
+                "hue_disparity": hue_gap[idx],
+                "intensity_disparity": intensity_gap[idx],
+            }
+            for idx, (l_cell, r_cell) in enumerate(pairs)
+        ]
 
-        # Coherence update with sliding-window assistance
-        coherence = float(r_cell.get("coherence", 1.0))
-        coherence = coherence - decay + (boost_on_agree * agreement_score)
-        coherence += window_gain * max(0.0, 1.0 - window_penalty)
-        coherence = max(min_coherence, min(1.0, coherence))
+    def window_penalty(self, tone_mean: float, hue_mean: float, intensity_mean: float) -> float:
+        """Scalar window penalty for one set of window means (as in _couple)."""
+        return (
+            _pow_pos(tone_mean / (self.tone_max + 1e-6), self.tone_exp)
+            + _pow_pos(hue_mean / (self.hue_max + 1e-6), self.hue_exp)
+            + _pow_pos(intensity_mean / (self.intens_max + 1e-6), self.int_exp)
+        ) / 3
 
-        # Polarity handling
+    def _polarity(self, l_cell: ChromaticCell, r_cell: ChromaticCell, agreement: float) -> int:
         polarity = r_cell.get("polarity", 1)
-        if prefer_consensus and l_cell.get("polarity", polarity) != polarity:
+        if self.prefer_consensus and l_cell.get("polarity", polarity) != polarity:
             polarity = l_cell.get("polarity", polarity)
-            if flip_if_conflict and agreement_score < agreement_min:
+            if self.flip_if_conflict and agreement < self.agreement_min:
                 polarity *= -1
+        return polarity
 
-        constraint_flag = "OK"
-        breaches = sum(
-            [
-                tone_gap > tone_max,
-                hue_gap > hue_max,
-                intensity_gap > intens_max,
-                agreement_score < agreement_min,
-            ]
-        )
-        if window_penalty > 1.0:
-            breaches += 1
-
-        if breaches == 1:
-            constraint_flag = "WARN"
-        elif breaches > 1:
-            constraint_flag = "VIOLATION"
-
-        coupled_cell: ChromaticCell = {
-            "tone": tone_blend,
-            "hue": hue_blend,
-            "intensity": intensity_blend,
-            "polarity": polarity,
-            "timestamp": l_cell.get("timestamp", r_cell.get("timestamp", 0.0)),
-            "agreement": agreement_score,
-            "coherence": coherence,
-            "constraint_flag": constraint_flag,
-            "tone_disparity": tone_gap,
-            "hue_disparity": hue_gap,
-            "intensity_disparity": intensity_gap,
-        }
-        coupled.append(coupled_cell)
 
-    return coupled
+class _Memo(dict):
+    """Dict that fills missing keys from a function."""
+
+    def __init__(self, func: Any) -> None:
+        super().__init__()
+        self.func = func
+
+    def __missing__(self, key: Any) -> Any:
+        value = self[key] = self.func(key)
+        return value
+
+
+def _hue_distance_ints(a: List[int] | None, b: List[int] | None) -> float:
+    """_hue_distance with the first hue already converted to ints."""
+    if a is None or b is None:
+        return 0.0
+    if len(a) == 3 and len(b) == 3:
+        return (abs(a[0] - int(b[0])) + abs(a[1] - int(b[1])) + abs(a[2] - int(b[2]))) / 3
+    distances = [abs(x - int(y)) for x, y in zip(a, b)]
+    return sum(distances) / max(1, len(distances))
+
+
+def _pow_pos(value: float, exponent: float) -> float:
+    """_nonlinear_scale with the exponent already clamped to >= 1."""
+    return value ** exponent if value > 0 else 0.0
+
+
+def compute_coupling_metrics(l_sequence: List[ChromaticCell], r_sequence: List[ChromaticCell], config: Config) -> Dict[str, float]:
+    """Compute aggregate disparity, coherence, and agreement metrics."""
+    return CouplingKernel(config).metrics(l_sequence, r_sequence)
+
+
+def apply_coupling(l_sequence: List[ChromaticCell], r_sequence: List[ChromaticCell], config: Config) -> List[ChromaticCell]:
+    """
+    Bind Tensor L and Tensor R into coupled cells.
+
+    Strategy:
+    - Blend tone/intensity values toward L using weights
+    - Keep hue from R but bias toward L based on hue alignment weight
+    - Update coherence based on per-cell agreement and config thresholds
+    - Enforce polarity consensus when conflicts arise
+    """
+    return CouplingKernel(config).coupled(l_sequence, r_sequence)
 
 
 def process_coupling_sequence(
-    l_sequence: List[ChromaticCell], r_sequence: List[ChromaticCell], config: Config
+    l_sequence: List[ChromaticCell],
+    r_sequence: List[ChromaticCell],
+    config: Config,
+    include_coupled: bool = True,
+    include_per_step: bool = True,
+    include_summary: bool = True,
+    include_flag_track: bool = False,
+    cell_flags: bool = True,
 ) -> Dict[str, Any]:
-    """Return coupled stream, per-step metrics, and summary values."""
-    coupled = apply_coupling(l_sequence, r_sequence, config)
-    per_step = [compute_pair_disparity(l, r, config) for l, r in zip(l_sequence, r_sequence)]
-    summary = compute_coupling_metrics(l_sequence, r_sequence, config)
-    return {"coupled": coupled, "per_step": per_step, "summary": summary}
+    """
+    Return coupled stream, per-step metrics, and summary values.
+
+    The pair disparities are evaluated once and shared by all outputs.
+    The result always has the "coupled", "per_step" and "summary" keys;
+    outputs switched off with the include_* flags are None.
+    include_flag_track adds a run-length encoded "flag_track" (FlagTrack);
+    with cell_flags=False the coupled cells then leave out "constraint_flag"
+    and the flags are kept only in the track.
+    """
+    kernel = CouplingKernel(config)
+    columns = kernel.disparities(l_sequence, r_sequence)
+    bundle: Dict[str, Any] = {"coupled": None, "per_step": None, "summary": None}
+    if include_coupled or include_flag_track:
+        flag_track = FlagTrack() if include_flag_track else None
+        coupled = kernel.coupled(l_sequence, r_sequence, columns, flag_track=flag_track, cell_flags=cell_flags)
+        if include_coupled:
+            bundle["coupled"] = coupled
+        if flag_track is not None:
+            bundle["flag_track"] = flag_track
+    if include_per_step:
+        bundle["per_step"] = kernel.per_step(columns)
+    if include_summary:
+        bundle["summary"] = kernel.metrics(l_sequence, r_sequence, columns)
+    return bundle
+
+
+_RANK_KEYS = {"coherence": "coherence_score", "agreement": "agreement"}
+
+
+def evaluate_r_candidates(
+    l_sequence: List[ChromaticCell],
+    r_candidates: Sequence[List[ChromaticCell]],
+    config: Config,
+    top_k: int | None = None,
+    rank_by: str = "coherence",
+) -> List[Dict[str, Any]]:
+    """
+    Couple one L against many candidate R sequences.
+
+    The config and the L-side terms are resolved once for the whole batch.
+    Returns {"index", "metrics"} entries in candidate order, or, when top_k is
+    given, the top_k candidates by "coherence" or "agreement" (best first,
+    ties by candidate index).
+    """
+    if rank_by not in _RANK_KEYS:
+        raise ValueError(f"rank_by must be one of {sorted(_RANK_KEYS)}, got {rank_by!r}")
+    metrics = CouplingKernel(config).metrics_many(l_sequence, r_candidates)
+    entries = [{"index": idx, "metrics": m} for idx, m in enumerate(metrics)]
+    if top_k is None:
+        return entries
+    key = _RANK_KEYS[rank_by]
+    return heapq.nsmallest(max(0, top_k), entries, key=lambda e: (-e["metrics"][key], e["index"]))
+
+
+# Rolling-sum drift is ~1e-15 relative; penalties this close to 1.0 are re-summed.
+_PENALTY_GUARD = 1e-9
+
+
+class _RollingMean:
+    """Mean over the last `window` values, updated in O(1) per push."""
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self.values: Deque[float] = deque()
+        self.total = 0.0
+        self._since_resync = 0
+
+    def push(self, value: float) -> float:
+        if self.window <= 1:
+            return value
+        self.values.append(value)
+        self.total += value
+        if len(self.values) > self.window:
+            self.total -= self.values.popleft()
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            # Re-sum once per window (amortised O(1)) so float drift from the
+            # add/subtract updates cannot accumulate over long streams.
+            self.total = sum(self.values)
+            self._since_resync = 0
+        return self.total / len(self.values)
+
+    def exact(self) -> float:
+        """Current mean re-summed left to right, bit-identical to _window_stats."""
+        return sum(self.values) / len(self.values)
+
+    def resize(self, window: int) -> None:
+        """Change the window length, keeping the most recent values."""
+        self.window = window
+        if window <= 1:
+            self.values.clear()
+        while len(self.values) > window:
+            self.values.popleft()
+        self.total = sum(self.values)
+        self._since_resync = 0
+
+
+class StreamingCoupler:
+    """
+    Incremental apply_coupling for live, paired L/R streams.
+
+    Cells are coupled one pair at a time with the same laws as apply_coupling.
+    The tone/hue/intensity sliding windows are rolling sums (O(1) per step)
+    and the running summary keeps only totals, so memory stays bounded by the
+    window size however long the stream runs. Integer tone windows are exact;
+    hue and intensity window means agree with apply_coupling to float rounding.
+    When a window penalty lands within _PENALTY_GUARD of the breach threshold,
+    that window is re-summed exactly, so constraint flags always match
+    apply_coupling. An optional FlagTrack records the flags run-length encoded.
+    """
+
+    def __init__(self, config: Config, flag_track: FlagTrack | None = None) -> None:
+        self.kernel = CouplingKernel(config)
+        self.flag_track = flag_track
+        window = self.kernel.window
+        self._tone_window = _RollingMean(window)
+        self._hue_window = _RollingMean(window)
+        self._intensity_window = _RollingMean(window)
+        self.steps = 0
+        self.warnings = 0
+        self.violations = 0
+        self._totals = {key: 0.0 for key in _EMPTY_METRICS}
+
+    def push(self, l_cell: ChromaticCell, r_cell: ChromaticCell) -> ChromaticCell:
+        """Couple one L/R pair and fold it into the running summary."""
+        kernel = self.kernel
+        cols = kernel.disparities([l_cell], [r_cell])
+        means = (
+            self._tone_window.push(cols["tone_disparity"][0]),
+            self._hue_window.push(cols["hue_disparity"][0]),
+            self._intensity_window.push(cols["intensity_disparity"][0]),
+        )
+        if abs(kernel.window_penalty(*means) - 1.0) <= _PENALTY_GUARD and kernel.window > 1:
+            # Near the window-breach threshold the rolling sums' rounding could
+            # flip the flag; re-sum this window exactly as apply_coupling does.
+            means = (self._tone_window.exact(), self._hue_window.exact(), self._intensity_window.exact())
+        windows = ([means[0]], [means[1]], [means[2]])
+        cell = kernel._couple([(l_cell, r_cell)], cols, windows, self.flag_track)[0]
+
+        totals = self._totals
+        totals["tone_disparity"] += cols["tone_disparity"][0]
+        totals["hue_disparity"] += cols["hue_disparity"][0]
+        totals["intensity_disparity"] += cols["intensity_disparity"][0]
+        totals["polarity_disagreement_rate"] += cols["polarity_disagreement"][0]
+        totals["coherence_score"] += cols["coherence"][0]
+        totals["agreement"] += cols["agreement"][0]
+        self.steps += 1
+        if cell["constraint_flag"] == "WARN":
+            self.warnings += 1
+        elif cell["constraint_flag"] == "VIOLATION":
+            self.violations += 1
+        return cell
+
+    def reconfigure(self, config: Config) -> None:
+        """
+        Swap in a new coupling config between pushes.
+
+        Running totals, flag counts and window contents are kept. A narrower
+        window drops its oldest values; a wider one fills from later pushes.
+        """
+        self.kernel = CouplingKernel(config)
+        for rolling in (self._tone_window, self._hue_window, self._intensity_window):
+            rolling.resize(self.kernel.window)
+
+    def summary(self) -> Dict[str, Any]:
+        """Running compute_coupling_metrics values plus step and flag counts."""
+        if self.steps:
+            metrics: Dict[str, Any] = {key: total / self.steps for key, total in self._totals.items()}
+        else:
+            metrics = dict(_EMPTY_METRICS)
+        metrics.update(steps=self.steps, warnings=self.warnings, violations=self.violations)
+        return metrics
+
+
+def stream_coupling(
+    l_cells: Iterable[ChromaticCell], r_cells: Iterable[ChromaticCell], config: Config
+) -> Iterator[Tuple[ChromaticCell, Dict[str, Any]]]:
+    """Yield (coupled cell, running summary) for paired L/R streams."""
+    coupler = StreamingCoupler(config)
+    for l_cell, r_cell in zip(l_cells, r_cells):
+        cell = coupler.push(l_cell, r_cell)
+        yield cell, coupler.summary()
 
 
 def log_coupling_metrics(metrics: Dict[str, float], log_dir: str = "logs") -> None:
@@ -408,11 +789,15 @@ def summarize_coupled_sequence(coupled: List[ChromaticCell]) -> Dict[str, Any]:
 
 
 __all__ = [
+    "CouplingKernel",
     "load_coupling_config",
     "compute_coupling_metrics",
     "compute_pair_disparity",
     "apply_coupling",
     "process_coupling_sequence",
+    "evaluate_r_candidates",
+    "StreamingCoupler",
+    "stream_coupling",
     "log_coupling_metrics",
     "log_tensor_r_behavior",
     "log_end_to_end_summary",
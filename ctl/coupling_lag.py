@@ -0,0 +1,205 @@
+"""
+Lagged L/R alignment search.
+
+Tensor R often trails (or anticipates) Tensor L by a few steps, which makes
+position-wise coupling understate agreement. This module scores every
+candidate offset at once with FFT cross-correlation and then couples the
+sequences at the best offset.
+
+Signals per cell:
+* tone as a phasor on the 12-tone circle, exp(2*pi*i*tone/12); the real part
+  of r * conj(l) is cos of the cyclic tone gap (1.0 when tones agree),
+* intensity and each RGB hue channel, centred and scaled to unit variance.
+
+The channel spectra are combined with the coupling weights before a single
+inverse transform, so the whole search costs O(n log n) for sequences of
+length n. Scores are normalized by the number of overlapping pairs at each
+lag, so they are comparable across lags (1.0 = perfect agreement).
+
+Lag convention: lag k > 0 means R lags L, i.e. L[t] is paired with R[t + k].
+"""
+from __future__ import annotations
+
+import cmath
+import math
+from typing import Any, Dict, List, Sequence, Tuple
+
+from ctl.coupling import process_coupling_sequence
+
+ChromaticCell = Dict[str, Any]
+Config = Dict[str, Any]
+
+_TONE_PHASORS = [cmath.exp(2j * math.pi * tone / 12) for tone in range(12)]
+_TIE_TOLERANCE = 1e-9
+
+
+def _fft(values: List[complex], invert: bool = False) -> List[complex]:
+    """Iterative radix-2 FFT; len(values) must be a power of two."""
+    n = len(values)
+    data = list(values)
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j |= bit
+        if i < j:
+            data[i], data[j] = data[j], data[i]
+
+    size = 2
+    sign = 1 if invert else -1
+    while size <= n:
+        step = cmath.exp(sign * 2j * math.pi / size)
+        half = size // 2
+        twiddles = [1 + 0j] * half
+        for k in range(1, half):
+            twiddles[k] = twiddles[k - 1] * step
+        for start in range(0, n, size):
+            for k in range(half):
+                even = data[start + k]
+                odd = data[start + k + half] * twiddles[k]
+                data[start + k] = even + odd
+                data[start + k + half] = even - odd
+        size <<= 1
+
+    if invert:
+        return [value / n for value in data]
+    return data
+
+
+def _standardize(values: Sequence[float]) -> List[float] | None:
+    """Centre and scale to unit variance; None for a constant channel."""
+    if not values:
+        return None
+    mean = sum(values) / len(values)
+    centred = [v - mean for v in values]
+    std = math.sqrt(sum(v * v for v in centred) / len(centred))
+    if std <= 1e-12:
+        return None
+    return [v / std for v in centred]
+
+
+def _channels(sequence: Sequence[ChromaticCell]) -> Tuple[List[complex], List[float] | None, List[List[float] | None]]:
+    tones = [_TONE_PHASORS[int(cell["tone"]) % 12] for cell in sequence]
+    intensity = _standardize([float(cell["intensity"]) for cell in sequence])
+    hues = [list(cell.get("hue") or [0, 0, 0])[:3] for cell in sequence]
+    hue_channels = [_standardize([float(hue[c]) if c < len(hue) else 0.0 for hue in hues]) for c in range(3)]
+    return tones, intensity, hue_channels
+
+
+def lag_scores(
+    l_sequence: Sequence[ChromaticCell],
+    r_sequence: Sequence[ChromaticCell],
+    config: Config,
+    max_lag: int | None = None,
+) -> Dict[int, float]:
+    """
+    Return the weighted cross-correlation score for each admissible lag.
+
+    Lags are limited to |lag| <= max_lag (config lag.max_lag by default) and
+    to offsets that leave at least lag.min_overlap overlapping pairs.
+    """
+    n_l, n_r = len(l_sequence), len(r_sequence)
+    if not n_l or not n_r:
+        return {}
+
+    weights = config.get("weights", {})
+    tone_w = weights.get("tone_alignment", 0.55)
+    hue_w = weights.get("hue_alignment", 0.25)
+    intensity_w = weights.get("intensity_alignment", 0.2)
+    denom = max(0.001, tone_w + hue_w + intensity_w)
+    lag_cfg = config.get("lag", {})
+    if max_lag is None:
+        max_lag = lag_cfg.get("max_lag", 16)
+    min_overlap = max(1, min(lag_cfg.get("min_overlap", 4), n_l, n_r))
+
+    size = 1
+    while size < n_l + n_r - 1:
+        size <<= 1
+
+    def spectrum(values: Sequence[complex]) -> List[complex]:
+        return _fft(list(values) + [0j] * (size - len(values)))
+
+    l_tone, l_int, l_hue = _channels(l_sequence)
+    r_tone, r_int, r_hue = _channels(r_sequence)
+
+    # Correlation theorem: IFFT(R * conj(L))[k] = sum_t r[t + k] * conj(l[t]).
+    terms: List[Tuple[float, List[complex], List[complex]]] = [(tone_w, l_tone, r_tone)]
+    if l_int is not None and r_int is not None:
+        terms.append((intensity_w, l_int, r_int))
+    for l_chan, r_chan in zip(l_hue, r_hue):
+        if l_chan is not None and r_chan is not None:
+            terms.append((hue_w / 3, l_chan, r_chan))
+
+    combined = [0j] * size
+    for weight, l_values, r_values in terms:
+        l_spec = spectrum(l_values)
+        r_spec = spectrum(r_values)
+        for idx in range(size):
+            combined[idx] += weight * r_spec[idx] * l_spec[idx].conjugate()
+    correlation = _fft(combined, invert=True)
+
+    scores: Dict[int, float] = {}
+    for lag in range(-min(max_lag, n_l - 1), min(max_lag, n_r - 1) + 1):
+        overlap = min(n_l, n_r - lag) - max(0, -lag)
+        if overlap < min_overlap:
+            continue
+        scores[lag] = correlation[lag % size].real / (overlap * denom)
+    return scores
+
+
+def find_best_lag(
+    l_sequence: Sequence[ChromaticCell],
+    r_sequence: Sequence[ChromaticCell],
+    config: Config,
+    max_lag: int | None = None,
+) -> Dict[str, Any]:
+    """Return the best lag, its score and the full score table."""
+    scores = lag_scores(l_sequence, r_sequence, config, max_lag=max_lag)
+    if not scores:
+        return {"lag": 0, "score": 0.0, "scores": {}}
+    top = max(scores.values())
+    # Near-equal scores (FFT rounding) resolve to the smallest offset, R lagging first.
+    lag = min((k for k, v in scores.items() if v >= top - _TIE_TOLERANCE), key=lambda k: (abs(k), -k))
+    return {"lag": lag, "score": scores[lag], "scores": scores}
+
+
+def shift_pairs(
+    l_sequence: Sequence[ChromaticCell], r_sequence: Sequence[ChromaticCell], lag: int
+) -> Tuple[List[ChromaticCell], List[ChromaticCell]]:
+    """Trim both sequences so that L[t] lines up with R[t + lag]."""
+    if lag >= 0:
+        l_part, r_part = list(l_sequence), list(r_sequence[lag:])
+    else:
+        l_part, r_part = list(l_sequence[-lag:]), list(r_sequence)
+    length = min(len(l_part), len(r_part))
+    return l_part[:length], r_part[:length]
+
+
+def process_lagged_coupling(
+    l_sequence: Sequence[ChromaticCell],
+    r_sequence: Sequence[ChromaticCell],
+    config: Config,
+    max_lag: int | None = None,
+) -> Dict[str, Any]:
+    """
+    Find the best L/R lag and run process_coupling_sequence at that lag.
+
+    Returns the usual coupled/per_step/summary bundle plus "lag" and
+    "lag_score".
+    """
+    best = find_best_lag(l_sequence, r_sequence, config, max_lag=max_lag)
+    l_part, r_part = shift_pairs(l_sequence, r_sequence, best["lag"])
+    bundle = process_coupling_sequence(l_part, r_part, config)
+    bundle["lag"] = best["lag"]
+    bundle["lag_score"] = best["score"]
+    return bundle
+
+
+__all__ = [
+    "lag_scores",
+    "find_best_lag",
+    "shift_pairs",
+    "process_lagged_coupling",
+]
@@ -0,0 +1,261 @@
+"""
+Coarse-to-fine coupling for long streams.
+
+Most of a long L/R stream agrees; only disagreement regions need full
+resolution. process_coupling_multires splits the paired stream into blocks
+(multires.block cells, coupling_config.json5) and, per block, computes a
+cheap coarse profile: a representative tone (circular centre), hue and
+intensity (mid-range) for L and R, plus each side's spread around its representative.
+
+Triangle inequality bounds every per-pair gap in the block:
+
+    |gap_i - gap_rep| <= spread_L + spread_R
+
+where gap_rep is the gap between the two representatives (cyclic tone
+distance, mean channel hue distance and intensity difference are all
+metrics). A block is skipped when these upper bounds guarantee that
+apply_coupling would flag every cell OK under `thresholds`: each gap within
+tone_error_max / hue_error_max / intensity_gap_max, agreement at the gap
+bounds >= agreement_min, and the preceding window cells within the same gap
+thresholds (so the window penalty stays below 1). All other blocks are
+refined with the CouplingKernel, with window-1 cells of left context, so
+refined cells equal the full apply_coupling output exactly.
+
+Flag counts are exact. Summary metrics of skipped blocks are estimated from
+the representative gaps, and error_bound holds the largest possible deviation
+of each summary metric from the full compute_coupling_metrics pass.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from operator import ne
+from typing import Any, Dict, List, Sequence, Tuple
+
+from ctl.coupling import CouplingKernel, _tone_distance
+
+ChromaticCell = Dict[str, Any]
+Config = Dict[str, Any]
+
+_SUMMARY_KEYS = (
+    "tone_disparity",
+    "hue_disparity",
+    "intensity_disparity",
+    "polarity_disagreement_rate",
+    "coherence_score",
+    "agreement",
+)
+
+
+def _tone_profile(tones: Sequence[int]) -> Tuple[int, int]:
+    """Representative tone minimizing the largest cyclic distance, and that distance."""
+    return _tone_centre(frozenset(tones))
+
+
+@lru_cache(maxsize=4096)
+def _tone_centre(present: frozenset) -> Tuple[int, int]:
+    if len(present) == 1:
+        return next(iter(present)), 0
+    spreads = {rep: max(_tone_distance(rep, tone) for tone in present) for rep in range(12)}
+    rep = min(spreads, key=lambda tone: (spreads[tone], tone))
+    return rep, spreads[rep]
+
+
+def _mid_spread(values: Sequence[float]) -> Tuple[float, float]:
+    """Mid-range of the values and the largest distance from it."""
+    low, high = min(values), max(values)
+    return (low + high) / 2, (high - low) / 2
+
+
+class _Columns:
+    """Channel columns of one side, extracted once for the coarse pass."""
+
+    def __init__(self, cells: Sequence[ChromaticCell]) -> None:
+        self.tone = [int(cell["tone"]) % 12 for cell in cells]
+        self.intensity = [float(cell["intensity"]) for cell in cells]
+        self.polarity = [cell.get("polarity", 1) for cell in cells]
+        hues = [cell.get("hue") for cell in cells]
+        # Cells without a 3-channel hue force their block to full resolution.
+        self.hue_ok = [hue is not None and len(hue) == 3 for hue in hues]
+        self.hue = [[int(hue[c]) if ok else 0 for hue, ok in zip(hues, self.hue_ok)] for c in range(3)]
+
+    def profile(self, start: int, stop: int) -> Tuple[int, int, List[float], float, float, float] | None:
+        if not all(self.hue_ok[start:stop]):
+            return None
+        tone, tone_spread = _tone_profile(self.tone[start:stop])
+        hue_mid: List[float] = []
+        hue_spread = 0.0
+        for channel in self.hue:
+            mid, spread = _mid_spread(channel[start:stop])
+            hue_mid.append(mid)
+            hue_spread += spread
+        intensity, intensity_spread = _mid_spread(self.intensity[start:stop])
+        return tone, tone_spread, hue_mid, hue_spread / 3, intensity, intensity_spread
+
+
+def _block_bounds(l_cols: _Columns, r_cols: _Columns, start: int, stop: int) -> Dict[str, Any] | None:
+    """Representative gaps and gap intervals for one block (None: refine it)."""
+    l_prof = l_cols.profile(start, stop)
+    r_prof = r_cols.profile(start, stop) if l_prof is not None else None
+    if r_prof is None:
+        return None
+    l_tone, l_tone_spread, l_hue, l_hue_spread, l_int, l_int_spread = l_prof
+    r_tone, r_tone_spread, r_hue, r_hue_spread, r_int, r_int_spread = r_prof
+
+    reps = (
+        _tone_distance(l_tone, r_tone),
+        sum(abs(a - b) for a, b in zip(l_hue, r_hue)) / 3,
+        abs(l_int - r_int),
+    )
+    spreads = (l_tone_spread + r_tone_spread, l_hue_spread + r_hue_spread, l_int_spread + r_int_spread)
+    caps = (6.0, 255.0, float("inf"))
+    return {
+        "rep": reps,
+        "low": tuple(max(0.0, rep - spread) for rep, spread in zip(reps, spreads)),
+        "high": tuple(min(cap, rep + spread) for rep, spread, cap in zip(reps, spreads, caps)),
+        "polarity_disagreements": sum(map(ne, l_cols.polarity[start:stop], r_cols.polarity[start:stop])),
+    }
+
+
+def process_coupling_multires(
+    l_sequence: Sequence[ChromaticCell],
+    r_sequence: Sequence[ChromaticCell],
+    config: Config,
+    block: int | None = None,
+) -> Dict[str, Any]:
+    """
+    Couple L and R coarse-to-fine.
+
+    Returns:
+    - segments: ordered, contiguous {"start", "stop", "resolution"} entries;
+      "fine" segments carry the exact coupled cells, "coarse" ones the gap
+      upper bounds and the agreement lower bound that guarantee OK flags,
+    - summary / error_bound: compute_coupling_metrics estimates and the
+      maximum absolute deviation from the full pass,
+    - flag_counts: exact OK/WARN/VIOLATION counts,
+    - work: cells, refined cells, context cells and the skipped fraction.
+    """
+    kernel = CouplingKernel(config)
+    if block is None:
+        block = config.get("multires", {}).get("block", 16)
+    block = max(1, int(block))
+    n = min(len(l_sequence), len(r_sequence))
+    context = max(0, kernel.window - 1)
+    gap_limits = (kernel.tone_max, kernel.hue_max, kernel.intens_max)
+
+    # --- Coarse pass: bound every block and decide what to refine ---
+    starts = list(range(0, n, block))
+    l_cols, r_cols = _Columns(l_sequence[:n]), _Columns(r_sequence[:n])
+    bounds = [_block_bounds(l_cols, r_cols, s, min(n, s + block)) for s in starts]
+    within = [b is not None and all(h <= lim for h, lim in zip(b["high"], gap_limits)) for b in bounds]
+    skip: List[bool] = []
+    for idx, start in enumerate(starts):
+        ok = within[idx] and kernel.coupled_agreement(*bounds[idx]["high"]) >= kernel.agreement_min
+        first_context_block = max(0, start - context) // block
+        skip.append(ok and all(within[first_context_block:idx]))
+
+    totals = {key: 0.0 for key in _SUMMARY_KEYS}
+    errors = {key: 0.0 for key in _SUMMARY_KEYS}
+    flag_counts = {"OK": 0, "WARN": 0, "VIOLATION": 0}
+    segments: List[Dict[str, Any]] = []
+    refined = evaluated = 0
+
+    idx = 0
+    while idx < len(starts):
+        start = starts[idx]
+        if skip[idx]:
+            stop = min(n, start + block)
+            _add_coarse(kernel, bounds[idx], stop - start, totals, errors)
+            flag_counts["OK"] += stop - start
+            segments.append(
+                {
+                    "start": start,
+                    "stop": stop,
+                    "resolution": "coarse",
+                    "constraint_flag": "OK",
+                    "tone_disparity_max": bounds[idx]["high"][0],
+                    "hue_disparity_max": bounds[idx]["high"][1],
+                    "intensity_disparity_max": bounds[idx]["high"][2],
+                    "agreement_min": kernel.coupled_agreement(*bounds[idx]["high"]),
+                }
+            )
+            idx += 1
+            continue
+
+        # --- Fine pass over a run of consecutive refined blocks ---
+        end = idx
+        while end + 1 < len(starts) and not skip[end + 1]:
+            end += 1
+        stop = min(n, starts[end] + block)
+        ctx = max(0, start - context)
+        l_part, r_part = list(l_sequence[ctx:stop]), list(r_sequence[ctx:stop])
+        columns = kernel.disparities(l_part, r_part)
+        cells = kernel.coupled(l_part, r_part, columns)[start - ctx :]
+        offset = start - ctx
+        totals["tone_disparity"] += sum(columns["tone_disparity"][offset:])
+        totals["hue_disparity"] += sum(columns["hue_disparity"][offset:])
+        totals["intensity_disparity"] += sum(columns["intensity_disparity"][offset:])
+        totals["polarity_disagreement_rate"] += sum(columns["polarity_disagreement"][offset:])
+        totals["coherence_score"] += sum(columns["coherence"][offset:])
+        totals["agreement"] += sum(columns["agreement"][offset:])
+        for cell in cells:
+            flag_counts[cell["constraint_flag"]] += 1
+        segments.append({"start": start, "stop": stop, "resolution": "fine", "coupled": cells})
+        refined += stop - start
+        evaluated += stop - ctx
+        idx = end + 1
+
+    if n:
+        summary = {key: totals[key] / n for key in _SUMMARY_KEYS}
+        error_bound = {key: errors[key] / n for key in _SUMMARY_KEYS}
+    else:
+        summary = kernel.metrics([], [])
+        error_bound = {key: 0.0 for key in _SUMMARY_KEYS}
+
+    return {
+        "segments": segments,
+        "summary": summary,
+        "error_bound": error_bound,
+        "flag_counts": flag_counts,
+        "work": {
+            "cells": n,
+            "blocks": len(starts),
+            "refined_blocks": skip.count(False),
+            "refined_cells": refined,
+            "context_cells": evaluated - refined,
+            "skipped_cells": n - refined,
+            "skipped_fraction": (n - refined) / n if n else 0.0,
+        },
+    }
+
+
+def _add_coarse(
+    kernel: CouplingKernel,
+    bounds: Dict[str, Any],
+    count: int,
+    totals: Dict[str, float],
+    errors: Dict[str, float],
+) -> None:
+    """Fold a skipped block's estimates and error bounds into the running totals."""
+    rep, low, high = bounds["rep"], bounds["low"], bounds["high"]
+    est = tuple(min(max(r, lo), hi) for r, lo, hi in zip(rep, low, high))
+    for key, e, lo, hi in zip(("tone_disparity", "hue_disparity", "intensity_disparity"), est, low, high):
+        totals[key] += count * e
+        errors[key] += count * max(e - lo, hi - e)
+
+    disagreements = bounds["polarity_disagreements"]
+    totals["polarity_disagreement_rate"] += disagreements
+
+    # Pair agreement and coherence decrease monotonically with every gap.
+    agreement = (kernel.pair_agreement(*est), kernel.pair_agreement(*high), kernel.pair_agreement(*low))
+    totals["agreement"] += count * agreement[0]
+    errors["agreement"] += count * max(agreement[0] - agreement[1], agreement[2] - agreement[0])
+
+    coherence = [
+        (count - disagreements) * kernel.pair_coherence(a, 0.0) + disagreements * kernel.pair_coherence(a, 1.0)
+        for a in agreement
+    ]
+    totals["coherence_score"] += coherence[0]
+    errors["coherence_score"] += max(coherence[0] - coherence[1], coherence[2] - coherence[0])
+
+
+__all__ = ["process_coupling_multires"]
@@ -0,0 +1,146 @@
+"""
+Memoized Tensor R fiber results.
+
+Tuning runs call run_multi_tensor over the same L with mostly unchanged fiber
+configs. A FiberCache stores each fiber's R sequence under a key built from
+
+- a canonical hash of the Tensor R config,
+- a canonical hash of the memory config the fiber actually uses (None when
+  memory integration is disabled), and
+- a digest of the L sequence,
+
+so only fibers whose config (or L) changed are recomputed. Lookups go to an
+in-memory LRU tier first and then to an optional on-disk tier of JSON files
+written atomically. The disk tier round-trips the cells exactly: floats are
+written with repr precision and tuples (e.g. tuple hues carried over from L
+inputs) are stored tagged and restored as tuples.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Sequence
+
+from ctl.tensor_r_update import _resolve_memory_config
+
+ChromaticCell = Dict[str, Any]
+Config = Dict[str, Any]
+
+CACHE_FORMAT_VERSION = 2
+_TUPLE_TAG = "__tuple__"
+
+
+def canonical_hash(value: Any) -> str:
+    """SHA-256 of the canonical (sorted-key, compact) JSON form of value."""
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def l_sequence_digest(l_sequence: Sequence[ChromaticCell]) -> str:
+    """Digest of an L sequence, hashed cell by cell."""
+    digest = hashlib.sha256()
+    for cell in l_sequence:
+        digest.update(json.dumps(cell, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def fiber_cache_key(config: Config, l_digest: str, memory_config: Config | None = None) -> str:
+    """Cache key for one fiber run of update_tensor_r_sequence."""
+    memory_enabled = config.get("behaviors", {}).get("memory_integration", {}).get("enabled", True)
+    resolved_memory = _resolve_memory_config(memory_config) if memory_enabled else None
+    return canonical_hash(
+        {
+            "format": CACHE_FORMAT_VERSION,
+            "tensor_r": config,
+            "memory": resolved_memory,
+            "l": l_digest,
+        }
+    )
+
+
+def _tag_tuples(value: Any) -> Any:
+    """Copy of value with tuples replaced by tagged objects, for JSON."""
+    if isinstance(value, tuple):
+        return {_TUPLE_TAG: [_tag_tuples(item) for item in value]}
+    if isinstance(value, list):
+        return [_tag_tuples(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _tag_tuples(item) for key, item in value.items()}
+    return value
+
+
+def _untag_tuples(obj: Dict[str, Any]) -> Any:
+    """json.load object_hook restoring tuples written by _tag_tuples."""
+    if len(obj) == 1 and _TUPLE_TAG in obj:
+        return tuple(obj[_TUPLE_TAG])
+    return obj
+
+
+class FiberCache:
+    """Two-tier (memory LRU + optional directory) cache of fiber R sequences."""
+
+    def __init__(self, root: str | None = None, max_entries: int = 128) -> None:
+        self.root = root
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, List[ChromaticCell]]" = OrderedDict()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        if root is not None:
+            os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.fiber.json")
+
+    def get(self, key: str) -> List[ChromaticCell] | None:
+        """Return a private copy of the cached sequence, or None."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return copy.deepcopy(self._memory[key])
+        if self.root is not None:
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as handle:
+                    payload = json.load(handle, object_hook=_untag_tuples)
+            except FileNotFoundError:
+                payload = None
+            if payload is not None and payload.get("format") == CACHE_FORMAT_VERSION:
+                self.stats["disk_hits"] += 1
+                self._remember(key, payload["r_sequence"])
+                return copy.deepcopy(payload["r_sequence"])
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, r_sequence: List[ChromaticCell]) -> None:
+        """Store a copy of the sequence in both tiers."""
+        stored = copy.deepcopy(r_sequence)
+        self._remember(key, stored)
+        if self.root is not None:
+            path = self._path(key)
+            tmp_path = f"{path}.tmp.{os.getpid()}"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(
+                    {"format": CACHE_FORMAT_VERSION, "r_sequence": _tag_tuples(stored)}, handle, separators=(",", ":")
+                )
+            os.replace(tmp_path, path)
+
+    def _remember(self, key: str, r_sequence: List[ChromaticCell]) -> None:
+        self._memory[key] = r_sequence
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory tier (the disk tier is kept)."""
+        self._memory.clear()
+
+
+__all__ = [
+    "CACHE_FORMAT_VERSION",
+    "FiberCache",
+    "canonical_hash",
+    "fiber_cache_key",
+    "l_sequence_digest",
+]
@@ -0,0 +1,84 @@
+"""
+Process-pool execution of Tensor R fibers.
+
+run_fibers_parallel publishes the shared L sequence once: it is serialized a
+single time into a multiprocessing.shared_memory block, and every worker
+process loads it from there once (in the pool initializer). Tasks then carry
+only a fiber index and its config, so L is never pickled per task.
+
+Results come back through Pool.map, which preserves task order, so the output
+is deterministic and identical to running the fibers serially (the workers
+run the same update_tensor_r_sequence on a bit-exact copy of L).
+"""
+from __future__ import annotations
+
+import multiprocessing
+import pickle
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Sequence, Tuple
+
+from ctl.l_features import LFeatures, compute_l_features
+from ctl.shared_memory_state import attach_untracked
+from ctl.tensor_r_update import update_tensor_r_sequence
+
+ChromaticCell = Dict[str, Any]
+Config = Dict[str, Any]
+
+# Per-worker copy of L and its shared features, loaded once by _init_worker.
+_WORKER_L: List[ChromaticCell] = []
+_WORKER_FEATURES: LFeatures | None = None
+
+
+def publish_sequence(sequence: Sequence[ChromaticCell]) -> Tuple[shared_memory.SharedMemory, int]:
+    """Serialize a cell sequence once into a new shared memory block."""
+    payload = pickle.dumps(list(sequence), protocol=pickle.HIGHEST_PROTOCOL)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(payload)))
+    shm.buf[: len(payload)] = payload
+    return shm, len(payload)
+
+
+def load_sequence(name: str, size: int) -> List[ChromaticCell]:
+    """Read a sequence published with publish_sequence."""
+    shm = attach_untracked(name)
+    try:
+        return pickle.loads(bytes(shm.buf[:size]))
+    finally:
+        shm.close()
+
+
+def _init_worker(name: str, size: int) -> None:
+    global _WORKER_L, _WORKER_FEATURES
+    _WORKER_L = load_sequence(name, size)
+    _WORKER_FEATURES = compute_l_features(_WORKER_L)
+
+
+def _run_fiber(config: Config) -> List[ChromaticCell]:
+    return update_tensor_r_sequence(_WORKER_L, config, l_features=_WORKER_FEATURES)
+
+
+def run_fibers_parallel(
+    l_sequence: Sequence[ChromaticCell],
+    r_configs: Sequence[Config],
+    processes: int | None = None,
+    context: str | None = None,
+) -> List[List[ChromaticCell]]:
+    """
+    Run update_tensor_r_sequence for every config on a process pool.
+
+    processes defaults to min(len(r_configs), cpu_count()); context selects
+    the multiprocessing start method (platform default when None).
+    """
+    if not r_configs:
+        return []
+    workers = min(len(r_configs), processes or multiprocessing.cpu_count())
+    shm, size = publish_sequence(l_sequence)
+    try:
+        ctx = multiprocessing.get_context(context)
+        with ctx.Pool(processes=workers, initializer=_init_worker, initargs=(shm.name, size)) as pool:
+            return pool.map(_run_fiber, list(r_configs), chunksize=1)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+__all__ = ["publish_sequence", "load_sequence", "run_fibers_parallel"]
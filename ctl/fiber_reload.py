@@ -0,0 +1,234 @@
+"""
+Hot config reload for running Tensor R fibers.
+
+A FiberEnsemble steps a set of fibers over a live L stream with resumable
+TensorRState objects (and, with a coupling config, one StreamingCoupler per
+fiber). New Tensor R, coupling or memory parameters are staged with reload()
+or apply_feedback() and swapped in at the next step boundary:
+
+- Patches are partial nested dicts merged over the current configs. Every key
+  must already exist in the config it patches, so a typo fails at staging
+  time instead of silently adding a dead key.
+- All new configs are built when the patch is staged and are swapped in
+  together before the next step, so every fiber in the ensemble moves to the
+  new parameters on the same step. A patch that fails validation changes
+  nothing.
+- R state, flip history, memory state and coupling totals carry over
+  unchanged. Flip history is kept to `history_limit` entries so that a wider
+  flip_window takes effect immediately.
+
+Cells produced after a reload match a fresh run that used the old configs up to
+the reload step and the new configs from then on, so long prefixes never need
+recomputing.
+"""
+from __future__ import annotations
+
+import copy
+import threading
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from ctl import memory
+from ctl.coupling import StreamingCoupler
+from ctl.feedback import FeedbackSignal, load_feedback_config
+from ctl.tensor_r_update import (
+    TensorRState,
+    _resolve_memory_config,
+    advance_tensor_r_state,
+    init_tensor_r_state,
+)
+
+ChromaticCell = Dict[str, Any]
+Config = Dict[str, Any]
+
+
+def merge_config(base: Config, patch: Config, path: str = "") -> Config:
+    """Return a deep copy of base with patch merged in (unknown keys raise ValueError)."""
+    merged = copy.deepcopy(base)
+    for key, value in patch.items():
+        where = f"{path}.{key}" if path else key
+        if key not in merged:
+            raise ValueError(f"Unknown config key: {where}")
+        if isinstance(value, dict):
+            if not isinstance(merged[key], dict):
+                raise ValueError(f"Config key {where} is not a section")
+            merged[key] = merge_config(merged[key], value, where)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def _nested_patch(path: Sequence[str], value: Any) -> Config:
+    patch: Any = value
+    for key in reversed(path):
+        patch = {key: patch}
+    return patch
+
+
+def _lookup(config: Config, path: Sequence[str]) -> Any:
+    value: Any = config
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            raise ValueError(f"Unknown config key: {'.'.join(path)}")
+        value = value[key]
+    return value
+
+
+def _memory_enabled(config: Config) -> bool:
+    return config.get("behaviors", {}).get("memory_integration", {}).get("enabled", True)
+
+
+class FiberEnsemble:
+    """A set of Tensor R fibers stepped together, with config hot reload."""
+
+    def __init__(
+        self,
+        r_configs: Sequence[Config],
+        coupling_config: Config | None = None,
+        memory_config: Config | None = None,
+        history_limit: int = 64,
+    ) -> None:
+        self.configs: List[Config] = [copy.deepcopy(cfg) for cfg in r_configs]
+        self.coupling_config = copy.deepcopy(coupling_config) if coupling_config is not None else None
+        self.memory_config = copy.deepcopy(_resolve_memory_config(memory_config))
+        self.history_limit = history_limit
+        self.states: List[TensorRState] = [init_tensor_r_state(cfg) for cfg in self.configs]
+        self.couplers: List[StreamingCoupler] | None = (
+            [StreamingCoupler(self.coupling_config) for _ in self.configs] if self.coupling_config is not None else None
+        )
+        self.step_count = 0
+        self.version = 0
+        self.history: List[Tuple[int, int]] = []  # (step applied at, version)
+        self._pending: Tuple[List[Config], Config | None, Config, int] | None = None
+        self._lock = threading.RLock()
+
+    # --- Staging ---
+
+    def reload(
+        self,
+        tensor_r: Config | None = None,
+        coupling: Config | None = None,
+        memory: Config | None = None,
+        fibers: Iterable[int] | None = None,
+    ) -> int:
+        """
+        Stage a config patch for the next step boundary and return its version.
+
+        tensor_r patches the Tensor R configs of `fibers` (all fibers when
+        None); coupling and memory patch the ensemble-wide configs. Patches
+        staged before the same boundary compose in order.
+        """
+        targets = set(range(len(self.configs)) if fibers is None else fibers)
+        unknown = targets - set(range(len(self.configs)))
+        if unknown:
+            raise ValueError(f"Unknown fiber index: {min(unknown)}")
+        patches = [tensor_r if idx in targets else None for idx in range(len(self.configs))]
+        return self._stage(patches, coupling, memory)
+
+    def apply_feedback(self, signal: FeedbackSignal, feedback_config: Config | None = None) -> int:
+        """
+        Stage compute_feedback adjustments as one reload.
+
+        Each adjustment (cadence, polarity, window) is scaled, added to the
+        parameter named by feedback_config["reload_targets"] and clamped to its
+        range. Tensor R targets are adjusted per fiber from that fiber's value.
+        """
+        cfg = feedback_config or load_feedback_config()
+        targets = cfg.get("reload_targets", {})
+        with self._lock:
+            configs, coupling_config, memory_config, _ = self._staged()
+            patches: List[Config] = [{} for _ in configs]
+            shared: Dict[str, Config] = {"coupling": {}, "memory": {}}
+            for name, delta in signal.adjustments.items():
+                target = targets.get(name)
+                if target is None or not delta:
+                    continue
+                section, path = target["section"], target["path"]
+                if section == "tensor_r":
+                    for patch, config in zip(patches, configs):
+                        _deep_update(patch, _nested_patch(path, _adjusted(_lookup(config, path), target, delta)))
+                elif section == "coupling":
+                    if coupling_config is not None:
+                        value = _adjusted(_lookup(coupling_config, path), target, delta)
+                        _deep_update(shared["coupling"], _nested_patch(path, value))
+                elif section == "memory":
+                    value = _adjusted(_lookup(memory_config, path), target, delta)
+                    _deep_update(shared["memory"], _nested_patch(path, value))
+                else:
+                    raise ValueError(f"Unknown reload target section: {section}")
+            return self._stage(patches, shared["coupling"], shared["memory"])
+
+    def _staged(self) -> Tuple[List[Config], Config | None, Config, int]:
+        return self._pending or (self.configs, self.coupling_config, self.memory_config, self.version)
+
+    def _stage(self, patches: Sequence[Config | None], coupling: Config | None, memory: Config | None) -> int:
+        with self._lock:
+            configs, coupling_config, memory_config, version = self._staged()
+            if coupling and coupling_config is None:
+                raise ValueError("Ensemble has no coupling config to patch")
+            # Build every new config before touching the pending slot, so a
+            # bad patch leaves the staged state as it was.
+            new_configs = [merge_config(cfg, patch) if patch else cfg for cfg, patch in zip(configs, patches)]
+            new_coupling = merge_config(coupling_config, coupling) if coupling else coupling_config
+            new_memory = merge_config(memory_config, memory) if memory else memory_config
+            self._pending = (new_configs, new_coupling, new_memory, version + 1)
+            return version + 1
+
+    # --- Stepping ---
+
+    def _apply_pending(self) -> None:
+        if self._pending is None:
+            return
+        configs, coupling_config, memory_config, version = self._pending
+        for state, config in zip(self.states, configs):
+            if state.memory_state is None and _memory_enabled(config):
+                state.memory_state = memory.MemoryState()
+        if self.couplers is not None and coupling_config is not self.coupling_config:
+            for coupler in self.couplers:
+                coupler.reconfigure(coupling_config)
+        self.configs, self.coupling_config, self.memory_config = configs, coupling_config, memory_config
+        self.version = version
+        self.history.append((self.step_count, version))
+        self._pending = None
+
+    def step(self, l_cell: ChromaticCell) -> List[ChromaticCell]:
+        """Apply any staged reload, then advance every fiber by one L cell."""
+        with self._lock:
+            self._apply_pending()
+            r_cells = [
+                advance_tensor_r_state(state, l_cell, config, self.memory_config, history_limit=self.history_limit)
+                for state, config in zip(self.states, self.configs)
+            ]
+            if self.couplers is not None:
+                for coupler, r_cell in zip(self.couplers, r_cells):
+                    coupler.push(l_cell, r_cell)
+            self.step_count += 1
+            return r_cells
+
+    def run(self, l_cells: Iterable[ChromaticCell]) -> List[List[ChromaticCell]]:
+        """Step through l_cells and return the new R cells per fiber."""
+        sequences: List[List[ChromaticCell]] = [[] for _ in self.configs]
+        for l_cell in l_cells:
+            for sequence, r_cell in zip(sequences, self.step(l_cell)):
+                sequence.append(r_cell)
+        return sequences
+
+    def coupling_summaries(self) -> List[Dict[str, Any]]:
+        """Running coupling summary per fiber (empty without a coupling config)."""
+        return [coupler.summary() for coupler in self.couplers] if self.couplers is not None else []
+
+
+def _adjusted(current: Any, target: Config, delta: float) -> Any:
+    value = current + delta * target.get("scale", 1.0)
+    value = min(target.get("max", value), max(target.get("min", value), value))
+    return int(round(value)) if target.get("integer", False) else value
+
+
+def _deep_update(target: Config, patch: Config) -> None:
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _deep_update(target[key], value)
+        else:
+            target[key] = value
+
+
+__all__ = ["FiberEnsemble", "merge_config"]
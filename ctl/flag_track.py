@@ -0,0 +1,221 @@
+"""
+Run-length encoded constraint-flag track.
+
+Coupled and R cells each carry a constraint_flag string, but flags change
+rarely: long streams are mostly OK with occasional WARN/VIOLATION runs. A
+FlagTrack stores the flags of a stream as runs and keeps per-flag cumulative
+counts at run boundaries, so
+
+* all WARN/VIOLATION spans are listed without scanning cells,
+* flag counts over an index range cost O(log runs),
+* flag counts over a time range cost one more bisect over the runs.
+
+Nothing is stored per cell. Each run keeps its first timestamp, its timestamp
+stride and its last timestamp; a run also breaks where the stride changes, so
+a cell's timestamp is t_start + offset * stride exactly. L streams on a fixed
+clock (the usual case) therefore need one run per flag change; irregular
+clocks cost one run per stride change. Timestamps must be non-decreasing for
+the time queries.
+
+The coupling kernel and the Tensor R sequence builders can fill a track
+directly while they run (see CouplingKernel.coupled and
+update_tensor_r_sequence).
+"""
+from __future__ import annotations
+
+import bisect
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+ChromaticCell = Dict[str, Any]
+
+FLAGS = ("OK", "WARN", "VIOLATION")
+_CODES = {flag: code for code, flag in enumerate(FLAGS)}
+
+
+@dataclass(frozen=True)
+class FlagRun:
+    """Maximal run of one flag over cells [start, stop)."""
+
+    flag: str
+    start: int
+    stop: int
+    t_start: float
+    t_end: float
+
+    @property
+    def length(self) -> int:
+        return self.stop - self.start
+
+
+class FlagTrack:
+    """Append-only run-length encoded flag track with count index."""
+
+    def __init__(self) -> None:
+        self._codes = array("b")  # flag code per run
+        self._starts = array("q")  # first cell index per run
+        self._t_starts = array("d")  # first timestamp per run
+        self._strides = array("d")  # timestamp step within a run
+        self._t_ends = array("d")  # last timestamp per run
+        # _before[code][r] = cells with flag `code` before run r
+        self._before = [array("q") for _ in FLAGS]
+        self._totals = [0] * len(FLAGS)
+        self._length = 0
+        self._flag_runs = 0
+
+    @classmethod
+    def from_cells(cls, cells: Iterable[ChromaticCell]) -> "FlagTrack":
+        """Build a track from cells carrying constraint_flag/timestamp."""
+        track = cls()
+        for idx, cell in enumerate(cells):
+            track.append(cell.get("constraint_flag", "OK"), cell.get("timestamp", float(idx)))
+        return track
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def run_count(self) -> int:
+        """Number of maximal flag runs."""
+        return self._flag_runs
+
+    def append(self, flag: str, timestamp: float) -> None:
+        """Append one cell's flag."""
+        code = _CODES.get(flag)
+        if code is None:
+            raise ValueError(f"Unknown constraint flag: {flag!r}")
+        timestamp = float(timestamp)
+        if not self._codes or self._codes[-1] != code:
+            self._flag_runs += 1
+            self._new_run(code, timestamp)
+        elif not self._extend_run(timestamp):
+            self._new_run(code, timestamp)
+        self._totals[code] += 1
+        self._length += 1
+
+    def _new_run(self, code: int, timestamp: float) -> None:
+        self._codes.append(code)
+        self._starts.append(self._length)
+        self._t_starts.append(timestamp)
+        self._strides.append(0.0)
+        self._t_ends.append(timestamp)
+        for before, total in zip(self._before, self._totals):
+            before.append(total)
+
+    def _extend_run(self, timestamp: float) -> bool:
+        """Add timestamp to the last run if it stays on the run's stride."""
+        offset = self._length - self._starts[-1]
+        t_start = self._t_starts[-1]
+        if offset == 1:
+            stride = timestamp - t_start
+            if t_start + stride != timestamp:
+                return False
+            self._strides[-1] = stride
+        elif t_start + offset * self._strides[-1] != timestamp:
+            return False
+        self._t_ends[-1] = timestamp
+        return True
+
+    def extend(self, flags: Iterable[str], timestamps: Iterable[float]) -> None:
+        for flag, timestamp in zip(flags, timestamps):
+            self.append(flag, timestamp)
+
+    # --- queries ---
+
+    def _run_stop(self, run: int) -> int:
+        return self._starts[run + 1] if run + 1 < len(self._starts) else self._length
+
+    def flag_at(self, index: int) -> str:
+        """Flag of the cell at index."""
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return FLAGS[self._codes[bisect.bisect_right(self._starts, index) - 1]]
+
+    def runs(self, flags: str | Sequence[str] | None = None) -> Iterator[FlagRun]:
+        """Iterate maximal flag runs, optionally only those of the given flag(s)."""
+        wanted = None
+        if flags is not None:
+            wanted = {_CODES[flags]} if isinstance(flags, str) else {_CODES[flag] for flag in flags}
+        codes = self._codes
+        first = 0
+        for run in range(len(codes)):
+            # Stride breaks split a flag run internally; merge them back.
+            if run + 1 < len(codes) and codes[run + 1] == codes[run]:
+                continue
+            if wanted is None or codes[run] in wanted:
+                yield FlagRun(
+                    FLAGS[codes[run]],
+                    self._starts[first],
+                    self._run_stop(run),
+                    self._t_starts[first],
+                    self._t_ends[run],
+                )
+            first = run + 1
+
+    def spans(self, flags: str | Sequence[str] = ("WARN", "VIOLATION")) -> List[FlagRun]:
+        """All runs of the given flag(s); defaults to every non-OK run."""
+        return list(self.runs(flags))
+
+    def _count_before(self, code: int, index: int) -> int:
+        """Cells with flag `code` in [0, index)."""
+        if index <= 0 or not self._codes:
+            return 0
+        index = min(index, len(self))
+        run = bisect.bisect_right(self._starts, index - 1) - 1
+        count = self._before[code][run]
+        if self._codes[run] == code:
+            count += index - self._starts[run]
+        return count
+
+    def count(self, flag: str, start: int = 0, stop: int | None = None) -> int:
+        """Cells with `flag` in the index range [start, stop)."""
+        code = _CODES[flag]
+        stop = len(self) if stop is None else stop
+        return max(0, self._count_before(code, stop) - self._count_before(code, start))
+
+    def counts(self, start: int = 0, stop: int | None = None) -> Dict[str, int]:
+        """Per-flag counts in the index range [start, stop)."""
+        return {flag: self.count(flag, start, stop) for flag in FLAGS}
+
+    def _first_index(self, timestamp: float, inclusive: bool) -> int:
+        """First cell with timestamp >= (inclusive) or > (not inclusive) the given one."""
+        find = bisect.bisect_left if inclusive else bisect.bisect_right
+        run = find(self._t_ends, timestamp)
+        if run == len(self._t_ends):
+            return self._length
+        start, t_start, stride = self._starts[run], self._t_starts[run], self._strides[run]
+        size = self._run_stop(run) - start
+
+        def before(offset: int) -> bool:
+            value = t_start + offset * stride
+            return value < timestamp if inclusive else value <= timestamp
+
+        offset = 0
+        if stride > 0 and before(0):
+            offset = min(size - 1, max(0, math.ceil((timestamp - t_start) / stride)))
+            # The division can round either way; settle on the exact cell.
+            while offset > 0 and not before(offset - 1):
+                offset -= 1
+            while offset < size - 1 and before(offset):
+                offset += 1
+        return start + offset
+
+    def index_range(self, t_start: float, t_end: float) -> tuple:
+        """Cell index range [start, stop) with t_start <= timestamp <= t_end."""
+        return self._first_index(t_start, True), self._first_index(t_end, False)
+
+    def counts_between(self, t_start: float, t_end: float) -> Dict[str, int]:
+        """Per-flag counts for cells with t_start <= timestamp <= t_end."""
+        return self.counts(*self.index_range(t_start, t_end))
+
+    def to_flags(self) -> List[str]:
+        """Expand back to one flag per cell."""
+        flags: List[str] = []
+        for run in self.runs():
+            flags.extend([run.flag] * run.length)
+        return flags
+
+
+__all__ = ["FLAGS", "FlagRun", "FlagTrack"]
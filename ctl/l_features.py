@@ -0,0 +1,96 @@
+"""
+L-derived features shared by every fiber of a multi-tensor run.
+
+All Tensor R fibers and all per-fiber coupling summaries read the same L
+sequence. The L-only quantities they need (tone columns and trends, polarity
+change flags, hue channel vectors, intensities, the timestamp chain and the
+coupling kernel's L terms) are computed once here and handed to each
+consumer, so per-fiber cost is the fiber-specific work only.
+
+This module only depends on the cell layout, so both the Tensor R update and
+the coupling kernel can build on it without depending on each other.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence, Tuple
+
+ChromaticCell = Dict[str, Any]
+
+
+@dataclass
+class LFeatures:
+    """Column view of an L sequence (index i describes L[i])."""
+
+    tones: List[int]
+    trends: List[int]  # L[i].tone - L[i-1].tone, 0 at i = 0
+    polarities: List[int]
+    polarity_changed: List[bool]  # L[i].polarity != L[i-1].polarity, False at i = 0
+    hue_channels: List[List[int]]  # one column per RGB channel
+    intensities: List[float]
+    timestamps: List[float]  # R timestamp chain: L timestamp, else previous + 1.0
+    coupling_terms: Tuple[List[Any], ...] = field(repr=False)  # coupling_l_terms
+    fingerprint: int = field(repr=False)  # l_fingerprint of the source sequence
+
+    def __len__(self) -> int:
+        return len(self.tones)
+
+    def check(self, l_sequence: Sequence[ChromaticCell]) -> None:
+        """Raise ValueError unless these features were computed from this sequence."""
+        if len(l_sequence) != len(self):
+            raise ValueError(f"L features cover {len(self)} cells, sequence has {len(l_sequence)}")
+        if l_fingerprint(l_sequence) != self.fingerprint:
+            raise ValueError("L features were computed from a different L sequence")
+
+
+def coupling_l_terms(l_sequence: Sequence[ChromaticCell]) -> Tuple[List[Any], ...]:
+    """Per-cell L values used by every coupling disparity evaluation against this L."""
+    return (
+        [l["tone"] for l in l_sequence],
+        [None if l.get("hue") is None else [int(x) for x in l["hue"]] for l in l_sequence],
+        [float(l["intensity"]) for l in l_sequence],
+        [l.get("polarity", 1) for l in l_sequence],
+    )
+
+
+def l_fingerprint(l_sequence: Sequence[ChromaticCell]) -> int:
+    """
+    Cheap fingerprint of the L fields the features are derived from.
+
+    A hash over each cell's tone, hue, intensity, polarity and timestamp. It
+    guards against passing features of another sequence, not against
+    deliberate collisions (see ctl.fiber_cache.l_sequence_digest for that).
+    """
+    return hash(
+        tuple(
+            (cell["tone"], tuple(cell["hue"]), cell["intensity"], cell["polarity"], cell.get("timestamp"))
+            for cell in l_sequence
+        )
+    )
+
+
+def compute_l_features(l_sequence: Sequence[ChromaticCell]) -> LFeatures:
+    """Extract every L-only column once."""
+    cells = list(l_sequence)
+    tones = [cell["tone"] for cell in cells]
+    polarities = [cell["polarity"] for cell in cells]
+    channels = len(cells[0]["hue"]) if cells else 0
+
+    timestamps: List[float] = []
+    for cell in cells:
+        timestamps.append(cell.get("timestamp", timestamps[-1] + 1.0 if timestamps else 0.0))
+
+    return LFeatures(
+        tones=tones,
+        trends=[0] + [curr - prev for prev, curr in zip(tones, tones[1:])],
+        polarities=polarities,
+        polarity_changed=[False] + [curr != prev for prev, curr in zip(polarities, polarities[1:])],
+        hue_channels=[[cell["hue"][channel] for cell in cells] for channel in range(channels)],
+        intensities=[cell["intensity"] for cell in cells],
+        timestamps=timestamps,
+        coupling_terms=coupling_l_terms(cells),
+        fingerprint=l_fingerprint(cells),
+    )
+
+
+__all__ = ["LFeatures", "compute_l_features", "coupling_l_terms", "l_fingerprint"]
@@ -3,16 +3,23 @@
 This module stores and retrieves tone/hue attractors that reinforce over time
 from L-stream observations. The goal is to provide stable peaks that Tensor R
 can snap to and to expose quick similarity checks for coherence boosting.
+
+State is held either as a plain dict (init_memory_state/update_memory_state)
+or as an indexed MemoryState that updates in place; the query helpers accept
+both.
 """
 from __future__ import annotations
 
 import json
+import math
 import os
-from typing import Any, Dict, List, Tuple
+from itertools import product
+from operator import add, sub
+from typing import Any, Dict, List, Sequence, Tuple
 
 ChromaticCell = Dict[str, Any]
 Config = Dict[str, Any]
-MemoryState = Dict[str, Any]
+MemoryDict = Dict[str, Any]
 
 
 def load_memory_config(path: str | None = None) -> Config:
@@ -22,7 +29,7 @@ def load_memory_config(path: str | None = None) -> Config:
         return json.load(f)
 
 
-def init_memory_state() -> MemoryState:
+def init_memory_state() -> MemoryDict:
     """Return an empty memory state container."""
     return {
         "tone_peaks": [],
@@ -31,168 +38,491 @@ def init_memory_state() -> MemoryState:
     }
 
 
-# --- distance helpers ---
-
-def _tone_distance(a: int, b: int) -> int:
-    diff = abs(a - b) % 12
-    return min(diff, 12 - diff)
-
-
-def _hue_distance(a: List[int], b: List[int]) -> float:
-    if a is None or b is None:
-        return 0.0
-    gaps = [abs(int(x) - int(y)) for x, y in zip(a, b)]
-    return sum(gaps) / max(1, len(gaps))
-
+# --- indexed in-place state ---
 
-# --- peak maintenance ---
+_TONE_SLOTS = 12
+_DEFAULT_HUE_CELL = 75.0
+_OFFSET_CACHE: Dict[Tuple[int, int], List[Tuple[int, ...]]] = {}
+# Fold the lazy decay scale back into raw strengths before it underflows.
+_RENORM_BOUND = 1e-6
 
-def _decay_peaks(peaks: List[Dict[str, Any]], decay: float, min_strength: float) -> List[Dict[str, Any]]:
-    decayed: List[Dict[str, Any]] = []
-    for peak in peaks:
-        new_strength = peak["strength"] * max(0.0, 1.0 - decay)
-        if new_strength >= min_strength:
-            updated = dict(peak)
-            updated["strength"] = new_strength
-            decayed.append(updated)
-    return decayed
 
+class MemoryState:
+    """
+    In-place memory accumulator with indexed peak lookup.
+
+    Tone peaks live in a fixed 12-slot array indexed by tone. Hue peaks live in
+    a table keyed by peak id plus a quantized RGB grid (cubes of `hue_cell`
+    units per channel), so a radius query only visits neighbouring grid cells.
+    Each peak carries an insertion order that reproduces the first-in-list
+    tie-breaking of the dict representation, so the class behaves exactly like
+    the dict API (init_memory_state/update_memory_state), which wraps it.
+
+    Decay is lazy: peaks store raw strengths and each table keeps a global
+    scale factor, so the effective strength is raw * scale. A decay step only
+    multiplies the scale. Peaks are pruned when the weakest one (tracked as a
+    lower bound) falls below min_strength, and the scale is folded back into
+    the raw strengths once it drops below a fixed bound. Reads never change the
+    state, so snapshots taken mid-stream do not perturb later results.
+
+    raw * scale groups the decay multiplications differently from eager
+    per-peak decay, so strengths agree with the eager values only to a
+    relative error of about one ulp per decay step. A peak whose eager
+    strength lands within that margin of min_strength can be pruned one step
+    earlier or later than eager decay would prune it; everywhere else the
+    same peaks are pruned on the same step.
+    """
 
-def _nearest_tone_peak(peaks: List[Dict[str, Any]], tone: int) -> Tuple[Dict[str, Any] | None, int]:
-    if not peaks:
+    __slots__ = (
+        "tone_raw",
+        "tone_order",
+        "tone_count",
+        "tone_scale",
+        "hue_peaks",
+        "hue_grid",
+        "hue_cell",
+        "hue_scale",
+        "epoch",
+        "updates",
+        "_next_order",
+        "_tone_floor",
+        "_hue_floor",
+    )
+
+    def __init__(self, hue_cell: float = _DEFAULT_HUE_CELL) -> None:
+        self.tone_raw: List[float | None] = [None] * _TONE_SLOTS
+        self.tone_order: List[int] = [0] * _TONE_SLOTS
+        self.tone_count = 0
+        self.tone_scale = 1.0
+        # order -> [hue, raw strength]; the order doubles as the peak id
+        self.hue_peaks: Dict[int, List[Any]] = {}
+        self.hue_grid: Dict[Tuple[int, ...], List[int]] = {}
+        self.hue_cell = float(hue_cell)
+        self.hue_scale = 1.0
+        # number of decay steps applied so far
+        self.epoch = 0
+        self.updates = 0
+        self._next_order = 0
+        self._tone_floor = math.inf
+        self._hue_floor = math.inf
+
+    # --- conversion ---
+
+    @classmethod
+    def from_dict(cls, data: MemoryDict, hue_cell: float = _DEFAULT_HUE_CELL) -> "MemoryState":
+        """
+        Build an indexed state from the dict representation.
+
+        Tone peaks are indexed by pitch class, so two peaks whose tones are
+        equal mod 12 raise ValueError.
+        """
+        state = cls(hue_cell=hue_cell)
+        for peak in data.get("tone_peaks", []):
+            state._add_tone(int(peak["tone"]), peak["strength"])
+        for peak in data.get("hue_peaks", []):
+            state._add_hue([int(x) for x in peak["hue"]], peak["strength"])
+        state.updates = int(data.get("updates", 0))
+        return state
+
+    def _tone_slots(self) -> List[int]:
+        return [t for _, t in sorted((self.tone_order[t], t) for t in range(_TONE_SLOTS) if self.tone_raw[t] is not None)]
+
+    def to_dict(self) -> MemoryDict:
+        """Return the dict representation (peaks in insertion order)."""
+        return {
+            "tone_peaks": [{"tone": t, "strength": self.tone_strength(t)} for t in self._tone_slots()],
+            "hue_peaks": [{"hue": list(hue), "strength": raw * self.hue_scale} for hue, raw in self.hue_peaks.values()],
+            "updates": self.updates,
+        }
+
+    def to_snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-serializable snapshot that restores bit-identically."""
+        return {
+            "tone_peaks": [[t, self.tone_raw[t]] for t in self._tone_slots()],
+            "hue_peaks": [[list(hue), raw] for hue, raw in self.hue_peaks.values()],
+            "tone_scale": self.tone_scale,
+            "hue_scale": self.hue_scale,
+            "epoch": self.epoch,
+            "updates": self.updates,
+            "hue_cell": self.hue_cell,
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any]) -> "MemoryState":
+        """Rebuild a state written by to_snapshot()."""
+        state = cls(hue_cell=data.get("hue_cell", _DEFAULT_HUE_CELL))
+        for tone, raw in data.get("tone_peaks", []):
+            state._add_tone(int(tone), raw)
+        for hue, raw in data.get("hue_peaks", []):
+            state._add_hue([int(x) for x in hue], raw)
+        state.tone_scale = data.get("tone_scale", 1.0)
+        state.hue_scale = data.get("hue_scale", 1.0)
+        state.epoch = int(data.get("epoch", 0))
+        state.updates = int(data.get("updates", 0))
+        return state
+
+    def copy(self) -> "MemoryState":
+        return MemoryState.from_snapshot(self.to_snapshot())
+
+    # --- strengths ---
+
+    def tone_strength(self, slot: int) -> float:
+        """Effective strength of the tone peak in slot."""
+        return self.tone_raw[slot] * self.tone_scale
+
+    def hue_strength(self, order: int) -> float:
+        """Effective strength of the hue peak with the given id."""
+        return self.hue_peaks[order][1] * self.hue_scale
+
+    # --- tone slots ---
+
+    def _add_tone(self, tone: int, raw: float) -> None:
+        slot = tone % _TONE_SLOTS
+        if self.tone_raw[slot] is not None:
+            # One slot per pitch class: silently keeping either peak would
+            # change strengths and insertion order relative to the input.
+            raise ValueError(f"Tone peak {tone} shares pitch class {slot} with an existing peak")
+        self.tone_raw[slot] = raw
+        self.tone_order[slot] = self._next_order
+        self._next_order += 1
+        self.tone_count += 1
+        self._tone_floor = min(self._tone_floor, raw)
+
+    def nearest_tone(self, tone: int, radius: float = 6) -> Tuple[int | None, int]:
+        """Return (slot, distance) of the nearest tone peak within radius."""
+        if not self.tone_count:
+            return None, 12
+        strengths = self.tone_raw
+        for distance in range(0, min(6, int(radius)) + 1):
+            up = (tone + distance) % _TONE_SLOTS
+            down = (tone - distance) % _TONE_SLOTS
+            if strengths[up] is not None:
+                if strengths[down] is not None and self.tone_order[down] < self.tone_order[up]:
+                    return down, distance
+                return up, distance
+            if strengths[down] is not None:
+                return down, distance
         return None, 12
-    distances = [(_tone_distance(p["tone"], tone), p) for p in peaks]
-    distance, peak = min(distances, key=lambda t: t[0])
-    return peak, distance
-
-
-def _nearest_hue_peak(peaks: List[Dict[str, Any]], hue: List[int]) -> Tuple[Dict[str, Any] | None, float]:
-    if not peaks:
-        return None, 255.0
-    distances = [(_hue_distance(p["hue"], hue), p) for p in peaks]
-    distance, peak = min(distances, key=lambda t: t[0])
-    return peak, distance
-
-
-def _reinforce_tone_peak(peaks: List[Dict[str, Any]], tone: int, strength: float, cfg: Dict[str, Any]) -> List[Dict[str, Any]]:
-    min_sep = cfg.get("min_separation", 2)
-    max_peaks = cfg.get("max_peaks", 12)
-
-    existing, distance = _nearest_tone_peak(peaks, tone)
-    if existing and distance <= min_sep:
-        existing = dict(existing)
-        existing["strength"] += strength
-        peaks = [existing if p is existing else p for p in peaks]
-    elif len(peaks) < max_peaks:
-        peaks.append({"tone": tone % 12, "strength": strength})
-    return peaks
 
+    # --- hue grid ---
+
+    def _hue_key(self, hue: List[int]) -> Tuple[int, ...]:
+        return tuple(int(int(c) // self.hue_cell) for c in hue)
+
+    def _add_hue(self, hue: List[int], raw: float) -> None:
+        order = self._next_order
+        self._next_order += 1
+        self.hue_peaks[order] = [hue, raw]
+        self.hue_grid.setdefault(self._hue_key(hue), []).append(order)
+        self._hue_floor = min(self._hue_floor, raw)
+
+    def _remove_hue(self, order: int) -> None:
+        hue, _ = self.hue_peaks.pop(order)
+        key = self._hue_key(hue)
+        bucket = self.hue_grid[key]
+        bucket.remove(order)
+        if not bucket:
+            del self.hue_grid[key]
+
+    def _neighbour_offsets(self, reach: int, dims: int) -> List[Tuple[int, ...]]:
+        key = (reach, dims)
+        offsets = _OFFSET_CACHE.get(key)
+        if offsets is None:
+            offsets = _OFFSET_CACHE[key] = list(product(range(-reach, reach + 1), repeat=dims))
+        return offsets
+
+    def nearest_hue(self, hue: List[int] | None, radius: float) -> Tuple[int | None, float]:
+        """Return (peak id, distance) of the nearest hue peak within radius."""
+        if not self.hue_peaks:
+            return None, 255.0
+        if hue is None:
+            # Distances against a missing hue are 0.0: the oldest peak wins.
+            return next(iter(self.hue_peaks)), 0.0
+        query = [int(c) for c in hue]
+        # A mean channel gap <= radius bounds every single channel gap by 3 * radius.
+        reach = int(math.ceil(3.0 * radius / self.hue_cell)) if radius > 0 else 0
+        base = self._hue_key(query)
+        grid = self.hue_grid
+        if (2 * reach + 1) ** len(base) <= len(grid):
+            buckets = [
+                grid[key]
+                for key in (tuple(map(add, base, offset)) for offset in self._neighbour_offsets(reach, len(base)))
+                if key in grid
+            ]
+        else:
+            # Wide radius over a sparse grid: filter the occupied cells instead.
+            buckets = [bucket for key, bucket in grid.items() if max(map(abs, map(sub, key, base))) <= reach]
+
+        peaks = self.hue_peaks
+        best_distance = radius
+        best_order: int | None = None
+        for bucket in buckets:
+            for order in bucket:
+                peak_hue = peaks[order][0]
+                distance = sum(map(abs, map(sub, peak_hue, query))) / max(1, min(len(peak_hue), len(query)))
+                if distance < best_distance or (
+                    distance == best_distance and (best_order is None or order < best_order)
+                ):
+                    best_distance = distance
+                    best_order = order
+        if best_order is None:
+            return None, 255.0
+        return best_order, best_distance
+
+    # --- maintenance ---
+
+    def _prune_tones(self, min_strength: float) -> None:
+        floor = math.inf
+        for slot, raw in enumerate(self.tone_raw):
+            if raw is None:
+                continue
+            if raw * self.tone_scale < min_strength:
+                self.tone_raw[slot] = None
+                self.tone_count -= 1
+            else:
+                floor = min(floor, raw)
+        self._tone_floor = floor
+
+    def _prune_hues(self, min_strength: float) -> None:
+        floor = math.inf
+        for order, (_, raw) in list(self.hue_peaks.items()):
+            if raw * self.hue_scale < min_strength:
+                self._remove_hue(order)
+            else:
+                floor = min(floor, raw)
+        self._hue_floor = floor
+
+    def _decay(self, tone_cfg: Dict[str, Any], hue_cfg: Dict[str, Any]) -> None:
+        self.epoch += 1
+
+        self.tone_scale *= max(0.0, 1.0 - tone_cfg.get("decay", 0.02))
+        if self.tone_scale < _RENORM_BOUND:
+            self.tone_raw = [None if raw is None else raw * self.tone_scale for raw in self.tone_raw]
+            self.tone_scale = 1.0
+            self._tone_floor = min((raw for raw in self.tone_raw if raw is not None), default=math.inf)
+        tone_min = tone_cfg.get("min_strength", 0.05)
+        if self.tone_count and self._tone_floor * self.tone_scale < tone_min:
+            self._prune_tones(tone_min)
+
+        self.hue_scale *= max(0.0, 1.0 - hue_cfg.get("decay", 0.02))
+        if self.hue_scale < _RENORM_BOUND:
+            for peak in self.hue_peaks.values():
+                peak[1] *= self.hue_scale
+            self.hue_scale = 1.0
+            self._hue_floor = min((peak[1] for peak in self.hue_peaks.values()), default=math.inf)
+        hue_min = hue_cfg.get("min_strength", 0.05)
+        if self.hue_peaks and self._hue_floor * self.hue_scale < hue_min:
+            self._prune_hues(hue_min)
+
+    def observe(self, l_cell: ChromaticCell, config: Config, coherence: float = 1.0) -> None:
+        """
+        Apply decay and reinforcement for the incoming L cell, in place.
+
+        Strength is biased by intensity and coherence to favor salient events.
+        """
+        peaks_cfg = config.get("peaks", {})
+        tone_cfg = peaks_cfg.get("tone", {})
+        hue_cfg = peaks_cfg.get("hue", {})
+        matching_cfg = config.get("matching", {})
+
+        intensity_weight = matching_cfg.get("intensity_weight", 0.2)
+        coherence_bias = matching_cfg.get("coherence_bias", 0.1)
+
+        self._decay(tone_cfg, hue_cfg)
+
+        boost = 1.0 + intensity_weight * float(l_cell.get("intensity", 1.0)) + coherence_bias * float(coherence)
+
+        # A peak within min_separation / min_distance absorbs the observation
+        # without changing strength, as the dict form always has.
+        tone = int(l_cell.get("tone", 0))
+        slot, _ = self.nearest_tone(tone, tone_cfg.get("min_separation", 2))
+        if slot is None and self.tone_count < tone_cfg.get("max_peaks", 12):
+            self._add_tone(tone, boost * tone_cfg.get("reinforce_gain", 0.25) / self.tone_scale)
+
+        hue = l_cell.get("hue", [0, 0, 0])
+        order, _ = self.nearest_hue(hue, hue_cfg.get("min_distance", 15.0))
+        if order is None and len(self.hue_peaks) < hue_cfg.get("max_peaks", 8):
+            self._add_hue([int(x) for x in hue], boost * hue_cfg.get("reinforce_gain", 0.2) / self.hue_scale)
+
+        self.updates += 1
+
+    # --- queries ---
+
+    def _tone_probe(self, tone: int, tolerance: float, min_strength: float) -> Tuple[int | None, float]:
+        """Return (slot, score term) of a strong tone peak within tolerance, or (None, 0.0)."""
+        slot, gap = self.nearest_tone(tone, tolerance)
+        if slot is None or self.tone_strength(slot) < min_strength:
+            return None, 0.0
+        return slot, self.tone_strength(slot) * max(0.0, 1 - gap / max(1.0, tolerance))
+
+    def _hue_probe(self, hue: List[int] | None, tolerance: float, min_strength: float) -> Tuple[int | None, float]:
+        """Return (peak id, score term) of a strong hue peak within tolerance, or (None, 0.0)."""
+        order, gap = self.nearest_hue(hue, tolerance)
+        if order is None or self.hue_strength(order) < min_strength:
+            return None, 0.0
+        return order, self.hue_strength(order) * max(0.0, 1 - gap / max(1.0, tolerance))
+
+    def match(self, l_cell: ChromaticCell, config: Config) -> bool:
+        """Return True when tone+hue fall within tolerance of strong peaks."""
+        matching_cfg = config.get("matching", {})
+        tone_tol = matching_cfg.get("tone_tolerance", 2)
+        hue_tol = matching_cfg.get("hue_tolerance", 25.0)
+        min_strength = matching_cfg.get("min_match_strength", 0.12)
+
+        slot, tone_score = self._tone_probe(int(l_cell.get("tone", 0)), tone_tol, min_strength)
+        order, hue_score = self._hue_probe(l_cell.get("hue", [0, 0, 0]), hue_tol, min_strength)
+        return _combine_match(slot, tone_score, order, hue_score, min_strength)
+
+    def snap_tone(self, tone: int, config: Config) -> int:
+        """Snap tone to the nearest strong peak when available."""
+        matching_cfg = config.get("matching", {})
+        slot, _ = self._tone_probe(
+            tone, matching_cfg.get("tone_tolerance", 2), matching_cfg.get("min_match_strength", 0.12)
+        )
+        return slot if slot is not None else tone % 12
+
+    def snap_hue(self, hue: List[int], config: Config) -> List[int]:
+        """Snap hue to the nearest strong hue peak when found."""
+        matching_cfg = config.get("matching", {})
+        order, _ = self._hue_probe(
+            hue, matching_cfg.get("hue_tolerance", 25.0), matching_cfg.get("min_match_strength", 0.12)
+        )
+        if order is not None:
+            return [int(x) for x in self.hue_peaks[order][0]]
+        return [int(x) for x in hue]
+
+
+def _combine_match(slot: int | None, tone_score: float, order: int | None, hue_score: float, min_strength: float) -> bool:
+    if slot is None and order is None:
+        return False
+    score = 0.0
+    if slot is not None:
+        score += tone_score
+    if order is not None:
+        score += hue_score
+    return score >= min_strength
 
-def _reinforce_hue_peak(peaks: List[Dict[str, Any]], hue: List[int], strength: float, cfg: Dict[str, Any]) -> List[Dict[str, Any]]:
-    min_dist = cfg.get("min_distance", 15.0)
-    max_peaks = cfg.get("max_peaks", 8)
 
-    existing, distance = _nearest_hue_peak(peaks, hue)
-    if existing and distance <= min_dist:
-        existing = dict(existing)
-        existing["strength"] += strength
-        peaks = [existing if p is existing else p for p in peaks]
-    elif len(peaks) < max_peaks:
-        peaks.append({"hue": [int(x) for x in hue], "strength": strength})
-    return peaks
+def _as_state(memory_state: MemoryDict | MemoryState) -> MemoryState:
+    if isinstance(memory_state, MemoryState):
+        return memory_state
+    return MemoryState.from_dict(memory_state)
 
 
 # --- public API ---
 
 def update_memory_state(
-    memory_state: MemoryState,
+    memory_state: MemoryDict | MemoryState,
     l_cell: ChromaticCell,
     config: Config,
     coherence: float = 1.0,
-) -> MemoryState:
+) -> MemoryDict | MemoryState:
     """
     Apply decay and reinforcement using the incoming L cell.
 
     Strength is biased by intensity and coherence to favor salient events.
-    Returns a new memory state dictionary (input is not mutated).
+    Returns a new memory state of the same kind (input is not mutated); use
+    MemoryState.observe to update an indexed state in place.
     """
-    peaks_cfg = config.get("peaks", {})
-    tone_cfg = peaks_cfg.get("tone", {})
-    hue_cfg = peaks_cfg.get("hue", {})
-    matching_cfg = config.get("matching", {})
-
-    intensity_weight = matching_cfg.get("intensity_weight", 0.2)
-    coherence_bias = matching_cfg.get("coherence_bias", 0.1)
-
-    tone_peaks = _decay_peaks(memory_state.get("tone_peaks", []), tone_cfg.get("decay", 0.02), tone_cfg.get("min_strength", 0.05))
-    hue_peaks = _decay_peaks(memory_state.get("hue_peaks", []), hue_cfg.get("decay", 0.02), hue_cfg.get("min_strength", 0.05))
+    if isinstance(memory_state, MemoryState):
+        updated = memory_state.copy()
+        updated.observe(l_cell, config, coherence)
+        return updated
+    state = MemoryState.from_dict(memory_state)
+    state.observe(l_cell, config, coherence)
+    return state.to_dict()
 
-    boost = 1.0 + intensity_weight * float(l_cell.get("intensity", 1.0)) + coherence_bias * float(coherence)
 
-    tone_peaks = _reinforce_tone_peak(tone_peaks, int(l_cell.get("tone", 0)), boost * tone_cfg.get("reinforce_gain", 0.25), tone_cfg)
-    hue_peaks = _reinforce_hue_peak(hue_peaks, l_cell.get("hue", [0, 0, 0]), boost * hue_cfg.get("reinforce_gain", 0.2), hue_cfg)
-
-    return {
-        "tone_peaks": tone_peaks,
-        "hue_peaks": hue_peaks,
-        "updates": int(memory_state.get("updates", 0)) + 1,
-    }
-
-
-def match_to_memory_profile(l_cell: ChromaticCell, memory_state: MemoryState, config: Config) -> bool:
+def match_to_memory_profile(l_cell: ChromaticCell, memory_state: MemoryDict | MemoryState, config: Config) -> bool:
     """Return True when tone+hue fall within tolerance of strong peaks."""
-    matching_cfg = config.get("matching", {})
-    tone_tol = matching_cfg.get("tone_tolerance", 2)
-    hue_tol = matching_cfg.get("hue_tolerance", 25.0)
-    min_strength = matching_cfg.get("min_match_strength", 0.12)
+    return _as_state(memory_state).match(l_cell, config)
 
-    tone_peak, tone_gap = _nearest_tone_peak(memory_state.get("tone_peaks", []), int(l_cell.get("tone", 0)))
-    hue_peak, hue_gap = _nearest_hue_peak(memory_state.get("hue_peaks", []), l_cell.get("hue", [0, 0, 0]))
 
-    tone_match = tone_peak and tone_gap <= tone_tol and tone_peak.get("strength", 0.0) >= min_strength
-    hue_match = hue_peak and hue_gap <= hue_tol and hue_peak.get("strength", 0.0) >= min_strength
-
-    if not tone_match and not hue_match:
-        return False
-
-    score = 0.0
-    if tone_match:
-        score += tone_peak["strength"] * max(0.0, 1 - tone_gap / max(1.0, tone_tol))
-    if hue_match:
-        score += hue_peak["strength"] * max(0.0, 1 - hue_gap / max(1.0, hue_tol))
+def snap_to_nearest_memory_tone(tone: int, memory_state: MemoryDict | MemoryState, config: Config) -> int:
+    """Snap tone to strongest nearby peak when available."""
+    return _as_state(memory_state).snap_tone(tone, config)
 
-    return score >= min_strength
 
+def snap_to_nearest_memory_hue(hue: List[int], memory_state: MemoryDict | MemoryState, config: Config) -> List[int]:
+    """Snap hue to nearest stable hue peak when found."""
+    return _as_state(memory_state).snap_hue(hue, config)
 
-def snap_to_nearest_memory_tone(tone: int, memory_state: MemoryState, config: Config) -> int:
-    """Snap tone to strongest nearby peak when available."""
-    matching_cfg = config.get("matching", {})
-    tone_tol = matching_cfg.get("tone_tolerance", 2)
-    min_strength = matching_cfg.get("min_match_strength", 0.12)
 
-    peak, distance = _nearest_tone_peak(memory_state.get("tone_peaks", []), tone)
-    if peak and distance <= tone_tol and peak.get("strength", 0.0) >= min_strength:
-        return int(peak["tone"]) % 12
-    return tone % 12
+# --- batch queries against a frozen state ---
 
+class _BatchProbe:
+    """
+    Per-call lookup tables for read-only batch passes.
 
-def snap_to_nearest_memory_hue(hue: List[int], memory_state: MemoryState, config: Config) -> List[int]:
-    """Snap hue to nearest stable hue peak when found."""
-    matching_cfg = config.get("matching", {})
-    hue_tol = matching_cfg.get("hue_tolerance", 25.0)
-    min_strength = matching_cfg.get("min_match_strength", 0.12)
+    Tones only take 12 values, so every tone probe is precomputed once; hue
+    probes are memoized per distinct RGB value. Results are the same as the
+    per-cell helpers, including tolerance and min_match_strength handling.
+    """
 
-    peak, distance = _nearest_hue_peak(memory_state.get("hue_peaks", []), hue)
-    if peak and distance <= hue_tol and peak.get("strength", 0.0) >= min_strength:
-        return [int(x) for x in peak["hue"]]
-    return [int(x) for x in hue]
+    def __init__(self, memory_state: MemoryDict | MemoryState, config: Config) -> None:
+        matching_cfg = config.get("matching", {})
+        self.state = _as_state(memory_state)
+        self.hue_tol = matching_cfg.get("hue_tolerance", 25.0)
+        self.min_strength = matching_cfg.get("min_match_strength", 0.12)
+        tone_tol = matching_cfg.get("tone_tolerance", 2)
+        self.tones = [self.state._tone_probe(tone, tone_tol, self.min_strength) for tone in range(_TONE_SLOTS)]
+        self._hues: Dict[Tuple[int, ...] | None, Tuple[int | None, float]] = {}
+
+    def tone(self, tone: int) -> Tuple[int | None, float]:
+        return self.tones[int(tone) % _TONE_SLOTS]
+
+    def hue(self, hue: List[int] | None) -> Tuple[int | None, float]:
+        key = None if hue is None else tuple(int(c) for c in hue)
+        probe = self._hues.get(key)
+        if probe is None:
+            probe = self._hues[key] = self.state._hue_probe(hue, self.hue_tol, self.min_strength)
+        return probe
+
+
+def match_to_memory_profile_batch(
+    tones: Sequence[int],
+    hues: Sequence[List[int]],
+    memory_state: MemoryDict | MemoryState,
+    config: Config,
+) -> List[bool]:
+    """Vectorized match_to_memory_profile over parallel tone/hue arrays."""
+    probe = _BatchProbe(memory_state, config)
+    return [
+        _combine_match(*probe.tone(tone), *probe.hue(hue), probe.min_strength)
+        for tone, hue in zip(tones, hues)
+    ]
+
+
+def snap_to_nearest_memory_tone_batch(
+    tones: Sequence[int], memory_state: MemoryDict | MemoryState, config: Config
+) -> List[int]:
+    """Vectorized snap_to_nearest_memory_tone."""
+    table = [slot if slot is not None else tone for tone, (slot, _) in enumerate(_BatchProbe(memory_state, config).tones)]
+    return [table[int(tone) % _TONE_SLOTS] for tone in tones]
+
+
+def snap_to_nearest_memory_hue_batch(
+    hues: Sequence[List[int]], memory_state: MemoryDict | MemoryState, config: Config
+) -> List[List[int]]:
+    """Vectorized snap_to_nearest_memory_hue."""
+    probe = _BatchProbe(memory_state, config)
+    peaks = probe.state.hue_peaks
+    snapped: List[List[int]] = []
+    for hue in hues:
+        order, _ = probe.hue(hue)
+        snapped.append([int(x) for x in (peaks[order][0] if order is not None else hue)])
+    return snapped
 
 
 __all__ = [
+    "MemoryState",
     "init_memory_state",
     "load_memory_config",
     "update_memory_state",
     "match_to_memory_profile",
     "snap_to_nearest_memory_tone",
     "snap_to_nearest_memory_hue",
+    "match_to_memory_profile_batch",
+    "snap_to_nearest_memory_tone_batch",
+    "snap_to_nearest_memory_hue_batch",
 ]
@@ -0,0 +1,199 @@
+"""Mergeable memory sketches for data-parallel memory building.
+
+Memory states built on different shards of a corpus cannot simply be
+concatenated: their peaks overlap, their lazy decay scales differ and each is
+capped at max_peaks. A MemorySketch is the shard-independent form of a state:
+
+- tone strength per tone (12 slots) and hue strength per exact RGB value,
+- stored as fixed-point integers, so summation is exactly associative and
+  commutative (float addition is not),
+- aligned for decay: each state's lazy decay scale is folded into its
+  strengths before they are added.
+
+Sketches are merged by summation. Peak coalescing within
+min_separation/min_distance and max_peaks truncation happen once, in
+to_memory_state(), as a deterministic function of the summed sketch. Building
+a profile as map (one state per document) + reduce (merge sketches) therefore
+yields the same MemoryState however the documents are sharded.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from ctl.memory import MemoryDict, MemoryState
+
+ChromaticCell = Dict[str, Any]
+Config = Dict[str, Any]
+
+# Fixed-point resolution for strengths.
+STRENGTH_QUANTUM = 2.0 ** -40
+
+
+def _to_fixed(strength: float) -> int:
+    return int(round(strength / STRENGTH_QUANTUM))
+
+
+def _tone_distance(a: int, b: int) -> int:
+    diff = abs(a - b) % 12
+    return min(diff, 12 - diff)
+
+
+def _hue_distance(a: Sequence[int], b: Sequence[int]) -> float:
+    gaps = [abs(int(x) - int(y)) for x, y in zip(a, b)]
+    return sum(gaps) / max(1, len(gaps))
+
+
+@dataclass
+class MemorySketch:
+    """Exactly summable summary of one or more memory states."""
+
+    tone: List[int] = field(default_factory=lambda: [0] * 12)
+    hue: Dict[Tuple[int, ...], int] = field(default_factory=dict)
+    updates: int = 0
+    epoch: int = 0
+
+    @classmethod
+    def from_state(cls, state: MemoryState | MemoryDict) -> "MemorySketch":
+        """Sketch a MemoryState (or its dict form) with its decay scale folded in."""
+        data = state.to_dict() if isinstance(state, MemoryState) else state
+        sketch = cls(
+            updates=int(data.get("updates", 0)),
+            epoch=state.epoch if isinstance(state, MemoryState) else 0,
+        )
+        for peak in data.get("tone_peaks", []):
+            sketch.tone[int(peak["tone"]) % 12] += _to_fixed(peak["strength"])
+        for peak in data.get("hue_peaks", []):
+            key = tuple(int(x) for x in peak["hue"])
+            sketch.hue[key] = sketch.hue.get(key, 0) + _to_fixed(peak["strength"])
+        return sketch
+
+    def merge(self, other: "MemorySketch") -> "MemorySketch":
+        """Return the sum of two sketches (associative and commutative)."""
+        hue = dict(self.hue)
+        for key, value in other.hue.items():
+            hue[key] = hue.get(key, 0) + value
+        return MemorySketch(
+            tone=[a + b for a, b in zip(self.tone, other.tone)],
+            hue=hue,
+            updates=self.updates + other.updates,
+            epoch=max(self.epoch, other.epoch),
+        )
+
+    def to_memory_state(self, config: Config) -> MemoryState:
+        """
+        Coalesce and truncate the summed peaks into a MemoryState.
+
+        Candidates are visited strongest first (ties by tone / RGB value). A
+        candidate within min_separation (tone) or min_distance (hue) of an
+        accepted peak adds its strength to the nearest accepted peak (earliest
+        accepted on ties); otherwise it becomes a new peak while fewer than
+        max_peaks are accepted and is dropped after that. Peaks below
+        min_strength are discarded last.
+        """
+        peaks_cfg = config.get("peaks", {})
+        tone_cfg = peaks_cfg.get("tone", {})
+        hue_cfg = peaks_cfg.get("hue", {})
+
+        tones = _coalesce(
+            [(tone, value) for tone, value in enumerate(self.tone) if value > 0],
+            _tone_distance,
+            tone_cfg.get("min_separation", 2),
+            tone_cfg.get("max_peaks", 12),
+        )
+        hues = _coalesce(
+            [(key, value) for key, value in self.hue.items() if value > 0],
+            _hue_distance,
+            hue_cfg.get("min_distance", 15.0),
+            hue_cfg.get("max_peaks", 8),
+        )
+
+        tone_min = tone_cfg.get("min_strength", 0.05)
+        hue_min = hue_cfg.get("min_strength", 0.05)
+        state = MemoryState.from_dict(
+            {
+                "tone_peaks": [
+                    {"tone": tone, "strength": value * STRENGTH_QUANTUM}
+                    for tone, value in tones
+                    if value * STRENGTH_QUANTUM >= tone_min
+                ],
+                "hue_peaks": [
+                    {"hue": list(key), "strength": value * STRENGTH_QUANTUM}
+                    for key, value in hues
+                    if value * STRENGTH_QUANTUM >= hue_min
+                ],
+                "updates": self.updates,
+            }
+        )
+        state.epoch = self.epoch
+        return state
+
+
+def _coalesce(candidates: List[Tuple[Any, int]], distance, radius: float, max_peaks: int) -> List[Tuple[Any, int]]:
+    accepted: List[List[Any]] = []
+    for key, value in sorted(candidates, key=lambda kv: (-kv[1], kv[0])):
+        nearest = None
+        nearest_gap = None
+        for peak in accepted:
+            gap = distance(peak[0], key)
+            if gap <= radius and (nearest_gap is None or gap < nearest_gap):
+                nearest, nearest_gap = peak, gap
+        if nearest is not None:
+            nearest[1] += value
+        elif len(accepted) < max_peaks:
+            accepted.append([key, value])
+    return [(key, value) for key, value in accepted]
+
+
+def merge_memory_sketches(items: Iterable[MemorySketch | MemoryState | MemoryDict]) -> MemorySketch:
+    """
+    Sum states and sketches into one sketch; order and grouping do not matter.
+
+    Use this for the inner levels of a tree reduction: partial results stay
+    integer sums, so merge_memory_sketches([merge_memory_sketches([a, b]), c])
+    equals merge_memory_sketches([a, b, c]).
+    """
+    total = MemorySketch()
+    for item in items:
+        total = total.merge(item if isinstance(item, MemorySketch) else MemorySketch.from_state(item))
+    return total
+
+
+def merge_memory_states(items: Iterable[MemorySketch | MemoryState | MemoryDict], config: Config) -> MemoryState:
+    """
+    Merge states (or sketches) into one MemoryState, as the final reduce step.
+
+    The result is coalesced, truncated and pruned, so feeding it into another
+    merge is not the same as a flat merge. Pass partial results around as
+    sketches (merge_memory_sketches) and call this once at the end; then
+    order and grouping do not matter.
+    """
+    return merge_memory_sketches(items).to_memory_state(config)
+
+
+def sketch_document(cells: Iterable[ChromaticCell], config: Config, coherence: float = 1.0) -> MemorySketch:
+    """Map step: learn one document from an empty memory and sketch it."""
+    state = MemoryState()
+    for cell in cells:
+        state.observe(cell, config, coherence)
+    return MemorySketch.from_state(state)
+
+
+def build_memory_profile(
+    documents: Iterable[Iterable[ChromaticCell]], config: Config, coherence: float = 1.0
+) -> MemoryState:
+    """Map-reduce a corpus into a memory profile (single-process reference)."""
+    total = MemorySketch()
+    for cells in documents:
+        total = total.merge(sketch_document(cells, config, coherence))
+    return total.to_memory_state(config)
+
+
+__all__ = [
+    "MemorySketch",
+    "STRENGTH_QUANTUM",
+    "merge_memory_sketches",
+    "merge_memory_states",
+    "sketch_document",
+    "build_memory_profile",
+]
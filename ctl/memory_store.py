@@ -0,0 +1,141 @@
+"""Durable chromatic memory profiles.
+
+A MemoryStore keeps named MemoryState profiles on disk so Tensor R streams can
+warm start from attractors learned on earlier documents instead of
+re-learning them from an empty memory. Each profile is one versioned JSON file
+written atomically (temp file + fsync + rename), so readers only ever see a
+complete profile. Loads are cached by file signature, which keeps per-request
+loading cheap while the profile is unchanged on disk.
+
+Concurrent writers are serialized per profile by an exclusive lock on a
+sidecar "<profile>.memory.json.lock" file (fcntl.flock; where fcntl is not
+available only writers in the same process are serialized). Every save gets a
+distinct revision. Without expected_revision the last save wins; pass the
+revision a state was loaded at to get compare-and-swap semantics instead.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+from ctl.memory import MemoryState
+
+PROFILE_FORMAT_VERSION = 1
+_PROFILE_NAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+_PROCESS_LOCK = threading.Lock()
+
+
+class MemoryProfileConflict(ValueError):
+    """A save's expected_revision no longer matches the stored profile."""
+
+
+class MemoryStore:
+    """Directory of named memory profiles."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._cache: Dict[str, Tuple[Tuple[int, int], int, Dict[str, Any]]] = {}
+
+    def path_for(self, name: str) -> str:
+        if not _PROFILE_NAME.match(name) or name in {".", ".."}:
+            raise ValueError(f"Invalid memory profile name: {name!r}")
+        return os.path.join(self.root, f"{name}.memory.json")
+
+    def exists(self, name: str) -> bool:
+        return os.path.exists(self.path_for(name))
+
+    def revision(self, name: str) -> int:
+        """Return the stored revision of a profile (0 when missing)."""
+        entry = self._read(name)
+        return entry[0] if entry else 0
+
+    def load(self, name: str) -> MemoryState | None:
+        """Return a fresh MemoryState for the profile, or None when missing."""
+        entry = self._read(name)
+        if entry is None:
+            return None
+        return MemoryState.from_snapshot(entry[1])
+
+    def save(self, name: str, state: MemoryState, expected_revision: int | None = None) -> int:
+        """
+        Atomically write the profile and return its new revision.
+
+        With expected_revision, raise MemoryProfileConflict (and write
+        nothing) unless the stored revision still equals it.
+        """
+        path = self.path_for(name)
+        with self._write_lock(path):
+            # Re-read under the lock: the cached signature may predate another writer.
+            self._cache.pop(name, None)
+            current = self.revision(name)
+            if expected_revision is not None and current != expected_revision:
+                raise MemoryProfileConflict(
+                    f"Memory profile {name!r} is at revision {current}, expected {expected_revision}"
+                )
+            revision = current + 1
+            payload = {
+                "format": PROFILE_FORMAT_VERSION,
+                "name": name,
+                "revision": revision,
+                "memory": state.to_snapshot(),
+            }
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=f".{name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    json.dump(payload, handle, separators=(",", ":"))
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+            self._cache.pop(name, None)
+        return revision
+
+    @contextmanager
+    def _write_lock(self, path: str) -> Iterator[None]:
+        if fcntl is None:
+            with _PROCESS_LOCK:
+                yield
+            return
+        with open(f"{path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _read(self, name: str) -> Tuple[int, Dict[str, Any]] | None:
+        path = self.path_for(name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self._cache.pop(name, None)
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(name)
+        if cached and cached[0] == signature:
+            return cached[1], cached[2]
+
+        with open(path, "r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+        if payload.get("format") != PROFILE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported memory profile format in {path}: {payload.get('format')}")
+        revision = int(payload.get("revision", 0))
+        self._cache[name] = (signature, revision, payload["memory"])
+        return revision, payload["memory"]
+
+
+__all__ = ["MemoryProfileConflict", "MemoryStore", "PROFILE_FORMAT_VERSION"]
@@ -8,10 +8,19 @@ and disparity monitoring.
 """
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Sequence
 
-from ctl.coupling import compute_coupling_metrics, process_coupling_sequence
-from ctl.tensor_r_update import update_tensor_r_sequence
+from ctl.coupling import CouplingKernel, StreamingCoupler, compute_coupling_metrics, process_coupling_sequence
+from ctl.fiber_cache import FiberCache, fiber_cache_key, l_sequence_digest
+from ctl.fiber_pool import run_fibers_parallel
+from ctl.l_features import LFeatures, compute_l_features
+from ctl.tensor_r_update import (
+    _resolve_memory_config,
+    advance_tensor_r_state,
+    init_tensor_r_state,
+    update_tensor_r_sequence,
+)
 
 ChromaticCell = Dict[str, Any]
 Config = Dict[str, Any]
@@ -24,44 +33,87 @@ class MultiTensorAssembly:
         self,
         r_configs: Sequence[Config],
         coupling_config: Optional[Config] = None,
+        processes: Optional[int] = None,
+        cache: Optional[FiberCache] = None,
     ) -> None:
         self.r_configs = list(r_configs)
         self.coupling_config = coupling_config
+        self.processes = processes
+        self.cache = cache
 
-    def run_r_fibers(self, l_sequence: List[ChromaticCell]) -> List[List[ChromaticCell]]:
-        """Instantiate R sequences for each configured fiber."""
-        results: List[List[ChromaticCell]] = []
-        for cfg in self.r_configs:
-            results.append(update_tensor_r_sequence(l_sequence, cfg))
+    def run_r_fibers(
+        self,
+        l_sequence: List[ChromaticCell],
+        processes: Optional[int] = None,
+        l_features: Optional[LFeatures] = None,
+    ) -> List[List[ChromaticCell]]:
+        """
+        Instantiate R sequences for each configured fiber.
+
+        L-derived features are computed once and shared by every fiber. With
+        processes > 1 (argument or assembly default) the fibers run on a
+        process pool with L published once via shared memory; the result is
+        identical to the serial run. With a FiberCache, fibers whose config,
+        memory config and L are unchanged are served from the cache.
+        """
+        if self.cache is None:
+            return self._compute_fibers(l_sequence, self.r_configs, processes, l_features)
+
+        # Only fibers missing from the cache are computed. The memory config is
+        # resolved (read from disk) once per call, not once per fiber key.
+        l_digest = l_sequence_digest(l_sequence)
+        memory_config = _resolve_memory_config(None)
+        keys = [fiber_cache_key(cfg, l_digest, memory_config) for cfg in self.r_configs]
+        results: List[Optional[List[ChromaticCell]]] = [self.cache.get(key) for key in keys]
+        missing = [idx for idx, result in enumerate(results) if result is None]
+        computed = self._compute_fibers(l_sequence, [self.r_configs[idx] for idx in missing], processes, l_features)
+        for idx, r_seq in zip(missing, computed):
+            self.cache.put(keys[idx], r_seq)
+            results[idx] = r_seq
         return results
 
+    def _compute_fibers(
+        self,
+        l_sequence: List[ChromaticCell],
+        configs: Sequence[Config],
+        processes: Optional[int],
+        l_features: Optional[LFeatures],
+    ) -> List[List[ChromaticCell]]:
+        processes = processes if processes is not None else self.processes
+        if processes and processes > 1 and len(configs) > 1:
+            return run_fibers_parallel(l_sequence, configs, processes=processes)
+        if not configs:
+            return []
+        features = l_features if l_features is not None else compute_l_features(l_sequence)
+        return [update_tensor_r_sequence(l_sequence, cfg, l_features=features) for cfg in configs]
+
     def aggregate_states(
         self,
         r_sequences: Sequence[List[ChromaticCell]],
         weights: Optional[Sequence[float]] = None,
-    ) -> List[ChromaticCell]:
-        """Combine multiple R sequences into a single aggregated stream."""
-        if not r_sequences:
-            return []
+        as_columns: bool = False,
+    ) -> List[ChromaticCell] | AggregatedStates:
+        """
+        Combine multiple R sequences into a single aggregated stream.
 
-        min_length = min(len(seq) for seq in r_sequences)
-        weights_resolved = _normalize_weights(weights, len(r_sequences))
-        aggregated: List[ChromaticCell] = []
-
-        for idx in range(min_length):
-            cells = [seq[idx] for seq in r_sequences]
-            aggregated.append(_aggregate_cells(cells, weights_resolved))
-        return aggregated
+        The fibers are stacked into columns and reduced with one weighted
+        accumulation per channel and fiber. Returns cells by default, or the
+        AggregatedStates columns when as_columns is True.
+        """
+        aggregated = aggregate_fiber_columns(r_sequences, weights)
+        return aggregated if as_columns else aggregated.to_cells()
 
     def summarize_fibers(
-        self, l_sequence: List[ChromaticCell], r_sequences: List[List[ChromaticCell]]
+        self,
+        l_sequence: List[ChromaticCell],
+        r_sequences: List[List[ChromaticCell]],
+        l_features: Optional[LFeatures] = None,
     ) -> List[Dict[str, float]]:
         """Compute coupling metrics per fiber relative to the shared L."""
         if not self.coupling_config:
             return []
-        return [
-            compute_coupling_metrics(l_sequence, r_seq, self.coupling_config) for r_seq in r_sequences
-        ]
+        l_terms = l_features.coupling_terms if l_features is not None else None
+        return CouplingKernel(self.coupling_config).metrics_many(l_sequence, r_sequences, l_terms=l_terms)
 
     def run_full(
         self,
@@ -69,11 +121,12 @@ class MultiTensorAssembly:
         weights: Optional[Sequence[float]] = None,
     ) -> Dict[str, Any]:
         """Run fibers, aggregate them, and compute optional coupling summaries."""
-        r_sequences = self.run_r_fibers(l_sequence)
+        features = compute_l_features(l_sequence)
+        r_sequences = self.run_r_fibers(l_sequence, l_features=features)
         aggregated = self.aggregate_states(r_sequences, weights=weights)
         coupling_metrics: List[Dict[str, float]] = []
         if self.coupling_config:
-            coupling_metrics = self.summarize_fibers(l_sequence, r_sequences)
+            coupling_metrics = self.summarize_fibers(l_sequence, r_sequences, l_features=features)
 
         return {
             "r_sequences": r_sequences,
@@ -81,6 +134,90 @@ class MultiTensorAssembly:
             "coupling_metrics": coupling_metrics,
         }
 
+    def run_pruned(
+        self,
+        l_sequence: List[ChromaticCell],
+        weights: Optional[Sequence[float]] = None,
+        checkpoint_every: int = 32,
+        min_coherence: Optional[float] = None,
+        beam_width: Optional[int] = None,
+        mode: str = "drop",
+        l_features: Optional[LFeatures] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run fibers step by step with beam-style pruning at checkpoints.
+
+        Every checkpoint_every steps each active fiber's running coupling
+        coherence (compute_coupling_metrics coherence_score over the prefix)
+        is checked. Fibers below min_coherence, and then all but the best
+        beam_width fibers (ties by fiber index), stop running; at least one
+        fiber always survives. In "drop" mode a pruned fiber's sequence is
+        discarded (None), in "freeze" mode its prefix is kept. Survivors run
+        to the end exactly as in run_r_fibers and are aggregated with their
+        weights renormalized. The "compute" entry reports the fiber steps
+        actually run against the unpruned total.
+        """
+        if not self.coupling_config:
+            raise ValueError("Fiber pruning needs a coupling_config to score fibers")
+        if mode not in ("drop", "freeze"):
+            raise ValueError(f"Unknown pruning mode: {mode!r}")
+        if checkpoint_every < 1:
+            raise ValueError("Checkpoint interval must be at least 1 step")
+
+        count = len(self.r_configs)
+        states = [init_tensor_r_state(cfg) for cfg in self.r_configs]
+        couplers = [StreamingCoupler(self.coupling_config) for _ in self.r_configs]
+        outputs: List[List[ChromaticCell]] = [[] for _ in self.r_configs]
+        active = list(range(count))
+        pruned: List[Dict[str, Any]] = []
+
+        features = l_features if l_features is not None else compute_l_features(l_sequence)
+        features.check(l_sequence)
+        for step, l_cell in enumerate(l_sequence, start=1):
+            for idx in active:
+                r_cell = advance_tensor_r_state(states[idx], l_cell, self.r_configs[idx], l_features=features)
+                outputs[idx].append(r_cell)
+                couplers[idx].push(l_cell, r_cell)
+            if step % checkpoint_every or step == len(l_sequence) or len(active) <= 1:
+                continue
+
+            scores = {idx: couplers[idx].summary()["coherence_score"] for idx in active}
+            ranked = sorted(active, key=lambda idx: (-scores[idx], idx))
+            keep = [idx for idx in ranked if min_coherence is None or scores[idx] >= min_coherence]
+            if beam_width is not None:
+                keep = keep[: max(1, beam_width)]
+            keep = keep or ranked[:1]
+            for idx in active:
+                if idx not in keep:
+                    reason = "beam" if min_coherence is None or scores[idx] >= min_coherence else "coherence"
+                    pruned.append({"fiber": idx, "step": step, "coherence": scores[idx], "reason": reason})
+            active = sorted(keep)
+
+        survivors = active
+        base_weights = _normalize_weights(weights, count)
+        survivor_weights = _normalize_weights([base_weights[idx] for idx in survivors], len(survivors))
+        survivor_sequences = [outputs[idx] for idx in survivors]
+        r_sequences: List[Optional[List[ChromaticCell]]] = [
+            outputs[idx] if idx in survivors or mode == "freeze" else None for idx in range(count)
+        ]
+
+        total_steps = count * len(l_sequence)
+        run_steps = sum(len(seq) for seq in outputs)
+        return {
+            "r_sequences": r_sequences,
+            "survivors": survivors,
+            "weights": survivor_weights,
+            "pruned": pruned,
+            "aggregated": self.aggregate_states(survivor_sequences, weights=survivor_weights),
+            "coupling_metrics": self.summarize_fibers(l_sequence, survivor_sequences),
+            "compute": {
+                "fiber_steps_total": total_steps,
+                "fiber_steps_run": run_steps,
+                "fiber_steps_saved": total_steps - run_steps,
+                "saved_fraction": (total_steps - run_steps) / total_steps if total_steps else 0.0,
+            },
+        }
+
     def compare_aggregated_to_l(self, l_sequence: List[ChromaticCell], aggregated: List[ChromaticCell]) -> Dict[str, float]:
         """Compare the aggregated R representation back to L."""
         if not self.coupling_config:
@@ -93,9 +230,11 @@ def run_multi_tensor(
     r_configs: Sequence[Config],
     coupling_config: Optional[Config] = None,
     weights: Optional[Sequence[float]] = None,
+    processes: Optional[int] = None,
+    cache: Optional[FiberCache] = None,
 ) -> Dict[str, Any]:
     """Convenience wrapper for MultiTensorAssembly.run_full."""
-    assembly = MultiTensorAssembly(r_configs, coupling_config=coupling_config)
+    assembly = MultiTensorAssembly(r_configs, coupling_config=coupling_config, processes=processes, cache=cache)
     return assembly.run_full(l_sequence, weights=weights)
 
 
@@ -118,35 +257,96 @@ def _normalize_weights(weights: Optional[Sequence[float]], count: int) -> List[f
     return [w / total for w in weights]
 
 
-def _aggregate_cells(cells: Sequence[ChromaticCell], weights: Sequence[float]) -> ChromaticCell:
-    tone = 0.0
-    intensity = 0.0
-    hue_acc = [0.0, 0.0, 0.0]
-    coherence = 0.0
-    polarity_votes = 0.0
-
-    for cell, w in zip(cells, weights):
-        tone += w * cell.get("tone", 0)
-        intensity += w * float(cell.get("intensity", 0.0))
-        coherence += w * float(cell.get("coherence", 1.0))
-        polarity_votes += w * float(cell.get("polarity", 1))
-        hue_vals = cell.get("hue", [0, 0, 0])
-        for idx, val in enumerate(hue_vals):
-            hue_acc[idx] += w * float(val)
-
-    aggregated_cell: ChromaticCell = {
-        "tone": int(round(tone)) % 12,
-        "hue": [int(round(x)) for x in hue_acc],
-        "intensity": intensity,
-        "polarity": 1 if polarity_votes >= 0 else -1,
-        "timestamp": cells[0].get("timestamp", 0.0),
-        "coherence": coherence,
-    }
-    return aggregated_cell
+@dataclass
+class AggregatedStates:
+    """Column form of an aggregated R stream (one entry per time step)."""
+
+    tone: List[int]
+    hue: List[List[int]]  # one column per RGB channel
+    intensity: List[float]
+    polarity: List[int]
+    timestamp: List[Any]
+    coherence: List[float]
+
+    def __len__(self) -> int:
+        return len(self.tone)
+
+    def cell(self, idx: int) -> ChromaticCell:
+        return {
+            "tone": self.tone[idx],
+            "hue": [channel[idx] for channel in self.hue],
+            "intensity": self.intensity[idx],
+            "polarity": self.polarity[idx],
+            "timestamp": self.timestamp[idx],
+            "coherence": self.coherence[idx],
+        }
+
+    def to_cells(self) -> List[ChromaticCell]:
+        return [
+            {
+                "tone": tone,
+                "hue": list(hue),
+                "intensity": intensity,
+                "polarity": polarity,
+                "timestamp": timestamp,
+                "coherence": coherence,
+            }
+            for tone, hue, intensity, polarity, timestamp, coherence in zip(
+                self.tone, zip(*self.hue), self.intensity, self.polarity, self.timestamp, self.coherence
+            )
+        ]
+
+
+def aggregate_fiber_columns(
+    r_sequences: Sequence[List[ChromaticCell]], weights: Optional[Sequence[float]] = None
+) -> AggregatedStates:
+    """
+    Weighted aggregation of fibers over stacked channel columns.
+
+    Each channel accumulator starts at 0.0 and adds the weighted fiber columns
+    in fiber order, which is the same summation order as a per-cell loop, so
+    the aggregate is bit-identical to it.
+    """
+    if not r_sequences:
+        return AggregatedStates([], [[], [], []], [], [], [], [])
+
+    length = min(len(seq) for seq in r_sequences)
+    weights_resolved = _normalize_weights(weights, len(r_sequences))
+    tone = [0.0] * length
+    hue = [[0.0] * length for _ in range(3)]
+    intensity = [0.0] * length
+    coherence = [0.0] * length
+    votes = [0.0] * length
+
+    for seq, w in zip(r_sequences, weights_resolved):
+        cells = seq[:length]
+        tone = [acc + w * cell.get("tone", 0) for acc, cell in zip(tone, cells)]
+        intensity = [acc + w * float(cell.get("intensity", 0.0)) for acc, cell in zip(intensity, cells)]
+        coherence = [acc + w * float(cell.get("coherence", 1.0)) for acc, cell in zip(coherence, cells)]
+        votes = [acc + w * float(cell.get("polarity", 1)) for acc, cell in zip(votes, cells)]
+        hues = [cell.get("hue", [0, 0, 0]) for cell in cells]
+        if all(len(h) == 3 for h in hues):
+            for channel in range(3):
+                hue[channel] = [acc + w * float(h[channel]) for acc, h in zip(hue[channel], hues)]
+        else:
+            for idx, h in enumerate(hues):
+                for channel, val in enumerate(h):
+                    hue[channel][idx] += w * float(val)
+
+    return AggregatedStates(
+        tone=[int(round(t)) % 12 for t in tone],
+        hue=[[int(round(x)) for x in channel] for channel in hue],
+        intensity=intensity,
+        polarity=[1 if v >= 0 else -1 for v in votes],
+        timestamp=[cell.get("timestamp", 0.0) for cell in r_sequences[0][:length]],
+        coherence=coherence,
+    )
 
 
 __all__ = [
     "MultiTensorAssembly",
+    "AggregatedStates",
+    "aggregate_fiber_columns",
     "run_multi_tensor",
     "couple_fiber_snapshots",
 ]
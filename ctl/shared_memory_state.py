@@ -0,0 +1,201 @@
+"""Shared-memory chromatic memory for multi-process fiber workers.
+
+A SharedMemoryState lays a MemoryState out in a fixed-size
+multiprocessing.shared_memory block so fibers running in separate processes
+can snap against one common memory.
+
+Semantics:
+- Single writer. The process that create()s the block owns it and is the only
+  one allowed to publish(). It keeps its own MemoryState, reinforces it as
+  usual (MemoryState.observe) and publishes it at whatever cadence it likes.
+- Lock-free readers. Other processes attach() and take snapshot()s guarded by
+  a seqlock: the writer makes the sequence odd while writing and even when
+  done, readers retry if the sequence was odd or changed during the copy.
+- Reader-side reinforcement is local. A reader's snapshot is a private
+  MemoryState; observations applied to it are discarded on the next refresh.
+  Only the writer's reinforcement is durable.
+
+Layout (little-endian):
+    header  seq u64 | updates i64 | epoch i64 | hue_capacity i32 | hue_count i32
+    tone    12 x (strength f64, order i64)          order -1 = empty slot
+    hue     hue_capacity x (r i32, g i32, b i32, pad i32, strength f64, order i64)
+Strengths are published with the lazy decay scale folded in.
+"""
+from __future__ import annotations
+
+import struct
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List
+
+from ctl.memory import MemoryState
+
+_HEADER = struct.Struct("<Qqqii")
+_TONE = struct.Struct("<dq")
+_HUE = struct.Struct("<iiiidq")
+_TONE_SLOTS = 12
+
+
+def _layout_size(hue_capacity: int) -> int:
+    return _HEADER.size + _TONE_SLOTS * _TONE.size + hue_capacity * _HUE.size
+
+
+# Serializes the pre-3.13 resource_tracker.register swap in attach_untracked.
+_REGISTER_LOCK = threading.Lock()
+
+
+def attach_untracked(name: str) -> shared_memory.SharedMemory:
+    """
+    Open an existing block without handing it to this process's resource tracker.
+
+    Before Python 3.13 this temporarily replaces the module-global
+    resource_tracker.register. Concurrent attach_untracked calls are
+    serialized by a lock, but any other code in this process that creates
+    or attaches a SharedMemory during that window (without going through
+    this function) is not registered either.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        pass
+    # Older Pythons register every attach, and the tracker would then unlink
+    # the writer's block when a reader exits. Skip that registration.
+    with _REGISTER_LOCK:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedMemoryState:
+    """Fixed-layout memory state in a shared memory block."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, hue_capacity: int, owner: bool) -> None:
+        self._shm = shm
+        self.hue_capacity = hue_capacity
+        self.owner = owner
+
+    @classmethod
+    def create(cls, hue_capacity: int = 8, name: str | None = None) -> "SharedMemoryState":
+        """Allocate a new block; the caller becomes the single writer."""
+        shm = shared_memory.SharedMemory(name=name, create=True, size=_layout_size(hue_capacity))
+        state = cls(shm, hue_capacity, owner=True)
+        state.publish(MemoryState())
+        return state
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedMemoryState":
+        """Attach to an existing block as a reader."""
+        shm = attach_untracked(name)
+        _, _, _, hue_capacity, _ = _HEADER.unpack_from(shm.buf, 0)
+        return cls(shm, hue_capacity, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def sequence(self) -> int:
+        """Current seqlock sequence (even when no write is in progress)."""
+        return struct.unpack_from("<Q", self._shm.buf, 0)[0]
+
+    def publish(self, state: MemoryState) -> None:
+        """Write the writer's MemoryState into the block."""
+        if not self.owner:
+            raise PermissionError("Only the creating process may publish shared memory state")
+        snapshot = state.to_snapshot()
+        hue_peaks = snapshot["hue_peaks"]
+        if len(hue_peaks) > self.hue_capacity:
+            raise ValueError(f"{len(hue_peaks)} hue peaks exceed shared capacity {self.hue_capacity}")
+
+        buf = self._shm.buf
+        seq = self.sequence
+        struct.pack_into("<Q", buf, 0, seq + 1)  # odd: write in progress
+
+        offset = _HEADER.size
+        tone_rows = {
+            int(tone): (raw * snapshot["tone_scale"], order) for order, (tone, raw) in enumerate(snapshot["tone_peaks"])
+        }
+        for slot in range(_TONE_SLOTS):
+            strength, order = tone_rows.get(slot, (0.0, -1))
+            _TONE.pack_into(buf, offset, strength, order)
+            offset += _TONE.size
+        for order, (hue, raw) in enumerate(hue_peaks):
+            r, g, b = (list(hue) + [0, 0, 0])[:3]
+            _HUE.pack_into(buf, offset, r, g, b, 0, raw * snapshot["hue_scale"], order)
+            offset += _HUE.size
+        struct.pack_into(
+            "<qqii", buf, 8, snapshot["updates"], snapshot["epoch"], self.hue_capacity, len(hue_peaks)
+        )
+
+        struct.pack_into("<Q", buf, 0, seq + 2)  # even: consistent again
+
+    def _decode(self, raw: bytes) -> Dict[str, Any]:
+        _, updates, epoch, _, hue_count = _HEADER.unpack_from(raw, 0)
+        offset = _HEADER.size
+        tones: List[Any] = []
+        for slot in range(_TONE_SLOTS):
+            strength, order = _TONE.unpack_from(raw, offset)
+            offset += _TONE.size
+            if order >= 0:
+                tones.append((order, slot, strength))
+        hues: List[Any] = []
+        for _ in range(hue_count):
+            r, g, b, _, strength, order = _HUE.unpack_from(raw, offset)
+            offset += _HUE.size
+            hues.append((order, [r, g, b], strength))
+        return {
+            "tone_peaks": [[slot, strength] for _, slot, strength in sorted(tones)],
+            "hue_peaks": [[hue, strength] for _, hue, strength in sorted(hues, key=lambda h: h[0])],
+            "tone_scale": 1.0,
+            "hue_scale": 1.0,
+            "epoch": epoch,
+            "updates": updates,
+        }
+
+    def snapshot(self, max_retries: int = 10000) -> MemoryState:
+        """Return a consistent private MemoryState copy (seqlock read)."""
+        buf = self._shm.buf
+        size = _layout_size(self.hue_capacity)
+        for _ in range(max_retries):
+            before = self.sequence
+            if before % 2:
+                continue
+            raw = bytes(buf[:size])
+            if self.sequence == before:
+                return MemoryState.from_snapshot(self._decode(raw))
+        raise TimeoutError("Could not obtain a consistent shared memory snapshot")
+
+    def close(self) -> None:
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Free the block (writer only, after readers have detached)."""
+        if self.owner:
+            self._shm.unlink()
+
+
+class SharedMemoryView:
+    """Reader-side cache that re-snapshots only when the writer published."""
+
+    def __init__(self, shared: SharedMemoryState) -> None:
+        self.shared = shared
+        self._seen = -1
+        self.state = MemoryState()
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Reload the snapshot if the sequence moved; return True when reloaded."""
+        if self.shared.sequence == self._seen:
+            return False
+        # Read the sequence before the copy so a publish during the copy is
+        # picked up on the next refresh.
+        seen = self.shared.sequence
+        self.state = self.shared.snapshot()
+        self._seen = seen
+        return True
+
+
+__all__ = ["SharedMemoryState", "SharedMemoryView", "attach_untracked"]
@@ -9,8 +9,12 @@ and JSON5 configuration values.
 
 import json
 import os
-from dataclasses import dataclass
-from typing import Dict, Iterable, List, Tuple
+from collections import deque
+from collections.abc import Sequence as SequenceABC
+from dataclasses import dataclass, field
+from itertools import repeat
+from operator import add
+from typing import Deque, Dict, Iterable, List, Sequence, Tuple
 
 
 @dataclass
@@ -39,94 +43,281 @@ def load_symbols_config() -> Dict:
         return json.load(handle)
 
 
+ROLES = ("peak", "bridge", "onset", "decay")
+_PEAK, _BRIDGE, _ONSET, _DECAY = range(len(ROLES))
+
+
 def _moving_average(values: List[float], window: int) -> List[float]:
+    """
+    Trailing mean over up to `window` values, computed column-wise.
+
+    Each full window is summed left to right by adding shifted copies of the
+    column, which is the same addition order as sum(segment), so results are
+    bit-identical to the per-index loop. A running cumsum difference would be
+    O(n) rather than O(n * window) but rounds differently, and the peak/bridge
+    ties in role assignment and the rounded stability scores would then drift
+    from the baseline form_symbols; windows are small, so parity wins.
+    """
     window = max(1, window)
-    averaged = []
-    for i, _ in enumerate(values):
-        start = max(0, i - window + 1)
-        segment = values[start : i + 1]
-        averaged.append(sum(segment) / len(segment))
+    n = len(values)
+    head = min(n, window - 1)
+    averaged = [sum(values[: i + 1]) / (i + 1) for i in range(head)]
+    if n >= window:
+        sums = values[: n - window + 1]
+        for offset in range(1, window):
+            sums = list(map(add, sums, values[offset : n - window + 1 + offset]))
+        averaged.extend(total / window for total in sums)
     return averaged
 
 
-def _role_for_index(intensities: List[float], index: int, threshold: float) -> str:
-    current = intensities[index]
-    prev_val = intensities[index - 1] if index > 0 else current
-    next_val = intensities[index + 1] if index < len(intensities) - 1 else current
+def _role_code(cur: float, prev: float, nxt: float, threshold: float) -> int:
+    """Role code of one smoothed value given its neighbours."""
+    if cur >= threshold and cur >= prev and cur >= nxt:
+        return _PEAK
+    if cur < prev and cur <= nxt:
+        return _BRIDGE
+    if cur >= prev:
+        return _ONSET
+    return _DECAY
 
-    if current >= threshold and current >= prev_val and current >= next_val:
-        return "peak"
-    if current < prev_val and current <= next_val:
-        return "bridge"
-    if current >= prev_val:
-        return "onset"
-    return "decay"
 
+def _role_codes(smoothed: List[float], threshold: float) -> List[int]:
+    """Role code per index from comparisons with both neighbours (edges compare with themselves)."""
+    if not smoothed:
+        return []
+    prev_vals = smoothed[:1] + smoothed[:-1]
+    next_vals = smoothed[1:] + smoothed[-1:]
+    return list(map(_role_code, smoothed, prev_vals, next_vals, repeat(threshold)))
 
-def form_symbols(cells: Iterable[Dict], config: Dict | None = None) -> List[Symbol]:
+
+@dataclass
+class SymbolTable(SequenceABC):
     """
-    Build symbols from a sequence of chromatic cells.
+    Columnar symbol set: one list per Symbol field.
 
-    Args:
-        cells: Iterable of dicts containing tone, hue (tuple), polarity, intensity, timestamp.
-        config: Optional configuration override.
+    Roles are stored as codes into ROLES and labels as ids into `labels`.
+    Indexing builds Symbol views on demand, so a table can be passed wherever
+    a sequence of symbols is expected.
+    """
 
-    Returns:
-        List of Symbol objects.
+    tones: List[int] = field(default_factory=list)
+    hues: List[Tuple[int, ...]] = field(default_factory=list)
+    polarities: List[int] = field(default_factory=list)
+    intensities: List[float] = field(default_factory=list)
+    timestamps: List[int] = field(default_factory=list)
+    role_codes: List[int] = field(default_factory=list)
+    stability: List[float] = field(default_factory=list)
+    label_ids: List[int] = field(default_factory=list)
+    labels: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.tones)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.symbol(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("symbol index out of range")
+        return self.symbol(index)
+
+    def symbol(self, idx: int) -> Symbol:
+        """Symbol view of row idx."""
+        return Symbol(
+            idx=idx,
+            tone=self.tones[idx],
+            hue=self.hues[idx],
+            polarity=self.polarities[idx],
+            intensity=self.intensities[idx],
+            timestamp=self.timestamps[idx],
+            role=ROLES[self.role_codes[idx]],
+            stability=self.stability[idx],
+            label=self.labels[self.label_ids[idx]],
+        )
+
+    def to_symbols(self) -> List[Symbol]:
+        """Materialize every row as a Symbol."""
+        return [self.symbol(idx) for idx in range(len(self))]
+
+
+def _label_ids(
+    tones: List[int],
+    hues: List[Tuple[int, ...]],
+    polarities: List[int],
+    label_cfg: Dict,
+    index: Dict[Tuple[int, int, int], int] | None = None,
+    labels: List[str] | None = None,
+) -> Tuple[List[int], List[str]]:
+    """
+    Intern labels: each distinct (tone band, hue band, polarity) is formatted once.
+
+    Pass an existing index and labels list to keep interning across calls.
+    """
+    tone_band = max(1, label_cfg["tone_band"])
+    hue_band = 3 * max(1, label_cfg["hue_band"])
+    index = {} if index is None else index
+    labels = [] if labels is None else labels
+    ids: List[int] = []
+    for key in zip([tone // tone_band for tone in tones], [sum(hue) // hue_band for hue in hues], polarities):
+        label_id = index.get(key)
+        if label_id is None:
+            label_id = index[key] = len(labels)
+            labels.append(f"T{key[0]}-H{key[1]}-P{key[2]:+d}")
+        ids.append(label_id)
+    return ids, labels
+
+
+def form_symbol_table(cells: Iterable[Dict], config: Dict | None = None) -> SymbolTable:
+    """
+    Build a columnar SymbolTable from a sequence of chromatic cells.
+
+    Same fields and values as form_symbols, computed column by column.
     """
 
     cfg = config or load_symbols_config()
     agg_cfg = cfg["aggregation"]
     stability_cfg = cfg["stability"]
-    label_cfg = cfg["labeling"]
 
     tones: List[int] = []
-    hues: List[Tuple[int, int, int]] = []
+    hues: List[Tuple[int, ...]] = []
     polarities: List[int] = []
     intensities: List[float] = []
     timestamps: List[int] = []
     for cell in cells:
         tones.append(int(cell["tone"]))
-        hue = tuple(int(v) for v in cell["hue"])
-        hues.append(hue)
+        hues.append(tuple(int(v) for v in cell["hue"]))
         polarities.append(int(cell.get("polarity", 1)))
         intensities.append(float(cell.get("intensity", 1.0)))
         timestamps.append(int(cell.get("timestamp", len(timestamps))))
 
     smoothed = _moving_average(intensities, agg_cfg["window"])
-    symbols: List[Symbol] = []
-
-    for idx, (tone, hue, polarity, intensity, ts, smoothed_intensity) in enumerate(
-        zip(tones, hues, polarities, intensities, timestamps, smoothed)
-    ):
-        role = _role_for_index(smoothed, idx, agg_cfg["intensity_threshold"])
-        stability = (smoothed_intensity * (1 - stability_cfg["decay"])) + (
-            abs(polarity) * agg_cfg["polarity_weight"]
-        )
-        if role == "peak":
-            stability += stability_cfg["role_bonus"]
-        tone_band = tone // max(1, label_cfg["tone_band"])
-        hue_band = sum(hue) // (3 * max(1, label_cfg["hue_band"]))
-        label = f"T{tone_band}-H{hue_band}-P{polarity:+d}"
-        symbols.append(
-            Symbol(
-                idx=idx,
-                tone=tone,
-                hue=hue,
-                polarity=polarity,
-                intensity=intensity,
-                timestamp=ts,
-                role=role,
-                stability=round(stability, 3),
-                label=label,
-            )
-        )
+    role_codes = _role_codes(smoothed, agg_cfg["intensity_threshold"])
+    keep = 1 - stability_cfg["decay"]
+    polarity_weight = agg_cfg["polarity_weight"]
+    role_bonus = stability_cfg["role_bonus"]
+    base = [(s * keep) + (abs(p) * polarity_weight) for s, p in zip(smoothed, polarities)]
+    stability = [round(b + role_bonus if code == _PEAK else b, 3) for b, code in zip(base, role_codes)]
+    label_ids, labels = _label_ids(tones, hues, polarities, cfg["labeling"])
+
+    return SymbolTable(
+        tones=tones,
+        hues=hues,
+        polarities=polarities,
+        intensities=intensities,
+        timestamps=timestamps,
+        role_codes=role_codes,
+        stability=stability,
+        label_ids=label_ids,
+        labels=labels,
+    )
 
-    return symbols
 
+def form_symbols(cells: Iterable[Dict], config: Dict | None = None) -> List[Symbol]:
+    """
+    Build symbols from a sequence of chromatic cells.
 
-def summarize_symbols(symbols: List[Symbol]) -> Dict:
-    """Summarize symbol set into aggregate metrics."""
+    Args:
+        cells: Iterable of dicts containing tone, hue (tuple), polarity, intensity, timestamp.
+        config: Optional configuration override.
+
+    Returns:
+        List of Symbol objects (use form_symbol_table for the columnar form).
+    """
+
+    return form_symbol_table(cells, config).to_symbols()
+
+
+class IncrementalSymbolFormer:
+    """
+    Symbol formation for a live, append-only cell stream.
+
+    Symbol i depends on the smoothed intensities of i - 1, i and i + 1, and
+    each smoothed value only on the last `aggregation.window` intensities. So
+    a symbol is final once its right neighbour has arrived; only the newest
+    symbol is provisional (its role treats the missing neighbour as equal to
+    itself, as form_symbols does at the end of a sequence). Each append costs
+    O(window) and revises that one provisional row.
+
+    `table` always equals form_symbol_table over every cell appended so far.
+    """
+
+    def __init__(self, config: Dict | None = None) -> None:
+        cfg = config or load_symbols_config()
+        agg_cfg = cfg["aggregation"]
+        self._window = max(1, agg_cfg["window"])
+        self._threshold = agg_cfg["intensity_threshold"]
+        self._keep = 1 - cfg["stability"]["decay"]
+        self._polarity_weight = agg_cfg["polarity_weight"]
+        self._role_bonus = cfg["stability"]["role_bonus"]
+        self._label_cfg = cfg["labeling"]
+        self._label_index: Dict[Tuple[int, int, int], int] = {}
+        self._recent: Deque[float] = deque(maxlen=self._window)
+        self._smoothed: List[float] = []
+        self.table = SymbolTable()
+
+    def _stability(self, smoothed: float, polarity: int, code: int) -> float:
+        base = (smoothed * self._keep) + (abs(polarity) * self._polarity_weight)
+        return round(base + self._role_bonus if code == _PEAK else base, 3)
+
+    def _set_role(self, idx: int, nxt: float) -> None:
+        smoothed = self._smoothed
+        cur = smoothed[idx]
+        code = _role_code(cur, smoothed[idx - 1] if idx > 0 else cur, nxt, self._threshold)
+        self.table.role_codes[idx] = code
+        self.table.stability[idx] = self._stability(cur, self.table.polarities[idx], code)
+
+    def append(self, cell: Dict) -> Symbol | None:
+        """Add one cell; return the symbol it finalizes (None for the first cell)."""
+        table = self.table
+        idx = len(table)
+        tone = int(cell["tone"])
+        hue = tuple(int(v) for v in cell["hue"])
+        polarity = int(cell.get("polarity", 1))
+        intensity = float(cell.get("intensity", 1.0))
+        self._recent.append(intensity)
+        recent = list(self._recent)
+        smoothed = sum(recent) / len(recent)
+        self._smoothed.append(smoothed)
+
+        table.tones.append(tone)
+        table.hues.append(hue)
+        table.polarities.append(polarity)
+        table.intensities.append(intensity)
+        table.timestamps.append(int(cell.get("timestamp", idx)))
+        table.role_codes.append(_ONSET)
+        table.stability.append(0.0)
+        label_ids, _ = _label_ids([tone], [hue], [polarity], self._label_cfg, self._label_index, table.labels)
+        table.label_ids.extend(label_ids)
+
+        # The previous symbol now knows its right neighbour; the new one is provisional.
+        if idx > 0:
+            self._set_role(idx - 1, smoothed)
+        self._set_role(idx, smoothed)
+        return table.symbol(idx - 1) if idx > 0 else None
+
+    def extend(self, cells: Iterable[Dict]) -> List[Symbol]:
+        """Add cells in order; return the symbols they finalize."""
+        finalized = []
+        for cell in cells:
+            symbol = self.append(cell)
+            if symbol is not None:
+                finalized.append(symbol)
+        return finalized
+
+    @property
+    def finalized(self) -> int:
+        """Number of leading symbols that later appends can no longer change."""
+        return max(0, len(self.table) - 1)
+
+    @property
+    def tail(self) -> Symbol | None:
+        """The provisional newest symbol, if any."""
+        return self.table.symbol(len(self.table) - 1) if len(self.table) else None
+
+
+def summarize_symbols(symbols: Sequence[Symbol]) -> Dict:
+    """Summarize symbol set (a list of Symbols or a SymbolTable) into aggregate metrics."""
 
     if not symbols:
         return {
@@ -137,10 +328,16 @@ def summarize_symbols(symbols: List[Symbol]) -> Dict:
             "peak_ratio": 0,
         }
 
-    mean_tone = sum(sym.tone for sym in symbols) / len(symbols)
-    mean_intensity = sum(sym.intensity for sym in symbols) / len(symbols)
-    stability = sum(sym.stability for sym in symbols) / len(symbols)
-    peak_ratio = len([s for s in symbols if s.role == "peak"]) / len(symbols)
+    if isinstance(symbols, SymbolTable):
+        mean_tone = sum(symbols.tones) / len(symbols)
+        mean_intensity = sum(symbols.intensities) / len(symbols)
+        stability = sum(symbols.stability) / len(symbols)
+        peak_ratio = symbols.role_codes.count(_PEAK) / len(symbols)
+    else:
+        mean_tone = sum(sym.tone for sym in symbols) / len(symbols)
+        mean_intensity = sum(sym.intensity for sym in symbols) / len(symbols)
+        stability = sum(sym.stability for sym in symbols) / len(symbols)
+        peak_ratio = len([s for s in symbols if s.role == "peak"]) / len(symbols)
 
     return {
         "count": len(symbols),
@@ -170,4 +367,14 @@ def write_symbol_metrics(symbols: List[Symbol], log_dir: str | None = None, conf
     return path
 
 
-__all__ = ["Symbol", "form_symbols", "summarize_symbols", "write_symbol_metrics", "load_symbols_config"]
+__all__ = [
+    "ROLES",
+    "IncrementalSymbolFormer",
+    "Symbol",
+    "SymbolTable",
+    "form_symbol_table",
+    "form_symbols",
+    "summarize_symbols",
+    "write_symbol_metrics",
+    "load_symbols_config",
+]
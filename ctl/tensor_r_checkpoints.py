@@ -0,0 +1,161 @@
+"""
+tensor_r_checkpoints.py
+
+Seekable checkpoint index for long Tensor R runs.
+
+While a stream is processed, a TensorRState snapshot is appended to a
+checkpoint file every K steps. A small sidecar index records the step,
+timestamp and byte offset of each snapshot, so a query for "R (and memory) at
+timestamp t" restores the nearest earlier checkpoint and replays at most K
+L cells instead of recomputing from cell 0.
+
+Files:
+- <path>      one compact JSON TensorRState snapshot per line
+- <path>.idx  one JSON line per snapshot: [step, timestamp, offset]
+"""
+from __future__ import annotations
+
+import bisect
+import json
+import os
+from typing import Any, Dict, List, Sequence, Tuple
+
+from ctl.tensor_r_update import TensorRState, advance_tensor_r_state, init_tensor_r_state
+
+ChromaticCell = Dict[str, Any]
+Config = Dict[str, Any]
+
+
+def _index_path(path: str) -> str:
+    return f"{path}.idx"
+
+
+class TensorRCheckpointWriter:
+    """
+    Append TensorRState snapshots every `every` steps to an indexed file.
+
+    Existing files are truncated unless append=True (e.g. when continuing a
+    run from a restored state).
+    """
+
+    def __init__(self, path: str, every: int, append: bool = False) -> None:
+        if every < 1:
+            raise ValueError("Checkpoint interval must be at least 1 step")
+        self.path = path
+        self.every = every
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._data = open(path, "ab" if append else "wb")
+        self._index = open(_index_path(path), "a" if append else "w", encoding="utf-8")
+
+    def maybe_checkpoint(self, state: TensorRState) -> bool:
+        """Write a checkpoint when the state sits on a K-step boundary."""
+        if state.step == 0 or state.step % self.every:
+            return False
+        self.write(state)
+        return True
+
+    def write(self, state: TensorRState) -> None:
+        """Unconditionally append a checkpoint for the given state."""
+        offset = self._data.tell()
+        payload = json.dumps(state.to_dict(), separators=(",", ":")).encode("utf-8")
+        self._data.write(payload + b"\n")
+        self._data.flush()
+        timestamp = state.prev_r.get("timestamp", 0.0) if state.prev_r else 0.0
+        self._index.write(json.dumps([state.step, timestamp, offset]) + "\n")
+        self._index.flush()
+
+    def close(self) -> None:
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self) -> "TensorRCheckpointWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class TensorRCheckpointIndex:
+    """Read-side view over a checkpoint file and its index."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.entries: List[Tuple[int, float, int]] = []
+        with open(_index_path(path), "r", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    step, timestamp, offset = json.loads(line)
+                    self.entries.append((int(step), float(timestamp), int(offset)))
+        self._timestamps = [entry[1] for entry in self.entries]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def nearest_before(self, timestamp: float) -> Tuple[int, float, int] | None:
+        """Return the last checkpoint whose timestamp is <= timestamp."""
+        pos = bisect.bisect_right(self._timestamps, timestamp)
+        return self.entries[pos - 1] if pos else None
+
+    def restore(self, offset: int) -> TensorRState:
+        """Load the snapshot stored at the given byte offset."""
+        with open(self.path, "rb") as handle:
+            handle.seek(offset)
+            return TensorRState.from_dict(json.loads(handle.readline()))
+
+
+def run_tensor_r_with_checkpoints(
+    l_sequence: Sequence[ChromaticCell],
+    config: Config,
+    path: str,
+    every: int,
+    memory_config: Config | None = None,
+) -> List[ChromaticCell]:
+    """Build the R sequence like update_tensor_r_sequence, checkpointing every K steps."""
+    state = init_tensor_r_state(config)
+    r_sequence: List[ChromaticCell] = []
+    with TensorRCheckpointWriter(path, every) as writer:
+        for l_cell in l_sequence:
+            r_sequence.append(advance_tensor_r_state(state, l_cell, config, memory_config=memory_config))
+            writer.maybe_checkpoint(state)
+    return r_sequence
+
+
+def query_tensor_r_at(
+    path: str,
+    l_sequence: Sequence[ChromaticCell],
+    config: Config,
+    timestamp: float,
+    memory_config: Config | None = None,
+    index: TensorRCheckpointIndex | None = None,
+) -> TensorRState:
+    """
+    Return the stream state after the last R cell with timestamp <= timestamp.
+
+    Times are those of the R timeline the index is built on: an L cell's
+    timestamp, or the previous R timestamp + 1.0 when the L cell has none.
+    The nearest earlier checkpoint is restored and the remaining cells are
+    replayed from l_sequence, which must be the sequence the checkpoints were
+    written from (timestamps non-decreasing). state.prev_r is R at that time
+    and state.memory_state the memory it had accumulated. A query before the
+    first cell returns an empty state.
+    """
+    idx = index if index is not None else TensorRCheckpointIndex(path)
+    entry = idx.nearest_before(timestamp)
+    state = idx.restore(entry[2]) if entry else init_tensor_r_state(config)
+
+    while state.step < len(l_sequence):
+        l_cell = l_sequence[state.step]
+        # Same chain as update_tensor_r_cell / init_tensor_r_cell.
+        fallback = state.prev_r.get("timestamp", 0.0) + 1.0 if state.prev_r is not None else 0.0
+        if l_cell.get("timestamp", fallback) > timestamp:
+            break
+        advance_tensor_r_state(state, l_cell, config, memory_config=memory_config)
+    return state
+
+
+__all__ = [
+    "TensorRCheckpointWriter",
+    "TensorRCheckpointIndex",
+    "run_tensor_r_with_checkpoints",
+    "query_tensor_r_at",
+]
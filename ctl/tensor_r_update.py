@@ -9,13 +9,25 @@ This module assumes:
   "timestamp", "coherence", "constraint_flag"
 
 Config is expected to be a Python dict with the same structure as tensor_R.json5.
+
+Streaming callers can keep the full update context in a TensorRState, which
+can be saved to and restored from a compact JSON file so that a stream resumes
+exactly where it stopped.
 """
 
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import accumulate
 from typing import Dict, List, Any
 import math
 import copy
+import json
+import os
 
 from ctl import memory
+from ctl.flag_track import FlagTrack
+from ctl.l_features import LFeatures, compute_l_features
+from ctl.memory_store import MemoryStore
 
 
 ChromaticCell = Dict[str, Any]
@@ -113,8 +125,10 @@ def update_tensor_r_cell(
     l_curr: ChromaticCell,
     config: Config,
     flip_history: List[int] = None,
-    memory_state: Dict[str, Any] | None = None,
+    memory_state: Dict[str, Any] | memory.MemoryState | None = None,
     memory_config: Config | None = None,
+    trend: int | None = None,
+    polarity_changed: bool | None = None,
 ) -> ChromaticCell:
     """
     Compute R[i] given:
@@ -124,7 +138,11 @@ def update_tensor_r_cell(
     - config: Tensor R config dict (from tensor_R.json5)
     - flip_history: list of past polarity_R values (for over-oscillation detection)
     - memory_state: optional mutable memory accumulator from ctl.memory
+      (a dict from init_memory_state, or a MemoryState updated in place)
     - memory_config: optional memory config dict (defaults to ctl/memory_config.json5)
+    - trend / polarity_changed: optional precomputed L[i-1] -> L[i] tone trend
+      and polarity change (LFeatures.trends / polarity_changed); derived from
+      l_prev and l_curr when None
 
     Returns a new R[i] cell.
     """
@@ -152,7 +170,7 @@ def update_tensor_r_cell(
     max_tone_jump = tone_constr_cfg.get("max_jump", 5)
     saturation_factor = intens_constr_cfg.get("saturation_factor", 0.5)
     coherence_enabled = coherence_cfg.get("enabled", True)
-    mem_state: Dict[str, Any] | None = memory_state if mem_cfg.get("enabled", True) else None
+    mem_state = memory_state if mem_cfg.get("enabled", True) else None
     mem_cfg_resolved = _resolve_memory_config(memory_config) if mem_state is not None else {}
 
     r = copy.deepcopy(prev_r)
@@ -166,7 +184,8 @@ def update_tensor_r_cell(
 
     # --- Tone prediction ---
     if prediction_cfg.get("enabled", True):
-        trend = _tone_trend(l_prev["tone"], l_curr["tone"])
+        if trend is None:
+            trend = _tone_trend(l_prev["tone"], l_curr["tone"])
         tone_pred = _apply_trend(tone_smoothed, trend, alpha)
     else:
         tone_pred = tone_smoothed
@@ -187,7 +206,9 @@ def update_tensor_r_cell(
 
     # --- Polarity integration ---
     if polarity_cfg.get("enabled", True):
-        if flip_on_input_change and (l_curr["polarity"] != l_prev["polarity"]):
+        if polarity_changed is None:
+            polarity_changed = l_curr["polarity"] != l_prev["polarity"]
+        if flip_on_input_change and polarity_changed:
             r["polarity"] = -prev_r["polarity"]
         else:
             r["polarity"] = prev_r["polarity"]
@@ -239,7 +260,9 @@ def update_tensor_r_cell(
             r["polarity"] = 1  # reset structural polarity
 
     # --- Memory reinforcement update ---
-    if mem_state is not None:
+    if isinstance(mem_state, memory.MemoryState):
+        mem_state.observe(l_curr, mem_cfg_resolved, r.get("coherence", 1.0))
+    elif mem_state is not None:
         updated_mem = memory.update_memory_state(mem_state, l_curr, mem_cfg_resolved, r.get("coherence", 1.0))
         mem_state.clear()
         mem_state.update(updated_mem)
@@ -247,12 +270,148 @@ def update_tensor_r_cell(
     return r
 
 
+# --------- Resumable stream state --------- #
+
+STATE_FORMAT_VERSION = 1
+
+
+@dataclass
+class TensorRState:
+    """
+    Everything needed to continue a Tensor R stream from the next L cell.
+
+    - prev_r: last emitted R cell (None before the first L cell)
+    - l_prev: last consumed L cell
+    - flip_history: recent polarity_R values, trimmed to the polarity flip window
+    - memory_state: memory accumulator (None when memory integration is disabled)
+    - step: number of L cells consumed so far
+    """
+
+    prev_r: ChromaticCell | None = None
+    l_prev: ChromaticCell | None = None
+    flip_history: List[int] = field(default_factory=list)
+    memory_state: memory.MemoryState | None = None
+    step: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable snapshot of the state."""
+        return {
+            "version": STATE_FORMAT_VERSION,
+            "step": self.step,
+            "prev_r": self.prev_r,
+            "l_prev": self.l_prev,
+            "flip_history": list(self.flip_history),
+            "memory_state": self.memory_state.to_snapshot() if self.memory_state is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TensorRState":
+        """Rebuild a state from a to_dict() snapshot."""
+        version = data.get("version", STATE_FORMAT_VERSION)
+        if version != STATE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported Tensor R state version: {version}")
+        mem_data = data.get("memory_state")
+        return cls(
+            prev_r=data.get("prev_r"),
+            l_prev=data.get("l_prev"),
+            flip_history=[int(p) for p in data.get("flip_history", [])],
+            memory_state=memory.MemoryState.from_snapshot(mem_data) if mem_data is not None else None,
+            step=int(data.get("step", 0)),
+        )
+
+    def save(self, path: str) -> str:
+        """
+        Write the state as compact JSON and return the path.
+
+        The file is written next to its destination and then renamed, so a
+        crash mid-write never leaves a truncated checkpoint behind.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "TensorRState":
+        """Load a state previously written with save()."""
+        with open(path, "r", encoding="utf-8") as handle:
+            return cls.from_dict(json.load(handle))
+
+
+def init_tensor_r_state(config: Config) -> TensorRState:
+    """Return an empty stream state for the given Tensor R config."""
+    mem_enabled = config.get("behaviors", {}).get("memory_integration", {}).get("enabled", True)
+    return TensorRState(memory_state=memory.MemoryState() if mem_enabled else None)
+
+
+def advance_tensor_r_state(
+    state: TensorRState,
+    l_cell: ChromaticCell,
+    config: Config,
+    memory_config: Config | None = None,
+    history_limit: int | None = None,
+    l_features: LFeatures | None = None,
+) -> ChromaticCell:
+    """
+    Consume one L cell, update the state in place, and return the new R cell.
+
+    The first call initializes R[0] from L[0]; later calls apply
+    update_tensor_r_cell. Feeding a sequence through this function produces the
+    same cells as update_tensor_r_sequence, including across save/load.
+
+    history_limit keeps at least that many flip history entries, so a config
+    swapped in later with a wider flip_window sees the full window at once.
+
+    l_features, when given, describes the L sequence this state consumes from
+    its start: the tone trend and polarity change of step state.step are read
+    from it instead of being recomputed (shared across fibers).
+    """
+    if state.prev_r is None:
+        r_cell = init_tensor_r_cell(l_cell, config)
+    else:
+        trend = polarity_changed = None
+        if l_features is not None:
+            trend = l_features.trends[state.step]
+            polarity_changed = l_features.polarity_changed[state.step]
+        r_cell = update_tensor_r_cell(
+            state.prev_r,
+            state.l_prev,
+            l_cell,
+            config,
+            state.flip_history,
+            memory_state=state.memory_state,
+            memory_config=memory_config,
+            trend=trend,
+            polarity_changed=polarity_changed,
+        )
+
+    state.flip_history.append(r_cell["polarity"])
+    # Only the last flip_window entries are ever read by the update.
+    flip_window = config.get("behaviors", {}).get("polarity_integration", {}).get("flip_window", 16)
+    keep = max(flip_window, history_limit or 0)
+    if flip_window > 0 and len(state.flip_history) > keep:
+        del state.flip_history[:-keep]
+
+    state.prev_r = r_cell
+    state.l_prev = l_cell
+    state.step += 1
+    return r_cell
+
+
 # --------- Sequence-level helper --------- #
 
 def update_tensor_r_sequence(
     l_sequence: List[ChromaticCell],
     config: Config,
     memory_config: Config | None = None,
+    memory_store: MemoryStore | None = None,
+    memory_profile: str | None = None,
+    save_every: int | None = None,
+    flag_track: FlagTrack | None = None,
+    l_features: LFeatures | None = None,
 ) -> List[ChromaticCell]:
     """
     Convenience function:
@@ -260,35 +419,218 @@ def update_tensor_r_sequence(
     - Initializing R[0] from L[0]
     - Iteratively updating R[i] using L[i-1], L[i]
 
+    With a memory_store and memory_profile, memory is warm-started from the
+    stored profile (when present) and saved back at the end, and additionally
+    every `save_every` steps when given. A flag_track, when given, receives
+    each cell's constraint flag as the sequence is built.
+
+    With precomputed l_features (shared across fibers) and memory integration
+    disabled, the columnar update_tensor_r_sequence_fast path is used; with
+    memory enabled the per-step path reads the L trends and polarity changes
+    from the features. Either way the output is identical.
+
     Returns list of R cells.
     """
     if not l_sequence:
         return []
+    memory_enabled = config.get("behaviors", {}).get("memory_integration", {}).get("enabled", True)
+    if l_features is not None and not memory_enabled:
+        return update_tensor_r_sequence_fast(l_sequence, config, flag_track=flag_track, l_features=l_features)
+    if l_features is not None:
+        l_features.check(l_sequence)
+
+    state = init_tensor_r_state(config)
+    persist = memory_store is not None and memory_profile is not None and state.memory_state is not None
+    if persist:
+        stored = memory_store.load(memory_profile)
+        if stored is not None:
+            state.memory_state = stored
 
     r_sequence: List[ChromaticCell] = []
-    flip_history: List[int] = []
-    mem_state = memory.init_memory_state() if config.get("behaviors", {}).get("memory_integration", {}).get("enabled", True) else None
+    for l_cell in l_sequence:
+        r_cell = advance_tensor_r_state(state, l_cell, config, memory_config=memory_config, l_features=l_features)
+        r_sequence.append(r_cell)
+        if flag_track is not None:
+            flag_track.append(r_cell["constraint_flag"], r_cell["timestamp"])
+        if persist and save_every and state.step % save_every == 0:
+            memory_store.save(memory_profile, state.memory_state)
+
+    if persist and not (save_every and state.step % save_every == 0):
+        memory_store.save(memory_profile, state.memory_state)
+    return r_sequence
+
+
+# --------- Fast columnar mode (memory disabled) --------- #
+
+def _scan(step, values, initial):
+    """Inclusive scan of `step` over `values`, starting from `initial`."""
+    return list(accumulate(values, step, initial=initial))
+
+
+def update_tensor_r_sequence_fast(
+    l_sequence: List[ChromaticCell],
+    config: Config,
+    flag_track: FlagTrack | None = None,
+    l_features: LFeatures | None = None,
+) -> List[ChromaticCell]:
+    """
+    Opt-in fast path for update_tensor_r_sequence when memory is disabled.
+
+    Without memory, every R channel is an independent recurrence over L, so
+    the sequence is computed column by column: intensity smoothing, hue
+    blending, tone smoothing/prediction and polarity tracking are each a single
+    scan over whole arrays, with no per-cell dict copies or config lookups.
+    Constraints that feed back into a recurrence (tone max jump, intensity
+    saturation, polarity reset) are applied inside the scan; constraint flags
+    are assembled in a post-pass (VIOLATION over WARN over OK).
+
+    Tolerance against the reference loop: none. Each scan performs the same
+    floating point operations in the same order as update_tensor_r_cell, so the
+    output equals update_tensor_r_sequence exactly. A flag_track, when given,
+    is filled from the flag column. L columns are taken from l_features when
+    given (see ctl.l_features) instead of being extracted again.
+
+    Raises ValueError when memory_integration is enabled.
+    """
+    behaviors = config.get("behaviors", {})
+    if behaviors.get("memory_integration", {}).get("enabled", True):
+        raise ValueError("Fast Tensor R mode requires memory_integration.enabled = false")
+    if not l_sequence:
+        return []
+
+    smoothing_cfg = behaviors.get("smoothing", {})
+    prediction_cfg = behaviors.get("prediction", {})
+    hue_cfg = behaviors.get("hue_expectation", {})
+    intensity_cfg = behaviors.get("intensity_integration", {})
+    polarity_cfg = behaviors.get("polarity_integration", {})
+    mem_cfg = behaviors.get("memory_integration", {})
+    tone_constr_cfg = behaviors.get("tone_constraints", {})
+    intens_constr_cfg = behaviors.get("intensity_constraints", {})
+
+    lam = smoothing_cfg.get("lambda", 0.7)
+    alpha = prediction_cfg.get("alpha", 0.2)
+    hue_weight = hue_cfg.get("weight", 0.2)
+    beta = intensity_cfg.get("beta", 0.85)
+    intensity_max = intensity_cfg.get("max_value", 3.0)
+    max_flips_per_window = polarity_cfg.get("max_flips_per_window", 4)
+    flip_window = polarity_cfg.get("flip_window", 16)
+    intensity_gain = mem_cfg.get("intensity_gain", 0.1)
+    max_tone_jump = tone_constr_cfg.get("max_jump", 5)
+    saturation_factor = intens_constr_cfg.get("saturation_factor", 0.5)
+
+    smoothing_on = smoothing_cfg.get("enabled", True)
+    prediction_on = prediction_cfg.get("enabled", True)
+    hue_on = hue_cfg.get("enabled", True)
+    intensity_on = intensity_cfg.get("enabled", True)
+    polarity_on = polarity_cfg.get("enabled", True)
+    flip_on_input_change = polarity_on and polarity_cfg.get("flip_on_input_change", True)
+    tone_constr_on = tone_constr_cfg.get("enabled", True)
+    intens_constr_on = intens_constr_cfg.get("enabled", True)
 
-    # Initialize R[0]
     r0 = init_tensor_r_cell(l_sequence[0], config)
-    r_sequence.append(r0)
-    flip_history.append(r0["polarity"])
-
-    # Iterate
-    for i in range(1, len(l_sequence)):
-        prev_r = r_sequence[-1]
-        l_prev = l_sequence[i - 1]
-        l_curr = l_sequence[i]
-        r_i = update_tensor_r_cell(
-            prev_r,
-            l_prev,
-            l_curr,
-            config,
-            flip_history,
-            memory_state=mem_state,
-            memory_config=memory_config,
+    n = len(l_sequence)
+    steps = range(1, n)
+
+    # --- L columns ---
+    if l_features is None:
+        l_features = compute_l_features(l_sequence)
+    l_features.check(l_sequence)
+    l_tones = l_features.tones
+    l_trends = l_features.trends
+    l_intensities = l_features.intensities
+    l_polarity_changed = l_features.polarity_changed
+
+    # --- Coherence: without memory it only gets clamped once ---
+    coherence_on = behaviors.get("coherence_field", {}).get("enabled", True)
+    coherence_steady = max(0.0, min(1.0, r0["coherence"])) if coherence_on else r0["coherence"]
+    coherences = [r0["coherence"]] + [coherence_steady] * (n - 1)
+    boost = coherence_steady * intensity_gain if coherence_on else 0.0
+
+    # --- Tone: smoothing + trend, max-jump constraint inside the scan ---
+    tone_warn = [False] * n
+
+    def tone_step(prev: int, i: int) -> int:
+        tone = _blend_tone(prev, l_tones[i], lam) if smoothing_on else prev
+        if prediction_on:
+            tone = _apply_trend(tone, l_trends[i], alpha)
+        if tone_constr_on and abs(tone - prev) > max_tone_jump:
+            tone_warn[i] = True
+            return prev
+        return tone
+
+    tones = _scan(tone_step, steps, r0["tone"])
+
+    # --- Hue: one blend scan per channel ---
+    if hue_on:
+        def hue_channel(channel: int) -> List[int]:
+            column = l_features.hue_channels[channel]
+            return _scan(
+                lambda prev, i: max(0, min(255, int(round((1.0 - hue_weight) * prev + hue_weight * column[i])))),
+                steps,
+                r0["hue"][channel],
+            )
+
+        hues = [r0["hue"]] + [list(h) for h in zip(*(hue_channel(c) for c in range(len(r0["hue"]))))][1:]
+    else:
+        hues = [r0["hue"]] + [r0["hue"][:] for _ in steps]
+
+    # --- Intensity: exponential smoothing + coherence boost, saturation inside the scan ---
+    intensity_warn = [False] * n
+
+    def intensity_step(prev: float, i: int) -> float:
+        value = beta * prev + (1.0 - beta) * l_intensities[i] if intensity_on else prev
+        if coherence_on:
+            value += boost
+        if intens_constr_on and value > intensity_max:
+            intensity_warn[i] = True
+            value *= saturation_factor
+        return value
+
+    intensities = _scan(intensity_step, steps, r0["intensity"])
+
+    # --- Polarity: flips on L changes, over-oscillation reset inside the scan ---
+    polarity_violation = [False] * n
+    window: deque = deque([r0["polarity"]], maxlen=flip_window if flip_window > 0 else None)
+    window_flips = [0]
+
+    def polarity_step(prev: int, i: int) -> int:
+        polarity = -prev if flip_on_input_change and l_polarity_changed[i] else prev
+        if polarity_on and window_flips[0] > max_flips_per_window:
+            polarity_violation[i] = True
+            polarity = 1
+        # Slide the flip window forward with the polarity just emitted
+        if window.maxlen is not None and len(window) == window.maxlen:
+            if window.maxlen > 1 and window[0] != window[1]:
+                window_flips[0] -= 1
+        if window and window[-1] != polarity and window.maxlen != 1:
+            window_flips[0] += 1
+        window.append(polarity)
+        return polarity
+
+    polarities = _scan(polarity_step, steps, r0["polarity"])
+
+    # --- Timestamps ---
+    timestamps = list(l_features.timestamps)
+
+    # --- Constraint flag post-pass ---
+    flags = [
+        "VIOLATION" if violation else "WARN" if (t_warn or i_warn) else "OK"
+        for violation, t_warn, i_warn in zip(polarity_violation, tone_warn, intensity_warn)
+    ]
+    if flag_track is not None:
+        flag_track.extend(flags, timestamps)
+
+    return [
+        {
+            "tone": tone,
+            "hue": hue,
+            "intensity": intensity,
+            "polarity": polarity,
+            "timestamp": timestamp,
+            "coherence": coherence,
+            "constraint_flag": flag,
+        }
+        for tone, hue, intensity, polarity, timestamp, coherence, flag in zip(
+            tones, hues, intensities, polarities, timestamps, coherences, flags
         )
-        r_sequence.append(r_i)
-        flip_history.append(r_i["polarity"])
-
-    return r_sequence
+    ]
@@ -0,0 +1,451 @@
+"""
+Local tensor-worker topology with an "intuition" reducer.
+
+The THALM proposal (docs/) has many tensor workers feed a single intuition
+node that collapses their output into bias packets. This module is the local,
+single-machine version of that topology (no MPI):
+
+    fiber worker 0 --ring 0--\\
+    fiber worker 1 --ring 1---+--> IntuitionReducer --> BiasPacket every `cadence` steps
+    ...                      /
+
+- Each fiber worker is a long-running process. It loads the shared L once
+  (published through shared memory, see ctl.fiber_pool), steps its Tensor R
+  state cell by cell and writes every R cell into its own ring buffer.
+- A ShmRing is a single-producer / single-consumer ring of fixed-size records
+  in a shared memory block. The producer waits while the ring is full.
+- The reducer (in the calling process) drains the rings. Once every live
+  fiber has reported step t it folds that step into the current window, in
+  fiber order, so packets do not depend on arrival timing. Every `cadence`
+  completed steps it emits a BiasPacket with aggregate coherence, polarity
+  and constraint statistics.
+- A fiber's ring is only drained while that fiber is less than
+  `ring_capacity` steps ahead of the oldest unfolded step. A fiber running
+  ahead of the others fills its ring and blocks, so the reducer buffers at
+  most `ring_capacity` steps and memory stays bounded however long the
+  stream is.
+
+run_tensor_worker_pool also reports throughput and end-to-end latency (worker
+write to reducer read, on the shared monotonic clock); latency percentiles
+come from a fixed-size reservoir sample.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import random
+import struct
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from ctl.fiber_pool import load_sequence, publish_sequence
+from ctl.shared_memory_state import attach_untracked
+from ctl.tensor_r_update import advance_tensor_r_state, init_tensor_r_state
+
+ChromaticCell = Dict[str, Any]
+Config = Dict[str, Any]
+
+# head (records written) u64 | tail (records read) u64
+_RING_HEADER = struct.Struct("<QQ")
+# step q | tone i | polarity i | flag i | r g b i | intensity d | coherence d | timestamp d | sent_ns q
+_RECORD = struct.Struct("<qiiiiiidddq")
+_FLAG_CODES = {"OK": 0, "WARN": 1, "VIOLATION": 2}
+_FLAGS = ("OK", "WARN", "VIOLATION")
+_END_OF_STREAM = -1
+
+
+class ShmRing:
+    """Single-producer / single-consumer ring of R-cell records in shared memory."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, capacity: int, owner: bool) -> None:
+        self._shm = shm
+        self.capacity = capacity
+        self.owner = owner
+
+    @classmethod
+    def create(cls, capacity: int = 256) -> "ShmRing":
+        if capacity < 1:
+            raise ValueError("Ring capacity must be at least 1 record")
+        shm = shared_memory.SharedMemory(create=True, size=_RING_HEADER.size + capacity * _RECORD.size)
+        _RING_HEADER.pack_into(shm.buf, 0, 0, 0)
+        return cls(shm, capacity, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, capacity: int) -> "ShmRing":
+        return cls(attach_untracked(name), capacity, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def _counters(self) -> Tuple[int, int]:
+        return _RING_HEADER.unpack_from(self._shm.buf, 0)
+
+    def push(self, step: int, cell: ChromaticCell | None, idle_sleep: float = 0.0001) -> None:
+        """Write one record, waiting while the ring is full (producer side)."""
+        buf = self._shm.buf
+        while True:
+            head, tail = self._counters()
+            if head - tail < self.capacity:
+                break
+            time.sleep(idle_sleep)
+        offset = _RING_HEADER.size + (head % self.capacity) * _RECORD.size
+        if cell is None:
+            _RECORD.pack_into(buf, offset, step, 0, 0, 0, 0, 0, 0, 0.0, 0.0, 0.0, time.monotonic_ns())
+        else:
+            r, g, b = (list(cell["hue"]) + [0, 0, 0])[:3]
+            _RECORD.pack_into(
+                buf,
+                offset,
+                step,
+                int(cell["tone"]),
+                int(cell["polarity"]),
+                _FLAG_CODES.get(cell.get("constraint_flag", "OK"), 0),
+                int(r),
+                int(g),
+                int(b),
+                float(cell["intensity"]),
+                float(cell["coherence"]),
+                float(cell.get("timestamp", 0.0)),
+                time.monotonic_ns(),
+            )
+        # Publish the record only after it is fully written.
+        struct.pack_into("<Q", buf, 0, head + 1)
+
+    def pop_all(self, limit: int | None = None) -> List[Tuple[Any, ...]]:
+        """Read every available record, or at most `limit` of them (consumer side)."""
+        buf = self._shm.buf
+        head, tail = self._counters()
+        if limit is not None:
+            head = min(head, tail + max(0, limit))
+        records = []
+        for seq in range(tail, head):
+            offset = _RING_HEADER.size + (seq % self.capacity) * _RECORD.size
+            records.append(_RECORD.unpack_from(buf, offset))
+        if head != tail:
+            struct.pack_into("<Q", buf, 8, head)
+        return records
+
+    def close(self) -> None:
+        self._shm.close()
+
+    def unlink(self) -> None:
+        if self.owner:
+            self._shm.unlink()
+
+
+def _decode(record: Tuple[Any, ...]) -> Tuple[int, ChromaticCell, int]:
+    step, tone, polarity, flag, r, g, b, intensity, coherence, timestamp, sent_ns = record
+    cell = {
+        "tone": tone,
+        "hue": [r, g, b],
+        "intensity": intensity,
+        "polarity": polarity,
+        "timestamp": timestamp,
+        "coherence": coherence,
+        "constraint_flag": _FLAGS[flag],
+    }
+    return step, cell, sent_ns
+
+
+@dataclass(frozen=True)
+class BiasPacket:
+    """Compact summary of the ensemble over one cadence window."""
+
+    step: int  # last step folded into this packet
+    steps: int  # steps in the window
+    fibers: int  # fibers reporting in the window's last step
+    coherence_mean: float
+    coherence_min: float
+    polarity_balance: float  # mean polarity, in [-1, 1]
+    polarity_agreement: float  # share of cells on the majority polarity
+    warn_rate: float
+    violation_rate: float
+    state: str
+
+    _PACKED = struct.Struct("<qiiffffff12s")
+
+    def pack(self) -> bytes:
+        """Fixed-size (52 byte) binary form for transport."""
+        return self._PACKED.pack(
+            self.step,
+            self.steps,
+            self.fibers,
+            self.coherence_mean,
+            self.coherence_min,
+            self.polarity_balance,
+            self.polarity_agreement,
+            self.warn_rate,
+            self.violation_rate,
+            self.state.encode("ascii"),
+        )
+
+    @classmethod
+    def unpack(cls, payload: bytes) -> "BiasPacket":
+        values = cls._PACKED.unpack(payload)
+        return cls(*values[:9], state=values[9].rstrip(b"\0").decode("ascii"))
+
+
+def _bias_state(coherence_mean: float, polarity_agreement: float, violation_rate: float) -> str:
+    """Coarse label of the ensemble's condition."""
+    if violation_rate > 0.1:
+        return "CONFLICT"
+    if coherence_mean < 0.5:
+        return "UNSETTLED"
+    if coherence_mean >= 0.85 and polarity_agreement >= 0.9:
+        return "FLOW"
+    return "STEADY"
+
+
+class IntuitionReducer:
+    """
+    Collapse per-step fiber cells into BiasPackets every `cadence` steps.
+
+    on_packet, when given, is called with each packet as soon as it is
+    emitted (packets are also collected in `packets`).
+    """
+
+    def __init__(
+        self, fibers: int, cadence: int = 16, on_packet: Callable[[BiasPacket], None] | None = None
+    ) -> None:
+        if cadence < 1:
+            raise ValueError("Bias packet cadence must be at least 1 step")
+        self.fibers = fibers
+        self.cadence = cadence
+        self.on_packet = on_packet
+        self.packets: List[BiasPacket] = []
+        self._pending: Dict[int, Dict[int, ChromaticCell]] = {}
+        self._reported = [0] * fibers  # steps received per fiber
+        self._finished = [False] * fibers
+        self._next_step = 0
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        self._window_steps = 0
+        self._cells = 0
+        self._coherence_sum = 0.0
+        self._coherence_min = float("inf")
+        self._polarity_sum = 0
+        self._positive = 0
+        self._warn = 0
+        self._violation = 0
+        self._last_fibers = 0
+        self._last_step = -1
+
+    def room(self, fiber: int, depth: int) -> int:
+        """Steps `fiber` may still deliver while staying within `depth` steps of the oldest unfolded step."""
+        return max(0, self._next_step + depth - self._reported[fiber])
+
+    def feed(self, fiber: int, step: int, cell: ChromaticCell | None) -> None:
+        """Accept one cell (or end of stream when cell is None) from a fiber."""
+        if cell is None:
+            self._finished[fiber] = True
+        else:
+            self._pending.setdefault(step, {})[fiber] = cell
+            self._reported[fiber] = step + 1
+        self._drain()
+
+    def _drain(self) -> None:
+        while True:
+            live = [f for f in range(self.fibers) if not self._finished[f] or self._reported[f] > self._next_step]
+            if not live or any(self._reported[f] <= self._next_step for f in live):
+                return
+            cells = self._pending.pop(self._next_step, {})
+            self._fold([cells[f] for f in sorted(cells)])
+            self._next_step += 1
+
+    def _fold(self, cells: Sequence[ChromaticCell]) -> None:
+        for cell in cells:
+            coherence = float(cell["coherence"])
+            self._coherence_sum += coherence
+            self._coherence_min = min(self._coherence_min, coherence)
+            self._polarity_sum += cell["polarity"]
+            self._positive += cell["polarity"] > 0
+            self._warn += cell["constraint_flag"] == "WARN"
+            self._violation += cell["constraint_flag"] == "VIOLATION"
+        self._cells += len(cells)
+        self._last_fibers = len(cells)
+        self._last_step = self._next_step
+        self._window_steps += 1
+        if self._window_steps == self.cadence:
+            self._emit()
+
+    def _emit(self) -> None:
+        if not self._cells:
+            return
+        cells = self._cells
+        coherence_mean = self._coherence_sum / cells
+        agreement = max(self._positive, cells - self._positive) / cells
+        violation_rate = self._violation / cells
+        packet = BiasPacket(
+            step=self._last_step,
+            steps=self._window_steps,
+            fibers=self._last_fibers,
+            coherence_mean=coherence_mean,
+            coherence_min=self._coherence_min,
+            polarity_balance=self._polarity_sum / cells,
+            polarity_agreement=agreement,
+            warn_rate=self._warn / cells,
+            violation_rate=violation_rate,
+            state=_bias_state(coherence_mean, agreement, violation_rate),
+        )
+        self.packets.append(packet)
+        self._reset_window()
+        if self.on_packet is not None:
+            self.on_packet(packet)
+
+    def finish(self) -> List[BiasPacket]:
+        """Flush a partial final window and return all packets."""
+        self._emit()
+        return self.packets
+
+    @property
+    def done(self) -> bool:
+        return all(self._finished) and not self._pending
+
+
+class _LatencyReservoir:
+    """Count, mean and max of all samples; percentiles from a fixed-size uniform sample."""
+
+    def __init__(self, size: int = 4096, seed: int = 0) -> None:
+        self.size = size
+        self.count = 0
+        self.total = 0
+        self.maximum = 0
+        self._sample: List[int] = []
+        self._rng = random.Random(seed)
+
+    def add(self, value: int) -> None:
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+        if len(self._sample) < self.size:
+            self._sample.append(value)
+        else:
+            slot = self._rng.randrange(self.count)
+            if slot < self.size:
+                self._sample[slot] = value
+
+    def summary_ms(self) -> Dict[str, float]:
+        if not self.count:
+            return {}
+        ordered = sorted(self._sample)
+        size = len(ordered)
+        return {
+            "mean": self.total / self.count / 1e6,
+            "p50": ordered[size // 2] / 1e6,
+            "p95": ordered[min(size - 1, int(size * 0.95))] / 1e6,
+            "max": self.maximum / 1e6,
+        }
+
+
+def _drain_rings(
+    rings: Sequence[ShmRing], reducer: IntuitionReducer, depth: int, latencies: _LatencyReservoir
+) -> bool:
+    """Move records from the rings into the reducer; False when nothing was read."""
+    progressed = False
+    for fiber, ring in enumerate(rings):
+        # Leave a fiber that runs ahead in its ring so its producer blocks.
+        for record in ring.pop_all(limit=reducer.room(fiber, depth)):
+            received = time.monotonic_ns()
+            step, cell, sent_ns = _decode(record)
+            if step == _END_OF_STREAM:
+                reducer.feed(fiber, step, None)
+            else:
+                latencies.add(received - sent_ns)
+                reducer.feed(fiber, step, cell)
+            progressed = True
+    return progressed
+
+
+def _fiber_worker(
+    l_name: str, l_size: int, config: Config, ring_name: str, capacity: int, idle_sleep: float
+) -> None:
+    l_sequence = load_sequence(l_name, l_size)
+    ring = ShmRing.attach(ring_name, capacity)
+    try:
+        state = init_tensor_r_state(config)
+        for step, l_cell in enumerate(l_sequence):
+            ring.push(step, advance_tensor_r_state(state, l_cell, config), idle_sleep)
+        ring.push(_END_OF_STREAM, None, idle_sleep)
+    finally:
+        ring.close()
+
+
+def run_tensor_worker_pool(
+    l_sequence: Sequence[ChromaticCell],
+    r_configs: Sequence[Config],
+    cadence: int = 16,
+    ring_capacity: int = 256,
+    context: str | None = None,
+    idle_sleep: float = 0.0005,
+    worker_idle_sleep: float = 0.0001,
+    on_packet: Callable[[BiasPacket], None] | None = None,
+) -> Dict[str, Any]:
+    """
+    Run one worker process per fiber config and reduce their streams.
+
+    idle_sleep is the reducer's back-off when every ring is empty and
+    worker_idle_sleep the workers' back-off while their ring is full.
+    on_packet receives each bias packet while the stream is still running.
+
+    Returns the bias packets plus throughput (R cells per second through the
+    reducer) and end-to-end latency statistics in milliseconds.
+    """
+    reducer = IntuitionReducer(len(r_configs), cadence=cadence, on_packet=on_packet)
+    if not r_configs:
+        return {"packets": [], "cells": 0, "elapsed_s": 0.0, "throughput_cells_per_s": 0.0, "latency_ms": {}}
+
+    l_shm, l_size = publish_sequence(l_sequence)
+    rings = [ShmRing.create(ring_capacity) for _ in r_configs]
+    ctx = multiprocessing.get_context(context)
+    workers = [
+        ctx.Process(
+            target=_fiber_worker,
+            args=(l_shm.name, l_size, cfg, ring.name, ring_capacity, worker_idle_sleep),
+            daemon=True,
+        )
+        for cfg, ring in zip(r_configs, rings)
+    ]
+    latencies = _LatencyReservoir()
+    started = time.perf_counter()
+    try:
+        for worker in workers:
+            worker.start()
+        while not reducer.done:
+            if not _drain_rings(rings, reducer, ring_capacity, latencies):
+                crashed = [w for w in workers if w.exitcode not in (None, 0)]
+                if crashed:
+                    raise RuntimeError(f"Tensor worker exited with code {crashed[0].exitcode}")
+                time.sleep(idle_sleep)
+        elapsed = time.perf_counter() - started
+        for worker in workers:
+            worker.join()
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        for ring in rings:
+            ring.close()
+            ring.unlink()
+        l_shm.close()
+        l_shm.unlink()
+
+    cells = latencies.count
+    latency_ms = latencies.summary_ms()
+    return {
+        "packets": reducer.finish(),
+        "cells": cells,
+        "elapsed_s": elapsed,
+        "throughput_cells_per_s": cells / elapsed if elapsed > 0 else 0.0,
+        "latency_ms": latency_ms,
+    }
+
+
+__all__ = [
+    "ShmRing",
+    "BiasPacket",
+    "IntuitionReducer",
+    "run_tensor_worker_pool",
+]
@@ -1,7 +1,7 @@
 """Shared utilities for CTL test suite."""
 import json
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Sequence
 
 from ctl.tensor_r_update import init_tensor_r_cell, update_tensor_r_sequence
 
@@ -21,6 +21,16 @@ def load_coupling_config() -> Config:
         return json.load(f)
 
 
+def smoothing_configs(lambdas: Sequence[float]) -> List[Config]:
+    """One fresh Tensor R config per smoothing lambda (fiber ensembles in tests)."""
+    configs = []
+    for smoothing in lambdas:
+        cfg = load_tensor_r_config()
+        cfg["behaviors"]["smoothing"]["lambda"] = smoothing
+        configs.append(cfg)
+    return configs
+
+
 def build_r_sequence(l_sequence: List[ChromaticCell], config: Config = None) -> List[ChromaticCell]:
     cfg = config or load_tensor_r_config()
     if not l_sequence:
@@ -1,10 +1,19 @@
 """Coupling-specific tests."""
+import random
+
+import pytest
+
 from ctl.coupling import (
+    CouplingKernel,
     apply_coupling,
+    compute_pair_disparity,
+    evaluate_r_candidates,
     compute_coupling_metrics,
     load_coupling_config,
     process_coupling_sequence,
+    stream_coupling,
 )
+from ctl_tests import coupling_reference as reference
 from ctl_tests.ctl_mock_data import generate_contrasting_l_sequence, generate_l_sequence
 from ctl_tests.ctl_testing_utils import build_r_sequence, load_tensor_r_config
 
@@ -44,3 +53,129 @@ def test_coupling_detects_disparity():
     assert violations, "Expected coupling to flag disparities"
     assert any(cell["constraint_flag"] == "VIOLATION" for cell in violations)
     assert metrics.get("polarity_disagreement_rate", 0) >= 0
+
+
+def _varied_pairs(length, seed=11):
+    """Long L/R streams that drift in and out of agreement."""
+    rng = random.Random(seed)
+    l_seq, r_seq = [], []
+    for idx in range(length):
+        l_cell = {
+            "tone": rng.randrange(12),
+            "hue": [rng.randrange(256) for _ in range(3)],
+            "intensity": rng.uniform(0.2, 3.0),
+            "polarity": rng.choice((1, -1)),
+            "timestamp": float(idx),
+        }
+        drift = 0 if (idx // 15) % 2 == 0 else rng.randrange(6)
+        r_cell = {
+            "tone": (l_cell["tone"] + drift) % 12,
+            "hue": [min(255, max(0, c + rng.randint(-20 - 20 * drift, 20 + 20 * drift))) for c in l_cell["hue"]],
+            "intensity": max(0.0, l_cell["intensity"] + rng.uniform(-0.3, 0.3) * (1 + drift)),
+            "polarity": l_cell["polarity"] if rng.random() < 0.8 else -l_cell["polarity"],
+            "timestamp": float(idx),
+            "coherence": rng.uniform(0.4, 1.0),
+        }
+        l_seq.append(l_cell)
+        r_seq.append(r_cell)
+    return l_seq, r_seq
+
+
+def test_coupling_kernel_matches_per_pair_reference():
+    coupling_cfg = load_coupling_config()
+    l_seq, r_seq = _varied_pairs(150)
+    assert len(l_seq) > 10 * coupling_cfg["thresholds"]["window"]
+
+    kernel = CouplingKernel(coupling_cfg)
+    columns = kernel.disparities(l_seq, r_seq)
+    coupled = kernel.coupled(l_seq, r_seq, columns)
+
+    assert kernel.per_step(columns) == [reference.compute_pair_disparity(l, r, coupling_cfg) for l, r in zip(l_seq, r_seq)]
+    assert kernel.metrics(l_seq, r_seq, columns) == reference.compute_coupling_metrics(l_seq, r_seq, coupling_cfg)
+    assert coupled == reference.apply_coupling(l_seq, r_seq, coupling_cfg)
+    assert {cell["constraint_flag"] for cell in coupled} == {"OK", "WARN", "VIOLATION"}
+    assert kernel.coupled([], []) == []
+
+
+def test_coupling_kernel_matches_reference_for_other_configs():
+    l_seq, r_seq = _varied_pairs(80, seed=5)
+    for window, curve in ((1, 1.0), (3, 0.8), (9, 1.6)):
+        coupling_cfg = load_coupling_config()
+        coupling_cfg["thresholds"]["window"] = window
+        coupling_cfg["nonlinear"]["coherence_curve"] = curve
+        kernel = CouplingKernel(coupling_cfg)
+        assert kernel.coupled(l_seq, r_seq) == reference.apply_coupling(l_seq, r_seq, coupling_cfg)
+        assert kernel.metrics(l_seq, r_seq) == reference.compute_coupling_metrics(l_seq, r_seq, coupling_cfg)
+
+
+def test_process_coupling_sequence_optional_outputs():
+    coupling_cfg = load_coupling_config()
+    l_seq = generate_l_sequence(length=8, start_tone=2)
+    r_seq = build_r_sequence(l_seq, load_tensor_r_config())
+
+    full = process_coupling_sequence(l_seq, r_seq, coupling_cfg)
+    summary_only = process_coupling_sequence(
+        l_seq, r_seq, coupling_cfg, include_coupled=False, include_per_step=False
+    )
+
+    assert set(full) == {"coupled", "per_step", "summary"}
+    assert full["coupled"] == apply_coupling(l_seq, r_seq, coupling_cfg)
+    assert full["per_step"] == [compute_pair_disparity(l, r, coupling_cfg) for l, r in zip(l_seq, r_seq)]
+    assert summary_only == {"coupled": None, "per_step": None, "summary": full["summary"]}
+
+
+def test_stream_coupling_matches_batch_coupling():
+    coupling_cfg = load_coupling_config()
+    l_seq, r_seq = _varied_pairs(400, seed=23)
+
+    batch = reference.apply_coupling(l_seq, r_seq, coupling_cfg)
+    streamed = list(stream_coupling(iter(l_seq), iter(r_seq), coupling_cfg))
+
+    assert len(streamed) == len(batch)
+    # Many evictions and several re-sum cycles of the rolling windows.
+    assert len(batch) > 50 * coupling_cfg["thresholds"]["window"]
+    assert [cell["constraint_flag"] for cell, _ in streamed] == [cell["constraint_flag"] for cell in batch]
+    assert len({cell["constraint_flag"] for cell in batch}) == 3
+    for expected, (cell, _) in zip(batch, streamed):
+        assert cell["coherence"] == pytest.approx(expected["coherence"])
+        assert cell["tone"] == expected["tone"]
+
+    final = streamed[-1][1]
+    metrics = reference.compute_coupling_metrics(l_seq, r_seq, coupling_cfg)
+    assert all(final[key] == pytest.approx(value) for key, value in metrics.items())
+    assert final["steps"] == len(batch)
+    assert final["violations"] == sum(1 for cell in batch if cell["constraint_flag"] == "VIOLATION")
+
+
+def test_stream_flags_are_exact_at_the_window_threshold():
+    coupling_cfg = load_coupling_config()
+    coupling_cfg["nonlinear"].update(tone_exponent=1.0, hue_exponent=1.0, intensity_exponent=1.0)
+    # With these gaps the rolling intensity mean at the last step rounds one
+    # ulp away from the re-summed mean, and this gap limit puts the window
+    # penalty exactly on the breach threshold.
+    coupling_cfg["thresholds"].update(window=3, agreement_min=0.0, intensity_gap_max=0.16666566666666666)
+    gaps = [0.7, 0.1, 0.7, 0.7] * 50
+    l_seq = [{"tone": 0, "hue": [0, 0, 0], "intensity": 1.0, "polarity": 1, "timestamp": i} for i in range(len(gaps))]
+    r_seq = [dict(cell, intensity=1.0 + gap) for cell, gap in zip(l_seq, gaps)]
+
+    batch = reference.apply_coupling(l_seq, r_seq, coupling_cfg)
+    streamed = [cell for cell, _ in stream_coupling(l_seq, r_seq, coupling_cfg)]
+    assert [c["constraint_flag"] for c in streamed] == [c["constraint_flag"] for c in batch]
+
+
+def test_evaluate_r_candidates_matches_per_candidate_metrics():
+    coupling_cfg = load_coupling_config()
+    tensor_r_cfg = load_tensor_r_config()
+    l_seq = generate_l_sequence(length=10, start_tone=1, tone_step=2)
+    candidates = [build_r_sequence(generate_l_sequence(length=10, start_tone=start), tensor_r_cfg) for start in range(6)]
+    candidates.append(generate_contrasting_l_sequence(length=10))
+
+    expected = [compute_coupling_metrics(l_seq, r_seq, coupling_cfg) for r_seq in candidates]
+    results = evaluate_r_candidates(l_seq, candidates, coupling_cfg)
+    top = evaluate_r_candidates(l_seq, candidates, coupling_cfg, top_k=3, rank_by="agreement")
+
+    assert [entry["metrics"] for entry in results] == expected
+    ranked = sorted(range(len(expected)), key=lambda idx: (-expected[idx]["agreement"], idx))
+    assert [entry["index"] for entry in top] == ranked[:3]
+    with pytest.raises(ValueError):
+        evaluate_r_candidates(l_seq, candidates, coupling_cfg, top_k=1, rank_by="tone")
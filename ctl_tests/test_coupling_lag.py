@@ -0,0 +1,65 @@
+"""Lagged L/R alignment tests."""
+import random
+
+from ctl.coupling import load_coupling_config, process_coupling_sequence
+from ctl.coupling_lag import find_best_lag, lag_scores, process_lagged_coupling, shift_pairs
+from ctl_tests.ctl_mock_data import generate_l_sequence
+
+
+def _varied_l_sequence(length, seed=7):
+    rng = random.Random(seed)
+    return [
+        {
+            "tone": rng.randrange(12),
+            "hue": [rng.randrange(256) for _ in range(3)],
+            "intensity": 0.5 + rng.randrange(5) * 0.4,
+            "polarity": rng.choice((1, -1)),
+            "timestamp": float(idx),
+        }
+        for idx in range(length)
+    ]
+
+
+def test_find_best_lag_recovers_shift():
+    coupling_cfg = load_coupling_config()
+    l_seq = _varied_l_sequence(300)
+    padding = _varied_l_sequence(11, seed=3)
+
+    lagging_r = padding + l_seq
+    leading_r = l_seq[7:]
+
+    assert len(lag_scores(l_seq, lagging_r, coupling_cfg)) == 2 * coupling_cfg["lag"]["max_lag"] + 1
+    assert find_best_lag(l_seq, lagging_r, coupling_cfg)["lag"] == 11
+    assert find_best_lag(l_seq, leading_r, coupling_cfg)["lag"] == -7
+    assert find_best_lag(l_seq, l_seq, coupling_cfg)["score"] > 0.99
+    # Beyond max_lag the shift cannot be found.
+    far_r = _varied_l_sequence(coupling_cfg["lag"]["max_lag"] + 5, seed=5) + l_seq
+    assert find_best_lag(l_seq, far_r, coupling_cfg)["lag"] != coupling_cfg["lag"]["max_lag"] + 5
+
+
+def test_lag_scores_respect_window_and_overlap():
+    coupling_cfg = load_coupling_config()
+    short = _varied_l_sequence(10)
+    long = _varied_l_sequence(120)
+
+    # Short streams: min_overlap binds. Long streams: max_lag binds.
+    scores = lag_scores(short, short, coupling_cfg, max_lag=20)
+    assert max(scores) == len(short) - coupling_cfg["lag"]["min_overlap"]
+    assert min(scores) == -max(scores)
+    assert sorted(lag_scores(long, long, coupling_cfg)) == list(
+        range(-coupling_cfg["lag"]["max_lag"], coupling_cfg["lag"]["max_lag"] + 1)
+    )
+    assert lag_scores([], short, coupling_cfg) == {}
+
+
+def test_process_lagged_coupling_uses_chosen_lag():
+    coupling_cfg = load_coupling_config()
+    l_seq = _varied_l_sequence(200)
+    r_seq = generate_l_sequence(length=9) + l_seq
+
+    bundle = process_lagged_coupling(l_seq, r_seq, coupling_cfg)
+    l_part, r_part = shift_pairs(l_seq, r_seq, bundle["lag"])
+
+    assert bundle["lag"] == 9
+    assert bundle["summary"] == process_coupling_sequence(l_part, r_part, coupling_cfg)["summary"]
+    assert bundle["summary"]["agreement"] > process_coupling_sequence(l_seq, r_seq, coupling_cfg)["summary"]["agreement"]
@@ -0,0 +1,47 @@
+"""Coarse-to-fine coupling tests."""
+from ctl.coupling import apply_coupling, compute_coupling_metrics, load_coupling_config
+from ctl.coupling_multires import process_coupling_multires
+from ctl_tests.ctl_mock_data import generate_l_sequence
+
+
+def _drifting_pair(length, disagree_from, disagree_to):
+    l_seq = [
+        dict(cell, tone=(idx // 20) % 12, hue=[100 + idx % 5, 80, 60], intensity=1.0 + (idx % 7) * 0.01)
+        for idx, cell in enumerate(generate_l_sequence(length=length))
+    ]
+    r_seq = [
+        dict(cell, tone=(cell["tone"] + 6) % 12 if disagree_from <= idx < disagree_to else cell["tone"])
+        for idx, cell in enumerate(l_seq)
+    ]
+    return l_seq, r_seq
+
+
+def test_multires_refines_only_disagreement_and_matches_full_pass():
+    coupling_cfg = load_coupling_config()
+    l_seq, r_seq = _drifting_pair(160, 70, 90)
+
+    result = process_coupling_multires(l_seq, r_seq, coupling_cfg)
+    full = apply_coupling(l_seq, r_seq, coupling_cfg)
+
+    fine = [seg for seg in result["segments"] if seg["resolution"] == "fine"]
+    assert fine and all(seg["coupled"] == full[seg["start"] : seg["stop"]] for seg in fine)
+    assert all(seg["start"] < 90 and seg["stop"] > 70 for seg in fine)
+    assert result["work"]["skipped_cells"] == 160 - result["work"]["refined_cells"]
+    assert result["work"]["skipped_fraction"] > 0.5
+
+    expected_flags = {flag: sum(1 for c in full if c["constraint_flag"] == flag) for flag in ("OK", "WARN", "VIOLATION")}
+    assert result["flag_counts"] == expected_flags
+
+    metrics = compute_coupling_metrics(l_seq, r_seq, coupling_cfg)
+    for key, value in metrics.items():
+        assert abs(result["summary"][key] - value) <= result["error_bound"][key] + 1e-9
+
+
+def test_multires_block_of_one_is_full_resolution():
+    coupling_cfg = load_coupling_config()
+    l_seq, r_seq = _drifting_pair(30, 10, 12)
+
+    result = process_coupling_multires(l_seq, r_seq, coupling_cfg, block=1)
+
+    assert all(bound == 0.0 for bound in result["error_bound"].values())
+    assert process_coupling_multires([], [], coupling_cfg)["work"]["cells"] == 0
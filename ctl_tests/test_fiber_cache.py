@@ -0,0 +1,72 @@
+"""Fiber result cache tests."""
+from ctl import memory
+from ctl.fiber_cache import FiberCache, canonical_hash, fiber_cache_key, l_sequence_digest
+from ctl.multi_tensor import MultiTensorAssembly
+from ctl.tensor_r_update import update_tensor_r_sequence
+from ctl_tests.ctl_mock_data import generate_l_sequence
+from ctl_tests.ctl_testing_utils import load_tensor_r_config, smoothing_configs
+
+
+def test_keys_are_canonical_and_sensitive():
+    l_seq = generate_l_sequence(length=6)
+    cfg = load_tensor_r_config()
+    digest = l_sequence_digest(l_seq)
+
+    reordered = dict(reversed(list(cfg.items())))
+    assert canonical_hash(cfg) == canonical_hash(reordered)
+    assert fiber_cache_key(cfg, digest) == fiber_cache_key(reordered, digest)
+    assert fiber_cache_key(cfg, digest) != fiber_cache_key(cfg, l_sequence_digest(l_seq[:-1]))
+    assert fiber_cache_key(cfg, digest) != fiber_cache_key(cfg, digest, memory_config={"peaks": {}})
+
+
+def test_only_changed_fibers_are_recomputed(tmp_path):
+    l_seq = generate_l_sequence(length=12, start_tone=2, tone_step=3)
+    configs = smoothing_configs((0.3, 0.6, 0.9))
+    cache = FiberCache(root=str(tmp_path))
+
+    first = MultiTensorAssembly(configs, cache=cache).run_r_fibers(l_seq)
+    assert cache.stats == {"memory_hits": 0, "disk_hits": 0, "misses": 3}
+
+    configs[1]["behaviors"]["smoothing"]["lambda"] = 0.45
+    second = MultiTensorAssembly(configs, cache=cache).run_r_fibers(l_seq)
+    assert cache.stats == {"memory_hits": 2, "disk_hits": 0, "misses": 4}
+    assert second[0] == first[0] and second[2] == first[2]
+    assert second[1] == update_tensor_r_sequence(l_seq, configs[1])
+
+    second[0][0]["tone"] = 99  # callers get private copies
+    fresh = FiberCache(root=str(tmp_path))
+    third = MultiTensorAssembly(configs, cache=fresh).run_r_fibers(l_seq)
+    assert fresh.stats["disk_hits"] == 3
+    assert third == [update_tensor_r_sequence(l_seq, cfg) for cfg in configs]
+
+
+def test_memory_config_is_resolved_once_per_run(monkeypatch):
+    l_seq = generate_l_sequence(length=6)
+    configs = smoothing_configs((0.3, 0.6, 0.9))
+    digest = l_sequence_digest(l_seq)
+    expected_keys = [fiber_cache_key(cfg, digest) for cfg in configs]
+
+    loads = []
+    original = memory.load_memory_config
+    monkeypatch.setattr(memory, "load_memory_config", lambda: loads.append(1) or original())
+    cache = FiberCache()
+    MultiTensorAssembly(configs, cache=cache).run_r_fibers(l_seq)
+    assert sorted(cache._memory) == sorted(expected_keys)
+    # All hits: the only disk read is the single resolve for the three keys.
+    loads.clear()
+    MultiTensorAssembly(configs, cache=cache).run_r_fibers(l_seq)
+    assert len(loads) == 1
+
+
+def test_disk_tier_round_trips_tuple_values(tmp_path):
+    l_seq = [dict(cell, hue=tuple(cell["hue"])) for cell in generate_l_sequence(length=8, start_tone=1)]
+    r_seq = update_tensor_r_sequence(l_seq, load_tensor_r_config())
+    r_seq[0] = dict(r_seq[0], hue=(1, 2, 3), extra=[(0.5, (1, 2)), {"coords": (4, 5)}])
+    FiberCache(root=str(tmp_path)).put("tuples", r_seq)
+
+    fresh = FiberCache(root=str(tmp_path))
+    loaded = fresh.get("tuples")
+    assert fresh.stats["disk_hits"] == 1
+    assert loaded == r_seq
+    assert [type(cell["hue"]) for cell in loaded] == [type(cell["hue"]) for cell in r_seq]
+    assert isinstance(loaded[0]["extra"][0][1], tuple)
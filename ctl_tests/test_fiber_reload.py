@@ -0,0 +1,113 @@
+"""Hot config reload tests."""
+import copy
+
+import pytest
+
+from ctl.coupling import StreamingCoupler, apply_coupling
+from ctl.feedback import FeedbackSignal
+from ctl.fiber_reload import FiberEnsemble, merge_config
+from ctl.tensor_r_update import advance_tensor_r_state, init_tensor_r_state, update_tensor_r_sequence
+from ctl_tests.ctl_mock_data import generate_l_sequence
+from ctl_tests.ctl_testing_utils import load_coupling_config, load_tensor_r_config, smoothing_configs
+
+_LAMBDAS = (0.3, 0.8)
+
+
+def test_merge_config_rejects_unknown_keys():
+    cfg = load_tensor_r_config()
+    merged = merge_config(cfg, {"behaviors": {"prediction": {"alpha": 0.5}}})
+    assert merged["behaviors"]["prediction"]["alpha"] == 0.5
+    assert cfg["behaviors"]["prediction"]["alpha"] == 0.25
+    with pytest.raises(ValueError):
+        merge_config(cfg, {"behaviors": {"predicton": {"alpha": 0.5}}})
+
+
+def test_without_reload_matches_sequence():
+    l_seq = generate_l_sequence(length=30, tone_step=5)
+    ensemble = FiberEnsemble(smoothing_configs(_LAMBDAS))
+    sequences = ensemble.run(l_seq)
+    assert sequences == [update_tensor_r_sequence(l_seq, cfg) for cfg in smoothing_configs(_LAMBDAS)]
+
+
+def test_reload_applies_at_step_boundary_and_keeps_state():
+    l_seq = generate_l_sequence(length=40, tone_step=5)
+    patch = {"behaviors": {"prediction": {"alpha": 0.6}, "polarity_integration": {"flip_window": 12}}}
+    ensemble = FiberEnsemble(smoothing_configs(_LAMBDAS))
+    head = ensemble.run(l_seq[:17])
+    version = ensemble.reload(tensor_r=patch)
+    assert ensemble.version == 0
+    tail = ensemble.run(l_seq[17:])
+    assert ensemble.version == version == 1
+    assert ensemble.history == [(17, 1)]
+
+    for fiber, cfg in enumerate(smoothing_configs(_LAMBDAS)):
+        state = init_tensor_r_state(cfg)
+        new_cfg = merge_config(cfg, patch)
+        expected = [
+            advance_tensor_r_state(state, l_cell, cfg if step < 17 else new_cfg, history_limit=64)
+            for step, l_cell in enumerate(l_seq)
+        ]
+        assert head[fiber] + tail[fiber] == expected
+
+
+def test_failed_patch_stages_nothing():
+    ensemble = FiberEnsemble(smoothing_configs(_LAMBDAS))
+    ensemble.reload(tensor_r={"behaviors": {"smoothing": {"lambda": 0.5}}}, fibers=[0])
+    with pytest.raises(ValueError):
+        ensemble.reload(tensor_r={"behaviors": {"smoothing": {"lambda": 0.1}}}, memory={"nope": 1})
+    ensemble.step(generate_l_sequence(length=1)[0])
+    assert [cfg["behaviors"]["smoothing"]["lambda"] for cfg in ensemble.configs] == [0.5, 0.8]
+    with pytest.raises(ValueError):
+        ensemble.reload(coupling={"thresholds": {"window": 2}})
+
+
+def test_coupling_reload_keeps_running_totals():
+    l_seq = generate_l_sequence(length=24, tone_step=5)
+    coupling_cfg = load_coupling_config()
+    ensemble = FiberEnsemble(smoothing_configs(_LAMBDAS)[:1], coupling_config=coupling_cfg)
+    ensemble.run(l_seq[:12])
+    ensemble.reload(coupling={"thresholds": {"window": 2}, "nonlinear": {"polarity_penalty": 0.3}})
+    r_seq = ensemble.run(l_seq[12:])[0]
+    summary = ensemble.coupling_summaries()[0]
+    assert summary["steps"] == 24
+
+    manual = StreamingCoupler(coupling_cfg)
+    r_full = update_tensor_r_sequence(l_seq, smoothing_configs(_LAMBDAS)[0])
+    assert r_full[12:] == r_seq
+    for step, (l_cell, r_cell) in enumerate(zip(l_seq, r_full)):
+        if step == 12:
+            manual.reconfigure(ensemble.coupling_config)
+        manual.push(l_cell, r_cell)
+    assert manual.summary() == summary
+
+
+def test_narrowed_coupling_window_matches_full_pass():
+    l_seq = generate_l_sequence(length=20, tone_step=5)
+    r_seq = update_tensor_r_sequence(l_seq, smoothing_configs(_LAMBDAS)[0])
+    coupling_cfg = load_coupling_config()
+    narrow = merge_config(coupling_cfg, {"thresholds": {"window": 2}})
+    coupler = StreamingCoupler(coupling_cfg)
+    cells = [coupler.push(l, r) for l, r in zip(l_seq[:10], r_seq[:10])]
+    coupler.reconfigure(narrow)
+    cells += [coupler.push(l, r) for l, r in zip(l_seq[10:], r_seq[10:])]
+
+    expected = apply_coupling(l_seq, r_seq, narrow)
+    assert [c["constraint_flag"] for c in cells[10:]] == [c["constraint_flag"] for c in expected[10:]]
+    assert [c["coherence"] for c in cells[10:]] == pytest.approx([c["coherence"] for c in expected[10:]])
+
+
+def test_feedback_adjustments_reload_every_fiber():
+    coupling_cfg = load_coupling_config()
+    ensemble = FiberEnsemble(smoothing_configs(_LAMBDAS), coupling_config=coupling_cfg)
+    signal = FeedbackSignal(posture="amplify", adjustments={"cadence": 0.05, "polarity": 0.03, "window": 0.2}, confidence=0.8, notes="")
+    before = copy.deepcopy(ensemble.configs)
+    ensemble.apply_feedback(signal)
+    ensemble.step(generate_l_sequence(length=1)[0])
+
+    for old, new in zip(before, ensemble.configs):
+        assert new["behaviors"]["prediction"]["alpha"] == pytest.approx(old["behaviors"]["prediction"]["alpha"] + 0.05)
+        assert new["behaviors"]["polarity_integration"]["flip_window"] == old["behaviors"]["polarity_integration"]["flip_window"] + 1
+        assert new["behaviors"]["smoothing"] == old["behaviors"]["smoothing"]
+    assert ensemble.coupling_config["nonlinear"]["polarity_penalty"] == pytest.approx(0.15)
+    assert ensemble.couplers[0].kernel.polarity_penalty == pytest.approx(0.15)
+    assert ensemble.history == [(0, 1)]
@@ -0,0 +1,93 @@
+"""Run-length encoded constraint-flag track tests."""
+import bisect
+import random
+
+import pytest
+
+from ctl.coupling import apply_coupling, load_coupling_config, process_coupling_sequence
+from ctl.flag_track import FlagTrack
+from ctl.tensor_r_update import update_tensor_r_sequence, update_tensor_r_sequence_fast
+from ctl_tests.ctl_mock_data import generate_contrasting_l_sequence, generate_l_sequence
+from ctl_tests.ctl_testing_utils import build_r_sequence, load_tensor_r_config
+
+
+def test_flag_track_runs_and_counts():
+    flags = ["OK", "OK", "WARN", "WARN", "WARN", "OK", "VIOLATION", "VIOLATION", "OK", "WARN"]
+    track = FlagTrack()
+    track.extend(flags, [float(i) for i in range(len(flags))])
+
+    assert track.run_count == 6
+    assert track.to_flags() == flags
+    assert [(run.flag, run.start, run.stop) for run in track.spans()] == [
+        ("WARN", 2, 5),
+        ("VIOLATION", 6, 8),
+        ("WARN", 9, 10),
+    ]
+    assert [run.length for run in track.spans("VIOLATION")] == [2]
+    for start in range(len(flags) + 1):
+        for stop in range(start, len(flags) + 1):
+            for flag in ("OK", "WARN", "VIOLATION"):
+                assert track.count(flag, start, stop) == flags[start:stop].count(flag)
+    assert track.counts_between(3.0, 7.0) == {"OK": 1, "WARN": 2, "VIOLATION": 2}
+    assert track.flag_at(6) == "VIOLATION"
+    with pytest.raises(ValueError):
+        track.append("BROKEN", 10.0)
+
+
+def test_engines_fill_flag_tracks():
+    coupling_cfg = load_coupling_config()
+    tensor_r_cfg = load_tensor_r_config()
+    l_seq = generate_contrasting_l_sequence(length=12)
+    r_seq = build_r_sequence(generate_l_sequence(length=12, start_tone=7), tensor_r_cfg)
+
+    bundle = process_coupling_sequence(l_seq, r_seq, coupling_cfg, include_coupled=False, include_flag_track=True)
+    coupled = apply_coupling(l_seq, r_seq, coupling_cfg)
+    assert bundle["coupled"] is None
+    assert bundle["flag_track"].to_flags() == [cell["constraint_flag"] for cell in coupled]
+
+    slim = process_coupling_sequence(l_seq, r_seq, coupling_cfg, include_flag_track=True, cell_flags=False)
+    assert all("constraint_flag" not in cell for cell in slim["coupled"])
+    assert [dict(cell, constraint_flag=flag) for cell, flag in zip(slim["coupled"], slim["flag_track"].to_flags())] == coupled
+    with pytest.raises(ValueError):
+        process_coupling_sequence(l_seq, r_seq, coupling_cfg, cell_flags=False)
+
+    r_track = FlagTrack()
+    r_cells = update_tensor_r_sequence(l_seq, tensor_r_cfg, flag_track=r_track)
+    assert r_track.to_flags() == [cell["constraint_flag"] for cell in r_cells]
+
+    tensor_r_cfg["behaviors"]["memory_integration"]["enabled"] = False
+    fast_track = FlagTrack()
+    fast_cells = update_tensor_r_sequence_fast(l_seq, tensor_r_cfg, flag_track=fast_track)
+    assert fast_track.to_flags() == [cell["constraint_flag"] for cell in fast_cells]
+
+
+def test_time_queries_match_per_cell_bisect():
+    rng = random.Random(3)
+    flags, timestamps = [], []
+    t = 0.0
+    for idx in range(600):
+        # Fixed clocks, a fractional stride, repeated timestamps and jumps.
+        t += 0.0 if 200 <= idx < 220 else 0.1 if idx >= 400 else 1.0
+        if idx in (150, 330):
+            t += 7.5
+        timestamps.append(t)
+        flags.append("OK" if (idx // 40) % 3 else rng.choice(("WARN", "VIOLATION")))
+    track = FlagTrack()
+    track.extend(flags, timestamps)
+
+    assert track.to_flags() == flags
+    assert [(run.flag, run.start, run.stop) for run in track.runs()] == [
+        (run.flag, run.start, run.stop) for run in FlagTrack.from_cells({"constraint_flag": f} for f in flags).runs()
+    ]
+    for run in track.runs():
+        assert (run.t_start, run.t_end) == (timestamps[run.start], timestamps[run.stop - 1])
+    probes = timestamps[::7] + [t + 0.05 for t in timestamps[::11]] + [-1.0, timestamps[-1] + 1.0]
+    for t_start in probes[::5]:
+        for t_end in probes:
+            expected = bisect.bisect_left(timestamps, t_start), bisect.bisect_right(timestamps, t_end)
+            assert track.index_range(t_start, t_end) == expected
+            start, stop = expected
+            assert track.counts_between(t_start, t_end) == {
+                flag: flags[start:stop].count(flag) for flag in ("OK", "WARN", "VIOLATION")
+            }
+    assert FlagTrack().index_range(0.0, 1.0) == (0, 0)
@@ -1,6 +1,11 @@
 """Tests for Chromatic Memory System integration."""
+import random
+
+import pytest
+
 from ctl import memory
 from ctl.tensor_r_update import update_tensor_r_cell
+from ctl_tests import memory_reference as reference
 from ctl_tests.ctl_mock_data import generate_l_sequence
 from ctl_tests.ctl_testing_utils import initialize_r_cell, load_tensor_r_config
 
@@ -42,3 +47,135 @@ def test_memory_match_boosts_tensor_r_intensity():
 
     assert r_next["intensity"] > r_prev["intensity"]
     assert state["tone_peaks"] and state["hue_peaks"]
+
+
+def test_indexed_memory_state_matches_dict_api_in_place():
+    mem_cfg = memory.load_memory_config()
+    dict_state = memory.init_memory_state()
+    indexed = memory.MemoryState()
+    l_cells = generate_l_sequence(length=10, start_tone=1, tone_step=5)
+
+    for cell in l_cells:
+        dict_state = memory.update_memory_state(dict_state, cell, mem_cfg, coherence=0.8)
+        indexed.observe(cell, mem_cfg, coherence=0.8)
+        lazy = indexed.to_dict()
+        # Lazy decay regroups the multiplications, so strengths agree up to rounding.
+        for key, field in (("tone_peaks", "tone"), ("hue_peaks", "hue")):
+            assert [p[field] for p in lazy[key]] == [p[field] for p in dict_state[key]]
+            assert [p["strength"] for p in lazy[key]] == pytest.approx([p["strength"] for p in dict_state[key]])
+
+    for cell in l_cells:
+        assert memory.match_to_memory_profile(cell, indexed, mem_cfg) == memory.match_to_memory_profile(
+            cell, dict_state, mem_cfg
+        )
+        assert memory.snap_to_nearest_memory_hue(cell["hue"], indexed, mem_cfg) == memory.snap_to_nearest_memory_hue(
+            cell["hue"], dict_state, mem_cfg
+        )
+
+
+def _varied_l_cells(length, seed):
+    rng = random.Random(seed)
+    cells = []
+    for idx in range(length):
+        # Revisit a few tones and hues so existing peaks are hit often.
+        base = rng.choice(((30, 60, 90), (120, 40, 200), (220, 210, 15)))
+        cells.append(
+            {
+                "tone": rng.choice((0, 1, 4, 7, 9, rng.randrange(12))),
+                "hue": [min(255, max(0, c + rng.randint(-25, 25))) for c in base],
+                "intensity": rng.uniform(0.2, 2.5),
+                "polarity": rng.choice((1, -1)),
+                "timestamp": float(idx),
+            }
+        )
+    return cells
+
+
+def test_memory_state_matches_frozen_dict_reference():
+    patches = (
+        ({}, {}),
+        ({"decay": 0.2, "max_peaks": 3}, {"decay": 0.2, "max_peaks": 2}),
+        ({"min_separation": 0}, {"min_distance": 4.0}),
+    )
+    for seed, (tone_patch, hue_patch) in enumerate(patches):
+        mem_cfg = memory.load_memory_config()
+        mem_cfg["peaks"]["tone"].update(tone_patch)
+        mem_cfg["peaks"]["hue"].update(hue_patch)
+        expected = reference.init_memory_state()
+        state = memory.MemoryState()
+        for cell in _varied_l_cells(200, seed):
+            coherence = 0.3 + 0.7 * (cell["timestamp"] % 3) / 2
+            expected = reference.update_memory_state(expected, cell, mem_cfg, coherence=coherence)
+            state.observe(cell, mem_cfg, coherence=coherence)
+            actual = state.to_dict()
+            for key, field in (("tone_peaks", "tone"), ("hue_peaks", "hue")):
+                assert [p[field] for p in actual[key]] == [p[field] for p in expected[key]]
+                assert [p["strength"] for p in actual[key]] == pytest.approx([p["strength"] for p in expected[key]])
+            assert actual["updates"] == expected["updates"]
+            assert memory.match_to_memory_profile(cell, state, mem_cfg) == reference.match_to_memory_profile(
+                cell, expected, mem_cfg
+            )
+            assert memory.snap_to_nearest_memory_tone(cell["tone"], state, mem_cfg) == (
+                reference.snap_to_nearest_memory_tone(cell["tone"], expected, mem_cfg)
+            )
+
+
+def test_batch_matching_agrees_with_per_cell_helpers():
+    mem_cfg = memory.load_memory_config()
+    state = memory.MemoryState()
+    for cell in generate_l_sequence(length=8, start_tone=2, tone_step=3):
+        state.observe(cell, mem_cfg)
+
+    probes = generate_l_sequence(length=12, start_tone=1, tone_step=1)
+    tones = [cell["tone"] for cell in probes]
+    hues = [cell["hue"] for cell in probes]
+
+    assert memory.match_to_memory_profile_batch(tones, hues, state, mem_cfg) == [
+        memory.match_to_memory_profile(cell, state, mem_cfg) for cell in probes
+    ]
+    assert memory.snap_to_nearest_memory_tone_batch(tones, state, mem_cfg) == [
+        memory.snap_to_nearest_memory_tone(tone, state, mem_cfg) for tone in tones
+    ]
+    assert memory.snap_to_nearest_memory_hue_batch(hues, state.to_dict(), mem_cfg) == [
+        memory.snap_to_nearest_memory_hue(hue, state, mem_cfg) for hue in hues
+    ]
+
+
+def test_lazy_decay_prunes_within_one_step_of_eager_decay():
+    mem_cfg = memory.load_memory_config()
+    tone_cfg = mem_cfg["peaks"]["tone"]
+    factor = 1.0 - tone_cfg["decay"]
+    min_strength = tone_cfg["min_strength"]
+
+    def prune_steps(strength, steps):
+        eager = [{"tone": 3, "strength": strength}]
+        lazy = memory.MemoryState.from_dict({"tone_peaks": eager, "hue_peaks": [], "updates": 0})
+        eager_step = lazy_step = None
+        for step in range(1, steps):
+            eager = reference._decay_peaks(eager, tone_cfg["decay"], min_strength)
+            lazy._decay(tone_cfg, mem_cfg["peaks"]["hue"])
+            if eager and lazy.tone_count:
+                assert lazy.tone_strength(3) == pytest.approx(eager[0]["strength"], rel=step * 2.0**-50)
+            eager_step = eager_step or (step if not eager else None)
+            lazy_step = lazy_step or (step if not lazy.tone_count else None)
+        return eager_step, lazy_step
+
+    for k in range(1, 80):
+        # Sitting exactly on the boundary: rounding decides the step.
+        eager_step, lazy_step = prune_steps(min_strength / factor**k, k + 5)
+        assert eager_step in (k, k + 1) and abs(eager_step - lazy_step) <= 1
+        # Clear of the boundary both prune on the same step.
+        assert prune_steps(min_strength / factor**k * (1 + 1e-9), k + 5) == (k + 1, k + 1)
+
+
+def test_memory_state_rejects_tone_peaks_sharing_a_slot():
+    data = {
+        "tone_peaks": [{"tone": 1, "strength": 0.5}, {"tone": 13, "strength": 0.2}],
+        "hue_peaks": [],
+        "updates": 2,
+    }
+    with pytest.raises(ValueError):
+        memory.MemoryState.from_dict(data)
+    snapshot = {"tone_peaks": [[4, 0.5], [4, 0.3]], "hue_peaks": []}
+    with pytest.raises(ValueError):
+        memory.MemoryState.from_snapshot(snapshot)
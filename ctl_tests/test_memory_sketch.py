@@ -0,0 +1,73 @@
+"""Mergeable memory sketch tests."""
+from functools import reduce
+
+from ctl import memory
+from ctl.memory_sketch import (
+    MemorySketch,
+    build_memory_profile,
+    merge_memory_sketches,
+    merge_memory_states,
+    sketch_document,
+)
+from ctl_tests.ctl_mock_data import generate_contrasting_l_sequence, generate_l_sequence
+
+
+def _corpus():
+    return [
+        generate_l_sequence(length=6, start_tone=0, tone_step=1),
+        generate_l_sequence(length=5, start_tone=4, tone_step=3),
+        generate_contrasting_l_sequence(length=5),
+        generate_l_sequence(length=8, start_tone=9, tone_step=0),
+    ]
+
+
+def test_profile_is_independent_of_shard_count():
+    mem_cfg = memory.load_memory_config()
+    docs = _corpus()
+    reference = build_memory_profile(docs, mem_cfg).to_snapshot()
+
+    for shard_size in (1, 2, 3):
+        shards = [docs[i : i + shard_size] for i in range(0, len(docs), shard_size)]
+        partials = [reduce(MemorySketch.merge, (sketch_document(d, mem_cfg) for d in shard)) for shard in shards]
+        merged = reduce(MemorySketch.merge, reversed(partials)).to_memory_state(mem_cfg)
+        assert merged.to_snapshot() == reference
+
+
+def test_merge_coalesces_and_truncates_peaks():
+    mem_cfg = memory.load_memory_config()
+    states = []
+    for doc in _corpus():
+        state = memory.MemoryState()
+        for cell in doc:
+            state.observe(cell, mem_cfg)
+        states.append(state)
+
+    merged = merge_memory_states(states, mem_cfg).to_dict()
+    tones = [peak["tone"] for peak in merged["tone_peaks"]]
+    min_sep = mem_cfg["peaks"]["tone"]["min_separation"]
+
+    assert merged["updates"] == sum(s.updates for s in states)
+    assert len(merged["hue_peaks"]) <= mem_cfg["peaks"]["hue"]["max_peaks"]
+    assert all(min(abs(a - b) % 12, 12 - abs(a - b) % 12) > min_sep for a in tones for b in tones if a != b)
+    assert merge_memory_states(reversed(states), mem_cfg).to_dict() == merged
+
+
+def test_nested_sketch_merges_match_flat_merge():
+    mem_cfg = memory.load_memory_config()
+    states = []
+    for doc in _corpus() + [generate_l_sequence(length=7, start_tone=2, tone_step=5)]:
+        state = memory.MemoryState()
+        for cell in doc:
+            state.observe(cell, mem_cfg, coherence=0.7)
+        states.append(state)
+    a, b, c, d, e = states
+    flat = merge_memory_states(states, mem_cfg).to_snapshot()
+
+    groupings = (
+        [merge_memory_sketches([a, b]), c, d, e],
+        [merge_memory_sketches([merge_memory_sketches([e, a]), d]), merge_memory_sketches([c, b])],
+        [merge_memory_sketches([a, merge_memory_sketches([b, merge_memory_sketches([c, merge_memory_sketches([d, e])])])])],
+    )
+    for grouping in groupings:
+        assert merge_memory_states(grouping, mem_cfg).to_snapshot() == flat
+    assert merge_memory_sketches(states) == merge_memory_sketches(reversed(states))
@@ -0,0 +1,57 @@
+"""Persistent memory profile tests."""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ctl import memory
+from ctl.memory_store import MemoryProfileConflict, MemoryStore
+from ctl.tensor_r_update import update_tensor_r_sequence
+from ctl_tests.ctl_mock_data import generate_l_sequence
+from ctl_tests.ctl_testing_utils import load_tensor_r_config
+
+
+def test_store_round_trips_profiles_atomically(tmp_path):
+    store = MemoryStore(str(tmp_path))
+    mem_cfg = memory.load_memory_config()
+    state = memory.MemoryState()
+    for cell in generate_l_sequence(length=6, start_tone=2, tone_step=1):
+        state.observe(cell, mem_cfg)
+
+    assert store.load("speaker") is None
+    assert store.save("speaker", state) == 1
+    assert store.save("speaker", state) == 2
+
+    restored = store.load("speaker")
+    assert restored.to_snapshot() == state.to_snapshot()
+    # No temp files are left behind; only the profile and its writer lock.
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["speaker.memory.json", "speaker.memory.json.lock"]
+
+
+def test_concurrent_saves_get_distinct_revisions_and_detect_conflicts(tmp_path):
+    store = MemoryStore(str(tmp_path))
+    state = memory.MemoryState()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        revisions = list(pool.map(lambda _: MemoryStore(str(tmp_path)).save("shared", state), range(24)))
+    assert sorted(revisions) == list(range(1, 25))
+    assert store.revision("shared") == 24
+
+    assert store.save("shared", state, expected_revision=24) == 25
+    with pytest.raises(MemoryProfileConflict):
+        store.save("shared", state, expected_revision=24)
+    assert store.revision("shared") == 25
+
+
+def test_sequence_warm_starts_from_named_profile(tmp_path):
+    config = load_tensor_r_config()
+    config["behaviors"]["coherence_field"]["default_value"] = 0.5
+    store = MemoryStore(str(tmp_path))
+    l_seq = generate_l_sequence(length=6, start_tone=4, tone_step=0)
+
+    cold = update_tensor_r_sequence(l_seq, config, memory_store=store, memory_profile="doc")
+    assert store.revision("doc") == 1
+
+    warm = update_tensor_r_sequence(l_seq, config, memory_store=store, memory_profile="doc", save_every=2)
+    assert store.revision("doc") == 4
+    assert store.load("doc").updates == 2 * (len(l_seq) - 1)
+    # Early cells now get the coherence boost from the learned attractors
+    assert warm[1]["coherence"] > cold[1]["coherence"]
@@ -1,7 +1,12 @@
 """Multi-tensor assembly tests."""
-from ctl.multi_tensor import MultiTensorAssembly, couple_fiber_snapshots, run_multi_tensor
+import pytest
+
+from ctl.coupling import compute_coupling_metrics
+from ctl.l_features import compute_l_features
+from ctl.multi_tensor import AggregatedStates, MultiTensorAssembly, couple_fiber_snapshots, run_multi_tensor
+from ctl.tensor_r_update import update_tensor_r_sequence
 from ctl_tests.ctl_mock_data import generate_l_sequence
-from ctl_tests.ctl_testing_utils import load_coupling_config, load_tensor_r_config
+from ctl_tests.ctl_testing_utils import load_coupling_config, load_tensor_r_config, smoothing_configs
 
 
 def test_multi_tensor_runs_and_aggregates():
@@ -36,3 +41,97 @@ def test_multi_tensor_snapshots_and_wrapper():
     for snap in snapshots:
         assert "per_step" in snap and "summary" in snap
         assert snap["summary"]["agreement"] >= 0.0
+
+
+def test_parallel_fibers_match_serial_order():
+    l_seq = generate_l_sequence(length=12, start_tone=1, tone_step=5)
+    configs = smoothing_configs((0.2, 0.5, 0.8))
+
+    assembly = MultiTensorAssembly(configs)
+    serial = assembly.run_r_fibers(l_seq)
+    parallel = assembly.run_r_fibers(l_seq, processes=2)
+
+    assert parallel == serial
+    assert serial[0] != serial[2]
+
+
+def test_shared_l_features_match_per_fiber_computation():
+    l_seq = generate_l_sequence(length=15, start_tone=3, tone_step=4)
+    coupling_cfg = load_coupling_config()
+    no_memory = load_tensor_r_config()
+    no_memory["behaviors"]["memory_integration"]["enabled"] = False
+    configs = [no_memory, load_tensor_r_config()]
+
+    features = compute_l_features(l_seq)
+    assembly = MultiTensorAssembly(configs, coupling_config=coupling_cfg)
+    r_sequences = assembly.run_r_fibers(l_seq, l_features=features)
+
+    assert r_sequences == [update_tensor_r_sequence(l_seq, cfg) for cfg in configs]
+    assert assembly.summarize_fibers(l_seq, r_sequences, l_features=features) == [
+        compute_coupling_metrics(l_seq, r_seq, coupling_cfg) for r_seq in r_sequences
+    ]
+    assert features.trends[1] == l_seq[1]["tone"] - l_seq[0]["tone"]
+
+
+def test_aggregate_states_columns_match_cells():
+    l_seq = generate_l_sequence(length=9, start_tone=4, tone_step=3)
+    configs = smoothing_configs((0.3, 0.9))
+    assembly = MultiTensorAssembly(configs)
+    r_sequences = assembly.run_r_fibers(l_seq)
+
+    cells = assembly.aggregate_states(r_sequences, weights=[3.0, 1.0])
+    columns = assembly.aggregate_states(r_sequences, weights=[3.0, 1.0], as_columns=True)
+
+    assert isinstance(columns, AggregatedStates)
+    assert columns.to_cells() == cells
+    assert columns.cell(4) == cells[4]
+    expected_intensity = 0.75 * r_sequences[0][4]["intensity"] + 0.25 * r_sequences[1][4]["intensity"]
+    assert cells[4]["intensity"] == expected_intensity
+    assert assembly.aggregate_states([]) == []
+
+
+def test_run_pruned_keeps_best_fibers_and_reports_savings():
+    l_seq = generate_l_sequence(length=30, start_tone=0, tone_step=5)
+    configs = smoothing_configs((0.1, 0.5, 0.95, 0.99))
+    for cfg, alpha in zip(configs, (0.2, 0.2, 0.9, 1.5)):
+        cfg["behaviors"]["prediction"]["alpha"] = alpha
+    assembly = MultiTensorAssembly(configs, coupling_config=load_coupling_config())
+
+    result = assembly.run_pruned(l_seq, weights=[1.0, 1.0, 1.0, 3.0], checkpoint_every=10, beam_width=2)
+
+    assert len(result["survivors"]) == 2
+    for idx in result["survivors"]:
+        assert result["r_sequences"][idx] == update_tensor_r_sequence(l_seq, configs[idx])
+    assert all(result["r_sequences"][p["fiber"]] is None for p in result["pruned"])
+    assert sum(result["weights"]) == pytest.approx(1.0)
+    assert result["compute"]["fiber_steps_saved"] == 2 * (len(l_seq) - 10)
+    assert len(result["aggregated"]) == len(l_seq)
+
+    frozen = assembly.run_pruned(l_seq, checkpoint_every=10, min_coherence=1.1, mode="freeze")
+    assert len(frozen["survivors"]) == 1
+    assert all(len(frozen["r_sequences"][p["fiber"]]) == 10 for p in frozen["pruned"])
+    with pytest.raises(ValueError):
+        MultiTensorAssembly(configs).run_pruned(l_seq)
+
+
+def test_memory_fibers_read_shared_l_features():
+    l_seq = generate_l_sequence(length=40, start_tone=1, tone_step=5)
+    configs = [load_tensor_r_config(), load_tensor_r_config()]
+    configs[1]["behaviors"]["prediction"]["alpha"] = 0.9
+    assembly = MultiTensorAssembly(configs, coupling_config=load_coupling_config())
+    features = compute_l_features(l_seq)
+
+    assert all(cfg["behaviors"]["memory_integration"]["enabled"] for cfg in configs)
+    assert any(features.polarity_changed)
+    for cfg in configs:
+        assert update_tensor_r_sequence(l_seq, cfg, l_features=features) == update_tensor_r_sequence(l_seq, cfg)
+    with_features = assembly.run_pruned(l_seq, checkpoint_every=10, beam_width=1, l_features=features)
+    without = assembly.run_pruned(l_seq, checkpoint_every=10, beam_width=1)
+    assert with_features == without
+
+    # Same length, different cells: the features must not be reused.
+    other = generate_l_sequence(length=40, start_tone=2, tone_step=5)
+    with pytest.raises(ValueError):
+        features.check(other)
+    with pytest.raises(ValueError):
+        update_tensor_r_sequence(other, configs[0], l_features=features)
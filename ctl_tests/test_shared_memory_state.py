@@ -0,0 +1,53 @@
+"""Shared-memory memory state tests."""
+import multiprocessing
+
+import pytest
+
+from ctl import memory
+from ctl.shared_memory_state import SharedMemoryState, SharedMemoryView
+from ctl_tests.ctl_mock_data import generate_l_sequence
+
+
+def _read_shared(name, queue):
+    shared = SharedMemoryState.attach(name)
+    view = SharedMemoryView(shared)
+    queue.put(view.state.to_dict())
+    shared.close()
+
+
+def test_readers_in_other_processes_see_published_memory():
+    mem_cfg = memory.load_memory_config()
+    writer_state = memory.MemoryState()
+    for cell in generate_l_sequence(length=10, start_tone=1, tone_step=5):
+        writer_state.observe(cell, mem_cfg)
+
+    shared = SharedMemoryState.create(hue_capacity=mem_cfg["peaks"]["hue"]["max_peaks"])
+    try:
+        shared.publish(writer_state)
+        queue = multiprocessing.Queue()
+        reader = multiprocessing.Process(target=_read_shared, args=(shared.name, queue))
+        reader.start()
+        seen = queue.get(timeout=30)
+        reader.join()
+
+        expected = writer_state.to_dict()
+        assert [p["tone"] for p in seen["tone_peaks"]] == [p["tone"] for p in expected["tone_peaks"]]
+        assert seen["hue_peaks"] == expected["hue_peaks"]
+        assert shared.sequence % 2 == 0
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+def test_only_the_creator_may_publish():
+    shared = SharedMemoryState.create(hue_capacity=2)
+    try:
+        reader = SharedMemoryState.attach(shared.name)
+        view = SharedMemoryView(reader)
+        assert not view.refresh()
+        with pytest.raises(PermissionError):
+            reader.publish(memory.MemoryState())
+        reader.close()
+    finally:
+        shared.close()
+        shared.unlink()
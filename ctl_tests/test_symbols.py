@@ -1,4 +1,4 @@
-from ctl.symbols import form_symbols, summarize_symbols
+from ctl.symbols import ROLES, IncrementalSymbolFormer, form_symbol_table, form_symbols, summarize_symbols
 
 
 def _sample_cells():
@@ -26,3 +26,48 @@ def test_symbol_summary_balances_intensity_and_polarity():
     assert summary["count"] == 4
     assert summary["mean_tone"] > 3
     assert summary["peak_ratio"] > 0
+
+
+def test_symbol_table_matches_symbols_and_acts_as_sequence():
+    cells = _sample_cells() + [dict(cell, timestamp=cell["timestamp"] + 4) for cell in _sample_cells()]
+    table = form_symbol_table(cells)
+    symbols = form_symbols(cells)
+
+    assert len(table) == len(symbols) == 8
+    assert list(table) == symbols
+    assert table[-1] == symbols[-1]
+    assert table[2:5] == symbols[2:5]
+    assert [ROLES[code] for code in table.role_codes] == [s.role for s in symbols]
+    # Repeated band/polarity combinations share one interned label.
+    assert len(table.labels) < len(table)
+    assert summarize_symbols(table) == summarize_symbols(symbols)
+
+
+def test_moving_average_ties_are_exact():
+    cells = [{"tone": 0, "hue": (0, 0, 0), "polarity": 1, "intensity": 0.1, "timestamp": i} for i in range(6)]
+    roles = [s.role for s in form_symbol_table(cells)]
+    assert roles == ["onset"] * 6
+
+
+def test_incremental_former_matches_full_rebuild():
+    cells = _sample_cells() + [dict(cell, timestamp=cell["timestamp"] + 4) for cell in _sample_cells()]
+    former = IncrementalSymbolFormer()
+    finalized = []
+    for start in range(0, len(cells), 3):
+        finalized += former.extend(cells[start : start + 3])
+        expected = form_symbols(cells[: start + 3])
+        assert list(former.table) == expected
+        assert former.tail == expected[-1]
+
+    assert former.finalized == len(cells) - 1
+    assert finalized == form_symbols(cells)[:-1]
+
+
+def test_incremental_tail_role_is_revised():
+    former = IncrementalSymbolFormer()
+    cells = _sample_cells()
+    former.extend(cells[:3])
+    assert former.tail.role == "peak"  # provisional: no right neighbour yet
+    finalized = former.append(cells[3])
+    assert finalized.role == "onset"
+    assert finalized == form_symbols(cells)[2]
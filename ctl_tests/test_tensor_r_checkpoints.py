@@ -0,0 +1,51 @@
+"""Checkpoint index tests for Tensor R time-travel queries."""
+from ctl.tensor_r_checkpoints import TensorRCheckpointIndex, query_tensor_r_at, run_tensor_r_with_checkpoints
+from ctl.tensor_r_update import update_tensor_r_sequence
+from ctl_tests.ctl_mock_data import generate_l_sequence
+from ctl_tests.ctl_testing_utils import load_tensor_r_config
+
+
+def test_checkpointed_run_matches_reference_and_indexes_every_k(tmp_path):
+    config = load_tensor_r_config()
+    l_seq = generate_l_sequence(length=20, start_tone=2, tone_step=3)
+    path = str(tmp_path / "fiber.ckpt")
+
+    r_seq = run_tensor_r_with_checkpoints(l_seq, config, path, every=4)
+    index = TensorRCheckpointIndex(path)
+
+    assert r_seq == update_tensor_r_sequence(l_seq, config)
+    assert [entry[0] for entry in index.entries] == [4, 8, 12, 16, 20]
+
+
+def test_query_restores_state_at_timestamp(tmp_path):
+    config = load_tensor_r_config()
+    l_seq = generate_l_sequence(length=20, start_tone=2, tone_step=3)
+    path = str(tmp_path / "fiber.ckpt")
+    r_seq = run_tensor_r_with_checkpoints(l_seq, config, path, every=4)
+
+    for t in (0, 3, 9, 19):
+        state = query_tensor_r_at(path, l_seq, config, timestamp=t)
+        assert state.step == t + 1
+        assert state.prev_r == r_seq[t]
+
+    assert query_tensor_r_at(path, l_seq, config, timestamp=-1).prev_r is None
+
+
+def test_query_follows_r_timeline_for_timestamp_free_l_cells(tmp_path):
+    config = load_tensor_r_config()
+    cells = generate_l_sequence(length=20, start_tone=1, tone_step=5)
+    # Only the first cell is timed; R continues the clock at +1.0 per cell.
+    l_seq = [cells[0] | {"timestamp": 10.0}] + [{k: v for k, v in c.items() if k != "timestamp"} for c in cells[1:]]
+    path = str(tmp_path / "untimed.ckpt")
+    r_seq = run_tensor_r_with_checkpoints(l_seq, config, path, every=4)
+    assert [cell["timestamp"] for cell in r_seq] == [10.0 + i for i in range(20)]
+
+    for step in (0, 2, 5, 13, 19):
+        state = query_tensor_r_at(path, l_seq, config, timestamp=10.0 + step)
+        assert state.step == step + 1
+        assert state.prev_r == r_seq[step]
+    assert query_tensor_r_at(path, l_seq, config, timestamp=9.5).prev_r is None
+
+    untimed = l_seq[1:]
+    r_untimed = run_tensor_r_with_checkpoints(untimed, config, path, every=3)
+    assert query_tensor_r_at(path, untimed, config, timestamp=7.5).prev_r == r_untimed[7]
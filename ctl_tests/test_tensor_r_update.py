@@ -1,6 +1,15 @@
 """Unit tests for Tensor R update behaviors."""
-from ctl.tensor_r_update import update_tensor_r_cell
-from ctl_tests.ctl_mock_data import generate_l_sequence
+import pytest
+
+from ctl.tensor_r_update import (
+    TensorRState,
+    advance_tensor_r_state,
+    init_tensor_r_state,
+    update_tensor_r_cell,
+    update_tensor_r_sequence,
+    update_tensor_r_sequence_fast,
+)
+from ctl_tests.ctl_mock_data import generate_contrasting_l_sequence, generate_l_sequence
 from ctl_tests.ctl_testing_utils import initialize_r_cell, load_tensor_r_config
 
 
@@ -40,3 +49,31 @@ def test_polarity_over_oscillation_detection():
 
     assert r_next["polarity"] == 1
     assert r_next["constraint_flag"] == "VIOLATION"
+
+
+def test_state_checkpoint_resume_matches_uninterrupted_run(tmp_path):
+    config = load_tensor_r_config()
+    l_seq = generate_l_sequence(length=12, start_tone=1, tone_step=5)
+    expected = update_tensor_r_sequence(l_seq, config)
+
+    state = init_tensor_r_state(config)
+    head = [advance_tensor_r_state(state, cell, config) for cell in l_seq[:7]]
+    path = state.save(str(tmp_path / "r_state.json"))
+
+    restored = TensorRState.load(path)
+    tail = [advance_tensor_r_state(restored, cell, config) for cell in l_seq[7:]]
+
+    assert restored.step == len(l_seq)
+    assert head + tail == expected
+
+
+def test_fast_mode_matches_reference_loop_without_memory():
+    config = load_tensor_r_config()
+    config["behaviors"]["memory_integration"]["enabled"] = False
+    l_seq = generate_l_sequence(length=10, start_tone=0, tone_step=7) + generate_contrasting_l_sequence(length=5)
+
+    assert update_tensor_r_sequence_fast(l_seq, config) == update_tensor_r_sequence(l_seq, config)
+
+    config["behaviors"]["memory_integration"]["enabled"] = True
+    with pytest.raises(ValueError):
+        update_tensor_r_sequence_fast(l_seq, config)
@@ -0,0 +1,124 @@
+"""Tensor worker pool and intuition reducer tests."""
+import threading
+import time
+
+from ctl import tensor_workers
+from ctl.tensor_r_update import update_tensor_r_sequence
+from ctl.tensor_workers import BiasPacket, IntuitionReducer, ShmRing, run_tensor_worker_pool
+from ctl_tests.ctl_mock_data import generate_l_sequence
+from ctl_tests.ctl_testing_utils import smoothing_configs
+
+_LAMBDAS = (0.3, 0.8)
+
+
+def _serial_packets(l_seq, configs, cadence):
+    reducer = IntuitionReducer(len(configs), cadence=cadence)
+    sequences = [update_tensor_r_sequence(l_seq, cfg) for cfg in configs]
+    for step in range(len(l_seq)):
+        for fiber, r_seq in enumerate(sequences):
+            reducer.feed(fiber, step, r_seq[step])
+    for fiber in range(len(configs)):
+        reducer.feed(fiber, -1, None)
+    return reducer.finish()
+
+
+def test_ring_round_trip_and_wraparound():
+    ring = ShmRing.create(capacity=3)
+    try:
+        cells = generate_l_sequence(length=7)
+        received = []
+        for step, cell in enumerate(cells):
+            ring.push(step, dict(cell, coherence=0.5, constraint_flag="WARN"))
+            received.extend(ring.pop_all())
+        assert [record[0] for record in received] == list(range(7))
+        assert [record[1] for record in received] == [cell["tone"] for cell in cells]
+        assert all(record[3] == 1 for record in received)
+    finally:
+        ring.close()
+        ring.unlink()
+
+
+def test_reducer_is_independent_of_arrival_order():
+    l_seq = generate_l_sequence(length=20)
+    configs = smoothing_configs(_LAMBDAS)
+    expected = _serial_packets(l_seq, configs, cadence=6)
+
+    sequences = [update_tensor_r_sequence(l_seq, cfg) for cfg in configs]
+    live = []
+    reducer = IntuitionReducer(len(configs), cadence=6, on_packet=live.append)
+    for step, cell in enumerate(sequences[1]):
+        reducer.feed(1, step, cell)
+    assert live == []
+    reducer.feed(1, -1, None)
+    for step, cell in enumerate(sequences[0]):
+        reducer.feed(0, step, cell)
+    reducer.feed(0, -1, None)
+    # Full windows were emitted while feeding, before finish().
+    assert live == expected[:3]
+
+    assert reducer.finish() == expected
+    assert live == expected
+    assert [packet.steps for packet in expected] == [6, 6, 6, 2]
+    assert expected[-1].step == 19
+
+
+def test_bias_packet_packs_compactly():
+    packet = BiasPacket(15, 16, 4, 0.75, 0.5, 0.5, 0.75, 0.25, 0.0, "STEADY")
+    payload = packet.pack()
+    assert len(payload) == 52
+    assert BiasPacket.unpack(payload) == packet
+
+
+def test_worker_pool_matches_serial_reduction():
+    l_seq = generate_l_sequence(length=40)
+    configs = smoothing_configs(_LAMBDAS)
+    live = []
+    result = run_tensor_worker_pool(
+        l_seq, configs, cadence=8, ring_capacity=4, worker_idle_sleep=0.00005, on_packet=live.append
+    )
+
+    assert result["packets"] == _serial_packets(l_seq, configs, cadence=8)
+    assert live == result["packets"]
+    assert result["cells"] == 80
+    assert result["throughput_cells_per_s"] > 0
+    assert 0 <= result["latency_ms"]["p50"] <= result["latency_ms"]["max"]
+
+
+def test_reducer_buffer_stays_bounded_when_one_fiber_lags():
+    l_seq = generate_l_sequence(length=120)
+    configs = smoothing_configs(_LAMBDAS)
+    sequences = [update_tensor_r_sequence(l_seq, cfg) for cfg in configs]
+    capacity = 4
+    rings = [ShmRing.create(capacity) for _ in configs]
+
+    def produce(ring, r_seq, delay):
+        for step, cell in enumerate(r_seq):
+            ring.push(step, cell)
+            time.sleep(delay)
+        ring.push(-1, None)
+
+    producers = [
+        threading.Thread(target=produce, args=(ring, r_seq, delay), daemon=True)
+        for ring, r_seq, delay in zip(rings, sequences, (0.0, 0.002))
+    ]
+    reducer = IntuitionReducer(len(configs), cadence=8)
+    latencies = tensor_workers._LatencyReservoir(size=16)
+    buffered = 0
+    try:
+        for producer in producers:
+            producer.start()
+        while not reducer.done:
+            if not tensor_workers._drain_rings(rings, reducer, capacity, latencies):
+                time.sleep(0.0005)
+            buffered = max(buffered, len(reducer._pending))
+        for producer in producers:
+            producer.join()
+    finally:
+        for ring in rings:
+            ring.close()
+            ring.unlink()
+
+    assert 0 < buffered <= capacity
+    assert reducer.finish() == _serial_packets(l_seq, configs, cadence=8)
+    assert latencies.count == 2 * len(l_seq)
+    assert len(latencies._sample) == 16